@@ -0,0 +1,935 @@
+"""Offline benchmarks for paper_to_video_v5_multilang.py.
+
+Generates synthetic papers (configurable pages, figures and CJK text) and
+replaces the external engines with deterministic local stand-ins, so the
+pipeline can be timed on a GPU-less machine with no network:
+
+- a fake `ollama` CLI on PATH that prints a canned summary,
+- a silent TTS that writes audio of a fixed length per character,
+- a fake ElevenLabs HTTP server returning silent MP3s.
+
+With --soak N it instead renders N papers through one Pipeline and fails
+if resident memory, open file descriptors or child processes keep growing,
+as they would in a leaking daemon or worker.
+
+With --check it runs functional checks against the same stand-ins (for
+example concurrent renders sharing a small scratch directory) and fails
+if any of them finds broken behaviour.
+
+With --coqui-rtf it synthesizes the same text with the real Coqui model at
+each CPU precision (fp32, int8) and reports the real-time factor
+next to a spectral distance from the first precision, to pick a setting
+per deployment. This one needs TTS and torch installed.
+
+Usage:
+    python paper_to_video_bench.py --pages 20 --figures 8 --save-baseline bench_baseline.json
+    python paper_to_video_bench.py --pages 20 --figures 8 --baseline bench_baseline.json
+    python paper_to_video_bench.py --soak 30
+    python paper_to_video_bench.py --check
+    python paper_to_video_bench.py --coqui-rtf --voice-sample me.wav --coqui-threads 8
+"""
+import os
+import sys
+import io
+import json
+import re
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import importlib.util
+import statistics
+import threading
+import contextlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import fitz  # PyMuPDF
+import numpy as np
+from PIL import Image, ImageDraw
+from pydub import AudioSegment
+import gtts
+
+import paper_to_video_v5_multilang as ptv
+
+# Filler text per language for synthetic pages and summaries
+SYNTHETIC_SENTENCES = {
+    'en': "We study a simple model of learning and report results on several benchmarks.",
+    'ko': "우리는 간단한 학습 모델을 연구하고 여러 벤치마크에서 결과를 보고합니다.",
+    'ja': "私たちは単純な学習モデルを研究し、いくつかのベンチマークで結果を報告します。",
+    'zh': "我们研究了一个简单的学习模型，并在多个基准上报告了结果。",
+}
+# PyMuPDF built-in fonts able to draw each language
+SYNTHETIC_FONTS = {'en': 'helv', 'ko': 'korea', 'ja': 'japan', 'zh': 'china-s'}
+SECTION_TITLES = ['Title', 'Abstract', 'Introduction', 'Methods', 'Results', 'Conclusion']
+SILENT_MS_PER_CHAR = 60  # roughly 15 characters of speech per second
+
+
+def make_synthetic_pdf(path, pages=10, figures=4, language='en', seed=0):
+    """Writes a deterministic synthetic paper with text on every page and figures spread over the first pages."""
+    rng = random.Random(seed)
+    sentence = SYNTHETIC_SENTENCES[language]
+    fontname = SYNTHETIC_FONTS[language]
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        body = " ".join([sentence] * 30)
+        page.insert_textbox(fitz.Rect(50, 50, 545, 420), body, fontname=fontname, fontsize=10)
+        # extract_images_from_pdf only looks at the first 10 pages
+        if page_num < min(pages, 10) and page_num < figures:
+            figure = Image.new('RGB', (800, 500), (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+            draw = ImageDraw.Draw(figure)
+            for _ in range(20):
+                x, y = rng.randrange(800), rng.randrange(500)
+                draw.rectangle([x, y, x + 60, y + 40], fill=(rng.randrange(256), 0, 0))
+            buffer = io.BytesIO()
+            figure.save(buffer, format='PNG')
+            page.insert_image(fitz.Rect(50, 440, 545, 760), stream=buffer.getvalue())
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def make_synthetic_summary(language='en', sentences_per_section=4):
+    """Returns a summary in the `## Header` format the parser expects."""
+    sentence = SYNTHETIC_SENTENCES[language]
+    parts = []
+    for title in SECTION_TITLES:
+        parts.append(f"## {title}")
+        parts.append(" ".join([sentence] * (1 if title == 'Title' else sentences_per_section)))
+        parts.append("")
+    return "\n".join(parts)
+
+
+def silent_mp3_bytes(duration_ms):
+    """Returns an MP3 of silence lasting duration_ms."""
+    buffer = io.BytesIO()
+    AudioSegment.silent(duration=duration_ms).export(buffer, format='mp3')
+    return buffer.getvalue()
+
+
+class SilentTTS:
+    """Drop-in for gTTS that writes silence proportional to the text length."""
+
+    def __init__(self, text, lang='en', slow=False):
+        self.text = text
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(silent_mp3_bytes(max(200, len(self.text) * SILENT_MS_PER_CHAR)))
+
+
+def write_fake_ollama(bin_dir, summary):
+    """Puts an `ollama` executable on bin_dir that prints summary for any prompt."""
+    summary_path = os.path.join(bin_dir, "fake_ollama_summary.md")
+    with open(summary_path, "w", encoding='utf-8') as f:
+        f.write(summary)
+    script_path = os.path.join(bin_dir, "ollama")
+    with open(script_path, "w", encoding='utf-8') as f:
+        f.write(f"""#!{sys.executable}
+import sys
+sys.stdin.read()
+with open({summary_path!r}, encoding='utf-8') as f:
+    sys.stdout.write(f.read())
+if '--verbose' in sys.argv:
+    sys.stderr.write("prompt eval count:    1000 token(s)\\neval count:           300 token(s)\\neval rate:            50.00 tokens/s\\n")
+""")
+    os.chmod(script_path, 0o755)
+    return script_path
+
+
+class FakeElevenLabsHandler(BaseHTTPRequestHandler):
+    """Answers text-to-speech POSTs with silence sized to the requested text.
+
+    The /stream endpoint sends the audio with chunked transfer encoding,
+    pausing between chunks the way a generating server would. Every
+    request first waits server.stall_seconds, to stand in for a hung API.
+    """
+    protocol_version = "HTTP/1.1"
+    stream_chunk_bytes = 4096
+    stream_chunk_delay = 0.02
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.startswith("/v1/text-to-speech/"):
+            self.send_error(404)
+            return
+        time.sleep(self.server.stall_seconds)
+        audio = silent_mp3_bytes(max(200, len(payload.get('text', '')) * SILENT_MS_PER_CHAR))
+        self.send_response(200)
+        self.send_header('Content-Type', 'audio/mpeg')
+        if not self.path.endswith("/stream"):
+            self.send_header('Content-Length', str(len(audio)))
+            self.end_headers()
+            self.wfile.write(audio)
+            return
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        try:
+            for start in range(0, len(audio), self.stream_chunk_bytes):
+                if start:
+                    time.sleep(self.stream_chunk_delay)
+                chunk = audio[start:start + self.stream_chunk_bytes]
+                self.wfile.write(f"{len(chunk):x}\r\n".encode('ascii') + chunk + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client cancelled the stream (a hedged call that lost)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def fake_elevenlabs_server(stall_seconds=0.0):
+    """Runs the fake ElevenLabs API on a free local port; yields its base URL."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeElevenLabsHandler)
+    server.stall_seconds = stall_seconds
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    """Answers generateContent POSTs with the server's canned summary after a short, model-like delay.
+
+    The first server.fail_requests requests get a 429 quota error carrying
+    a RetryInfo delay, like the real API under rate limiting. Requests with
+    a response schema get the summary's sections as a JSON object holding
+    the schema's fields, less server.drop_fields on the first of them.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if not (self.path.startswith("/v1beta/models/") and self.path.endswith(":generateContent")) \
+                or not self.headers.get('x-goog-api-key'):
+            self.send_error(404)
+            return
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.in_flight += 1
+            self.server.peak_in_flight = max(self.server.peak_in_flight, self.server.in_flight)
+            fail = self.server.requests <= self.server.fail_requests
+        try:
+            time.sleep(self.server.latency)
+            if fail:
+                self._send_json(429, {'error': {'code': 429, 'status': "RESOURCE_EXHAUSTED", 'details': [
+                    {'@type': "type.googleapis.com/google.rpc.RetryInfo", 'retryDelay': "0.05s"}]}})
+                return
+            prompt = payload['contents'][0]['parts'][0]['text']
+            text = self.server.summary
+            schema = payload.get('generationConfig', {}).get('responseSchema')
+            if schema:
+                with self.server.lock:
+                    dropped, self.server.drop_fields = self.server.drop_fields, ()
+                sections = ptv.parse_structured_summary(text)
+                text = json.dumps({field: sections.get(field, "") for field in schema['properties']
+                                   if field not in dropped}, ensure_ascii=False)
+            self._send_json(200, {
+                'candidates': [{'content': {'role': "model", 'parts': [{'text': text}]},
+                                'finishReason': "STOP"}],
+                'usageMetadata': {'promptTokenCount': len(prompt) // 4,
+                                  'candidatesTokenCount': len(text) // 4},
+            })
+        finally:
+            with self.server.lock:
+                self.server.in_flight -= 1
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def fake_gemini_server(summary, latency=0.05, fail_requests=0):
+    """Runs the fake Gemini API on a free local port; yields the server (its base URL is server.url)."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeGeminiHandler)
+    server.daemon_threads = True
+    server.summary, server.latency, server.fail_requests = summary, latency, fail_requests
+    server.drop_fields = ()
+    server.lock = threading.Lock()
+    server.requests = server.in_flight = server.peak_in_flight = 0
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextlib.contextmanager
+def offline_engines(work_dir, summary):
+    """Routes Ollama, Gemini, gTTS and ElevenLabs in ptv to the local stand-ins; yields the fake Gemini server."""
+    bin_dir = os.path.join(work_dir, "bin")
+    os.makedirs(bin_dir, exist_ok=True)
+    write_fake_ollama(bin_dir, summary)
+    # ptv imports gTTS at call time, so patching the gtts module reaches it
+    saved = (os.environ.get("PATH", ""), gtts.gTTS, ptv.ELEVENLABS_API_KEY, ptv.ELEVENLABS_API_URL,
+             ptv.GEMINI_API_KEY, ptv.GEMINI_API_URL)
+    with fake_elevenlabs_server() as elevenlabs_url, fake_gemini_server(summary) as gemini:
+        os.environ["PATH"] = bin_dir + os.pathsep + saved[0]
+        gtts.gTTS = SilentTTS
+        ptv.ELEVENLABS_API_KEY = "offline-benchmark"
+        ptv.ELEVENLABS_API_URL = elevenlabs_url
+        ptv.GEMINI_API_KEY = "offline-benchmark"
+        ptv.GEMINI_API_URL = gemini.url
+        try:
+            yield gemini
+        finally:
+            (os.environ["PATH"], gtts.gTTS, ptv.ELEVENLABS_API_KEY, ptv.ELEVENLABS_API_URL,
+             ptv.GEMINI_API_KEY, ptv.GEMINI_API_URL) = saved
+
+
+def time_call(func, repeats):
+    """Runs func `repeats` times; returns (last result, timing stats in seconds)."""
+    durations = []
+    result = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = func()
+        durations.append(time.perf_counter() - started)
+    return result, timing_stats(durations)
+
+
+def timing_stats(durations):
+    """Summarizes a list of durations in seconds."""
+    return {
+        'median_s': round(statistics.median(durations), 4),
+        'min_s': round(min(durations), 4),
+        'max_s': round(max(durations), 4),
+        'repeats': len(durations),
+    }
+
+
+def run_benchmarks(args, work_dir):
+    """Times each pipeline function on a synthetic paper; returns a results dict."""
+    pdf_path = make_synthetic_pdf(os.path.join(work_dir, "synthetic.pdf"),
+                                  pages=args.pages, figures=args.figures, language=args.language)
+    summary = make_synthetic_summary(args.language, sentences_per_section=args.sentences)
+    # Keep scaled figures and avatars out of the user's cache
+    asset_dir = ptv.ASSET_CACHE_DIR = os.path.join(work_dir, "assets")
+    results = {}
+
+    def bench(name, func, repeats=args.repeats):
+        print(f"   {name}...")
+        value, stats = time_call(func, repeats)
+        results[name] = stats
+        return value
+
+    with offline_engines(work_dir, summary) as gemini_server:
+        bench('extract_text_from_pdf', lambda: ptv.extract_text_from_pdf(pdf_path))
+        figure_dir = os.path.join(work_dir, "figures")
+        os.makedirs(figure_dir, exist_ok=True)
+        figures = bench('extract_images_from_pdf',
+                        lambda: ptv.extract_images_from_pdf(pdf_path, figure_dir, max_images=args.figures))
+        sections = bench('parse_markdown_to_sections',
+                         lambda: ptv.parse_markdown_to_sections(ptv.clean_gemini_response(summary)))
+
+        slide_dir = os.path.join(work_dir, "slides")
+        os.makedirs(slide_dir, exist_ok=True)
+        slides, slide_to_section = bench('create_slides_with_avatar', lambda: ptv.create_slides_with_avatar(
+            sections, slide_dir, figures=figures, language=args.language))
+
+        # A phone-camera-sized avatar, scaled with the asset cache cold and then warm on disk
+        avatar_path = os.path.join(work_dir, "avatar.jpg")
+        Image.radial_gradient('L').resize((3000, 4000)).convert('RGB').save(avatar_path, quality=90)
+
+        def scale_avatar(cold):
+            ptv._asset_cache.clear()
+            if cold:
+                shutil.rmtree(asset_dir, ignore_errors=True)
+            return ptv.load_avatar(avatar_path, (300, 400))
+
+        bench('load_avatar 3000x4000 (cold)', lambda: scale_avatar(cold=True))
+        bench('load_avatar 3000x4000 (disk cache)', lambda: scale_avatar(cold=False))
+
+        audio_dir = os.path.join(work_dir, "audio")
+        os.makedirs(audio_dir, exist_ok=True)
+        section_audio_files = ptv.text_to_speech_per_section(sections, audio_dir, language=args.language)
+        bench('create_video', lambda: ptv.create_video(slides, slide_to_section, section_audio_files, audio_dir),
+              repeats=args.video_repeats)
+
+        bench('summarize_with_ollama (fake CLI)',
+              lambda: ptv.summarize_with_ollama(ptv.extract_text_from_pdf(pdf_path), language=args.language))
+        paper_text = ptv.extract_text_from_pdf(pdf_path)
+        bench('summarize_with_gemini (fake server)',
+              lambda: ptv.summarize_with_gemini(paper_text, language=args.language))
+
+        def summarize_structured():
+            gemini_server.drop_fields = ('results',)  # forces one follow-up prompt
+            return ptv.summarize_structured(paper_text, method="gemini", language=args.language)
+
+        bench('summarize_structured+repair (fake server)', summarize_structured)
+        prompts = [ptv.build_summary_prompt(paper_text, args.language)] * 8
+        bench('gemini map x8 (fake server)', lambda: ptv.get_gemini_client().map(prompts))
+
+        first_audio = []
+
+        def elevenlabs():
+            started = time.perf_counter()
+            return ptv.text_to_speech_elevenlabs(
+                SYNTHETIC_SENTENCES[args.language] * 5, os.path.join(audio_dir, "elevenlabs.mp3"),
+                on_first_audio=lambda _: first_audio.append(time.perf_counter() - started))
+
+        bench('text_to_speech_elevenlabs (fake server)', elevenlabs)
+        if first_audio:
+            results['elevenlabs first audio (fake server)'] = timing_stats(first_audio)
+
+        # A stalled ElevenLabs call is hedged with gTTS once its (scaled-down) budget runs out
+        with fake_elevenlabs_server(stall_seconds=3.0) as stalled_url:
+            saved = ptv.ELEVENLABS_API_URL, ptv._tts_budget_scale
+            ptv.ELEVENLABS_API_URL = stalled_url
+            ptv.set_tts_budget_scale(0.1)
+            try:
+                bench('elevenlabs hedged by gtts (stalled server)', lambda: ptv.synthesize_speech(
+                    SYNTHETIC_SENTENCES[args.language], os.path.join(audio_dir, "hedged.mp3"),
+                    voice_engine="elevenlabs", language=args.language))
+            finally:
+                ptv.ELEVENLABS_API_URL = saved[0]
+                ptv.set_tts_budget_scale(saved[1])
+
+    return {
+        'config': {
+            'pages': args.pages,
+            'figures': args.figures,
+            'language': args.language,
+            'sentences': args.sentences,
+        },
+        'results': results,
+    }
+
+
+def open_fd_count():
+    """Returns the number of open file descriptors in this process (None if unknown)."""
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return None
+
+
+def child_process_count():
+    """Returns the number of live child processes of this process (None if unknown)."""
+    try:
+        pids = [name for name in os.listdir("/proc") if name.isdigit()]
+    except OSError:
+        return None
+    count = 0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat", "r") as f:
+                # The ppid follows the parenthesised command name, which may contain spaces
+                fields = f.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        if int(fields[1]) == os.getpid():
+            count += 1
+    return count
+
+
+def run_soak(args, work_dir):
+    """Renders args.soak papers in one process; returns the failures (empty if resources stayed flat).
+
+    The first args.soak_warmup renders fill the process-wide caches and are
+    not counted; after that RSS may grow by at most --max-rss-growth MB and
+    the open FD and child process counts must not grow at all.
+    """
+    summary = make_synthetic_summary(args.language, sentences_per_section=args.sentences)
+    # Keep scaled figures and avatars out of the user's cache
+    ptv.ASSET_CACHE_DIR = os.path.join(work_dir, "assets")
+    samples = []
+    with offline_engines(work_dir, summary):
+        pipeline = ptv.Pipeline(summarizer="ollama", language=args.language, draft=not args.soak_full,
+                                work_dir=os.path.join(work_dir, "renders"))
+        for idx in range(args.soak):
+            pdf_path = make_synthetic_pdf(os.path.join(work_dir, f"soak_{idx:03d}.pdf"), pages=args.pages,
+                                          figures=args.figures, language=args.language, seed=idx)
+            started = time.perf_counter()
+            artifacts = pipeline.render(pdf_path)
+            shutil.rmtree(artifacts['output_dir'], ignore_errors=True)
+            os.remove(pdf_path)
+            sample = {
+                'render': idx,
+                'seconds': round(time.perf_counter() - started, 2),
+                'rss_mb': round(ptv.current_rss_bytes() / 2**20, 1),
+                'fds': open_fd_count(),
+                'children': child_process_count(),
+            }
+            samples.append(sample)
+            print(f"   render {idx:3d}: {sample['seconds']:6.2f}s  RSS {sample['rss_mb']:7.1f} MB  "
+                  f"FDs {sample['fds']}  children {sample['children']}")
+
+    failures = []
+    if len(samples) <= args.soak_warmup:
+        return failures
+    first, last = samples[args.soak_warmup], samples[-1]
+    rss_growth = last['rss_mb'] - first['rss_mb']
+    print(f"\n🧪 After warm-up: RSS {rss_growth:+.1f} MB, FDs {first['fds']} → {last['fds']}, "
+          f"children {first['children']} → {last['children']}")
+    if rss_growth > args.max_rss_growth:
+        failures.append(f"RSS grew {rss_growth:.1f} MB (limit {args.max_rss_growth} MB)")
+    for key in ('fds', 'children'):
+        if first[key] is not None and last[key] > first[key]:
+            failures.append(f"{key} grew from {first[key]} to {last[key]}")
+    return failures
+
+
+def check_scratch_in_use(args, work_dir):
+    """Two concurrent renders share a scratch directory capped far below one workspace."""
+    failures = []
+    scratch_dir = os.path.join(work_dir, "scratch")
+    # A held workspace survives pruning to a zero budget; an idle one does not
+    with ptv.scratch_workspace(scratch_dir, os.path.join(work_dir, "held")) as held:
+        with ptv.scratch_workspace(scratch_dir, os.path.join(work_dir, "idle")) as idle:
+            pass
+        for workspace in (held, idle):
+            with open(os.path.join(workspace, "audio.mp3"), "wb") as f:
+                f.write(bytes(1024))
+        removed = ptv.prune_scratch(scratch_dir, max_bytes=0)
+        if held in removed or not os.path.isdir(held):
+            failures.append("prune_scratch removed a workspace in use")
+        if idle not in removed:
+            failures.append("prune_scratch kept an idle workspace over the size limit")
+
+    summary = make_synthetic_summary(args.language, sentences_per_section=args.sentences)
+    with offline_engines(work_dir, summary):
+        pipeline = ptv.Pipeline(summarizer="ollama", language=args.language, draft=True,
+                                scratch_dir=scratch_dir, scratch_max_gb=1e-6)
+        errors = {}
+
+        def render(idx):
+            pdf_path = make_synthetic_pdf(os.path.join(work_dir, f"scratch_{idx}.pdf"), pages=args.pages,
+                                          figures=args.figures, language=args.language, seed=idx)
+            try:
+                artifacts = pipeline.render(pdf_path, os.path.join(work_dir, f"scratch_render_{idx}"))
+                if not os.path.exists(artifacts['video_path']):
+                    errors[idx] = "no video"
+            except Exception as e:
+                errors[idx] = repr(e)
+
+        threads = [threading.Thread(target=render, args=(idx,)) for idx in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    failures += [f"concurrent render {idx} failed: {error}" for idx, error in sorted(errors.items())]
+    return failures
+
+
+def check_summary_parser(args, work_dir):
+    """parse_summary matches the legacy parser, and keeps headers that look like preamble."""
+    failures = []
+    cases = [
+        make_markdown_summary('en', sections=6),
+        "Sure! Here's a summary of the paper:\n## Title\nA Paper\n## Abstract\nWe study things.",
+        "## \nDropped with its empty header\n## Introduction\nKept.",
+        "**Methods**\n- first step\n- second step\n\n1. numbered",
+        "Loose text before any title\n## Results\nNumbers.",
+    ]
+    for idx, text in enumerate(cases):
+        expected = legacy_parse_markdown_to_sections(legacy_clean_gemini_response(text))
+        if ptv.parse_summary(text, 'en') != expected:
+            failures.append(f"case {idx} differs from the legacy parser")
+    # 摘要 (Abstract) is the zh Abstract header and also a zh preamble word
+    sections = ptv.parse_summary("## 摘要\n内容一。内容二。\n\n## 引言\n引言内容。", 'zh')
+    if [section['title'] for section in sections] != ['摘要', '引言']:
+        failures.append(f"zh Abstract header dropped as preamble: {sections}")
+    return failures
+
+
+def check_elevenlabs_stream(args, work_dir):
+    """The streamed ElevenLabs call reports first audio early, cancels cleanly and matches the plain endpoint."""
+    import requests
+    failures = []
+    # Long enough that streaming the chunks, not encoding the MP3, dominates the call
+    text = SYNTHETIC_SENTENCES[args.language] * 20
+    saved = ptv.ELEVENLABS_API_KEY, ptv.ELEVENLABS_API_URL
+    with fake_elevenlabs_server() as url:
+        ptv.ELEVENLABS_API_KEY, ptv.ELEVENLABS_API_URL = "offline-check", url
+        try:
+            # Complete stream: the callback fires with audio on disk, long before the stream ends
+            path = os.path.join(work_dir, "streamed.mp3")
+            first = {}
+            started = time.perf_counter()
+
+            def on_first_audio(output_path):
+                first['s'] = time.perf_counter() - started
+                first['bytes'] = os.path.getsize(output_path)
+
+            ok = ptv.text_to_speech_elevenlabs(text, path, on_first_audio=on_first_audio)
+            total = time.perf_counter() - started
+            if not ok or 's' not in first:
+                failures.append("streamed call failed or never reported first audio")
+            else:
+                if not first['bytes']:
+                    failures.append("first audio reported before any bytes were on disk")
+                if first['s'] > total / 2:
+                    failures.append(f"first audio after {first['s']:.2f}s of a {total:.2f}s stream")
+                # The stream must carry exactly the bytes of the non-streaming endpoint
+                plain = requests.post(f"{url}/v1/text-to-speech/voice", json={'text': text}, timeout=30).content
+                with open(path, "rb") as f:
+                    if f.read() != plain:
+                        failures.append("streamed audio differs from the non-streamed response")
+
+            # Cancelled stream: stops early and leaves no partial file behind
+            path = os.path.join(work_dir, "cancelled.mp3")
+            cancel = threading.Event()
+            started = time.perf_counter()
+            ok = ptv.text_to_speech_elevenlabs(text, path, on_first_audio=lambda _: cancel.set(), cancel=cancel)
+            elapsed = time.perf_counter() - started
+            if ok:
+                failures.append("cancelled call reported success")
+            if os.path.exists(path):
+                failures.append("cancelled call left a partial file")
+            if elapsed > total / 2:
+                failures.append(f"cancelled call ran {elapsed:.2f}s of a {total:.2f}s stream")
+        finally:
+            ptv.ELEVENLABS_API_KEY, ptv.ELEVENLABS_API_URL = saved
+    return failures
+
+
+# --check: functional checks against the stand-ins, each returning its failures
+CHECKS = [check_scratch_in_use, check_summary_parser, check_elevenlabs_stream]
+
+
+def run_checks(args, work_dir):
+    """Runs every check in CHECKS; returns the failures."""
+    ptv.ASSET_CACHE_DIR = os.path.join(work_dir, "assets")
+    failures = []
+    for check in CHECKS:
+        print(f"   {check.__name__}...")
+        check_dir = os.path.join(work_dir, check.__name__)
+        os.makedirs(check_dir)
+        failures += [f"{check.__name__}: {failure}" for failure in check(args, check_dir)]
+    return failures
+
+
+def average_log_spectrum(path, n_fft=1024):
+    """Returns the time-averaged log-magnitude spectrum of an audio file (a timbre fingerprint)."""
+    segment = AudioSegment.from_file(path).set_channels(1).set_frame_rate(22050)
+    samples = np.array(segment.get_array_of_samples(), dtype=np.float32)
+    frames = samples[:len(samples) // n_fft * n_fft].reshape(-1, n_fft) * np.hanning(n_fft)
+    return 20 * np.log10(np.abs(np.fft.rfft(frames, axis=1)).mean(axis=0) + 1e-6)
+
+
+# The multi-pass text functions the normalization engine replaced, kept as
+# the reference for --text
+def legacy_clean_gemini_response(text):
+    lines = text.split('\n')
+    cleaned_lines = []
+    started = False
+    for line in lines:
+        line_lower = line.lower().strip()
+        if not started:
+            skip_patterns = [
+                'of course', 'here is', 'here\'s', 'i\'ll provide',
+                'let me', 'i can', 'certainly', 'sure', 'formatted into',
+                '물론', '여기', '다음은', '제공', '요약'
+            ]
+            if any(pattern in line_lower for pattern in skip_patterns) and len(line_lower) < 100:
+                continue
+            started = True
+        cleaned_lines.append(line)
+    return '\n'.join(cleaned_lines).strip()
+
+
+def legacy_parse_markdown_to_sections(text):
+    sections = []
+    current_title = None
+    current_content = []
+    for line in text.split('\n'):
+        if line.strip().startswith('##'):
+            if current_title:
+                sections.append({'title': current_title, 'content': '\n'.join(current_content).strip()})
+            current_title = line.replace('##', '').strip()
+            current_content = []
+        elif line.strip().startswith('**') and line.strip().endswith('**'):
+            if current_title:
+                sections.append({'title': current_title, 'content': '\n'.join(current_content).strip()})
+            current_title = line.replace('**', '').strip()
+            current_content = []
+        elif line.strip():
+            current_content.append(line)
+    if current_title:
+        sections.append({'title': current_title, 'content': '\n'.join(current_content).strip()})
+    return sections
+
+
+def legacy_clean_text_for_speech(text):
+    text = re.sub(r'#{1,6}\s+', '', text)
+    text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)
+    text = re.sub(r'\*([^*]+)\*', r'\1', text)
+    text = re.sub(r'__([^_]+)__', r'\1', text)
+    text = re.sub(r'_([^_]+)_', r'\1', text)
+    text = re.sub(r'^\s*[-*+]\s+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'^\s*\d+\.\s+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'([a-z가-힣])\n([A-Z가-힣])', r'\1. \2', text)
+    text = re.sub(r' +', ' ', text)
+    text = re.sub(r'\n\s*\n', '. ', text)
+    text = re.sub(r'\n', ' ', text)
+    text = re.sub(r'\.\.+', '.', text)
+    return text.strip()
+
+
+def make_markdown_summary(language='en', sections=200, sentences_per_section=4):
+    """Returns a long, markup-heavy summary: preamble, headers, emphasis, lists and wrapped lines."""
+    sentence = SYNTHETIC_SENTENCES[language]
+    words = sentence.split(' ')
+    if len(words) > 1:
+        emphasised = ' '.join(f"**{word}**" if idx % 4 == 1 else f"*{word}*" if idx % 4 == 3 else word
+                              for idx, word in enumerate(words))
+    else:
+        # Unspaced scripts: emphasise runs of characters inside the sentence
+        emphasised = ''.join(f"**{sentence[idx:idx + 4]}**" if idx % 16 == 4 else sentence[idx:idx + 4]
+                             for idx in range(0, len(sentence), 4))
+    parts = ["Sure, here is the summary you asked for:", ""]
+    for idx in range(sections):
+        parts.append(f"## {SECTION_TITLES[idx % len(SECTION_TITLES)]} {idx}")
+        for _ in range(sentences_per_section):
+            parts.append(emphasised)
+            parts.append(sentence)
+        parts.append("")
+        parts.extend([f"- {sentence}", f"- __{sentence}__", f"1. {sentence}", f"2. {sentence}", ""])
+    return "\n".join(parts)
+
+
+def run_text_bench(args):
+    """Times the single-pass text normalization against the legacy multi-pass functions."""
+    summary = make_markdown_summary(args.language, sections=args.text, sentences_per_section=args.sentences)
+    sections = ptv.parse_summary(summary, args.language)
+    texts = [f"{section['title']}. {section['content']}" for section in sections]
+    print(f"   {len(summary) / 1024:.0f} KB of markdown, {len(sections)} sections")
+    pairs = [
+        ('parse summary',
+         lambda: legacy_parse_markdown_to_sections(legacy_clean_gemini_response(summary)),
+         lambda: ptv.parse_summary(summary, args.language)),
+        ('speech text (per section)',
+         lambda: [legacy_clean_text_for_speech(text) for text in texts],
+         lambda: [ptv.clean_text_for_speech(text, args.language) for text in texts]),
+        ('sections + speech + slides',
+         lambda: [(legacy_clean_text_for_speech(f"{section['title']}. {section['content']}"),
+                   [line.strip() for line in section['content'].split('\n') if line.strip()])
+                  for section in legacy_parse_markdown_to_sections(legacy_clean_gemini_response(summary))],
+         lambda: ptv.normalize_summary(summary, args.language)),
+        ('speech text (whole summary)',
+         lambda: legacy_clean_text_for_speech(summary),
+         lambda: ptv.clean_text_for_speech(summary, args.language)),
+    ]
+    rows = []
+    for name, legacy, current in pairs:
+        _, legacy_stats = time_call(legacy, args.repeats)
+        _, current_stats = time_call(current, args.repeats)
+        rows.append({'name': name, 'legacy': legacy_stats, 'current': current_stats})
+    return rows
+
+
+def run_coqui_rtf(args, work_dir):
+    """Times Coqui synthesis at each precision; returns one row per precision.
+
+    Every precision synthesizes the same text from the same seed. The
+    spectral distance (dB RMS between time-averaged spectra) compares each
+    output with the first precision's; XTTS samples its output, so treat it
+    as a coarse check and listen to the kept WAVs before switching.
+    """
+    import torch
+
+    text = " ".join([SYNTHETIC_SENTENCES[args.language]] * args.sentences)
+    rows = []
+    reference = None
+    for precision in ptv.parse_languages(args.coqui_precisions):
+        ptv.set_coqui_options(precision, args.coqui_threads)
+        started = time.perf_counter()
+        ptv.get_coqui_model()
+        load_s = time.perf_counter() - started
+
+        wav_path = os.path.join(work_dir, f"coqui_{precision}.wav")
+        # First call pays for lazy initialisation; not timed
+        ptv.text_to_speech_coqui(SYNTHETIC_SENTENCES[args.language], wav_path,
+                                 speaker_wav=args.voice_sample, language=args.language)
+
+        def synthesize():
+            torch.manual_seed(0)
+            if not ptv.text_to_speech_coqui(text, wav_path, speaker_wav=args.voice_sample, language=args.language):
+                raise RuntimeError(f"Coqui synthesis failed at {precision}")
+
+        print(f"   {precision}: synthesizing {len(text)} characters x{args.repeats}...")
+        _, stats = time_call(synthesize, args.repeats)
+        audio_s = len(AudioSegment.from_file(wav_path)) / 1000.0
+        spectrum = average_log_spectrum(wav_path)
+        if reference is None:
+            reference = spectrum
+        rows.append({
+            'precision': precision,
+            'threads': torch.get_num_threads(),
+            'load_s': round(load_s, 2),
+            'synth_s': stats['median_s'],
+            'audio_s': round(audio_s, 2),
+            'rtf': round(stats['median_s'] / audio_s, 3) if audio_s else None,
+            'spectral_distance_db': round(float(np.sqrt(np.mean((spectrum - reference) ** 2))), 2),
+            'wav': wav_path,
+        })
+    return rows
+
+
+def compare_to_baseline(current, baseline, tolerance, min_delta=0.01):
+    """Prints per-benchmark deltas; returns the names that regressed beyond tolerance.
+
+    Slowdowns smaller than min_delta seconds are treated as timer noise.
+    """
+    if baseline.get('config') != current['config']:
+        print(f"   ⚠️  Baseline config {baseline.get('config')} differs from {current['config']}")
+    regressions = []
+    for name, stats in current['results'].items():
+        reference = baseline.get('results', {}).get(name)
+        if not reference:
+            print(f"   {name:<42} {stats['median_s']:8.3f}s  (new)")
+            continue
+        delta = stats['median_s'] - reference['median_s']
+        change = delta / max(reference['median_s'], 1e-9)
+        regressed = change > tolerance and delta > min_delta
+        marker = "❌" if regressed else "✓"
+        print(f"   {marker} {name:<40} {stats['median_s']:8.3f}s  vs {reference['median_s']:8.3f}s  ({change:+.0%})")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the paper-to-video pipeline.")
+    parser.add_argument("--pages", type=int, default=10, help="Pages in the synthetic paper")
+    parser.add_argument("--figures", type=int, default=4, help="Figures in the synthetic paper (max 10)")
+    parser.add_argument("--language", default="en", choices=sorted(SYNTHETIC_SENTENCES),
+                       help="Language of the synthetic paper and summary (ko/ja/zh exercise CJK text)")
+    parser.add_argument("--sentences", type=int, default=4, help="Sentences per summary section")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed repetitions per benchmark")
+    parser.add_argument("--video-repeats", type=int, default=1, help="Timed repetitions of create_video")
+    parser.add_argument("--baseline", default=None, help="Compare against this baseline JSON")
+    parser.add_argument("--save-baseline", default=None, help="Write the results to this baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                       help="Allowed slowdown vs baseline before failing (0.25 = 25%%)")
+    parser.add_argument("--min-delta", type=float, default=0.01,
+                       help="Ignore slowdowns below this many seconds (timer noise)")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary work directory")
+    parser.add_argument("--check", action="store_true",
+                       help="Instead of timing, run the functional checks in CHECKS")
+    parser.add_argument("--soak", type=int, default=0, metavar="N",
+                       help="Instead of timing, render N papers in one process and check for resource leaks")
+    parser.add_argument("--soak-warmup", type=int, default=3, help="Soak renders ignored while caches fill")
+    parser.add_argument("--soak-full", action="store_true", help="Soak with full-quality encodes instead of drafts")
+    parser.add_argument("--max-rss-growth", type=float, default=32,
+                       help="RSS growth in MB allowed across the soak after warm-up")
+    parser.add_argument("--coqui-rtf", action="store_true",
+                       help="Instead of timing the pipeline, compare Coqui real-time factors per precision")
+    parser.add_argument("--coqui-precisions", default=",".join(ptv.COQUI_PRECISIONS),
+                       help="Precisions to compare, comma-separated; the first is the quality reference")
+    parser.add_argument("--coqui-threads", type=int, default=None, help="Torch intra-op threads for Coqui")
+    parser.add_argument("--voice-sample", default=None, help="Speaker WAV for Coqui (XTTS needs a speaker)")
+    parser.add_argument("--text", type=int, default=0, metavar="SECTIONS",
+                       help="Instead of timing the pipeline, micro-benchmark text normalization on a summary "
+                            "with this many sections against the legacy multi-pass functions")
+    args = parser.parse_args()
+
+    if args.text:
+        print(f"🔤 Text normalization, single pass vs legacy ({args.language}, {args.repeats} repeats)")
+        rows = run_text_bench(args)
+        print(f"\n   {'':<28} {'legacy':>9} {'current':>9} {'speed-up':>8}")
+        for row in rows:
+            legacy, current = row['legacy']['median_s'], row['current']['median_s']
+            print(f"   {row['name']:<28} {legacy * 1000:>7.1f}ms {current * 1000:>7.1f}ms "
+                  f"{legacy / current if current else 0:>7.2f}x")
+        if args.save_baseline:
+            with open(args.save_baseline, "w", encoding='utf-8') as f:
+                json.dump({'text': rows}, f, indent=2)
+            print(f"💾 Saved: {args.save_baseline}")
+        return
+
+    if args.coqui_rtf:
+        missing = [name for name in ("torch", "TTS") if importlib.util.find_spec(name) is None]
+        if missing:
+            parser.error(f"--coqui-rtf needs Coqui TTS and torch installed (missing: {', '.join(missing)})")
+        work_dir = tempfile.mkdtemp(prefix="ptv_coqui_rtf_")
+        print(f"🗣️  Coqui real-time factor by precision ({args.language}, WAVs in {work_dir})")
+        rows = run_coqui_rtf(args, work_dir)
+        print(f"\n   {'precision':<10} {'threads':>7} {'load':>7} {'synth':>8} {'audio':>8} {'RTF':>6} "
+              f"{'speed-up':>8} {'Δspectrum':>10}")
+        for row in rows:
+            speedup = rows[0]['synth_s'] / row['synth_s'] if row['synth_s'] else 0.0
+            print(f"   {row['precision']:<10} {row['threads']:>7} {row['load_s']:>6.1f}s {row['synth_s']:>7.2f}s "
+                  f"{row['audio_s']:>7.1f}s {row['rtf']:>6.2f} {speedup:>7.2f}x {row['spectral_distance_db']:>8.2f}dB")
+        if args.save_baseline:
+            with open(args.save_baseline, "w", encoding='utf-8') as f:
+                json.dump({'coqui_rtf': rows}, f, indent=2)
+            print(f"💾 Saved: {args.save_baseline}")
+        return
+
+    work_dir = tempfile.mkdtemp(prefix="ptv_bench_")
+    if args.check:
+        print(f"🔎 Functional checks against the stand-ins ({args.language})")
+        try:
+            failures = run_checks(args, work_dir)
+        finally:
+            if not args.keep:
+                shutil.rmtree(work_dir, ignore_errors=True)
+        if failures:
+            print("❌ Failed checks:\n" + "\n".join(f"   {failure}" for failure in failures))
+            sys.exit(1)
+        print("✅ All checks passed")
+        return
+
+    if args.soak:
+        print(f"🧪 Soak: {args.soak} renders in one process ({args.pages} pages, {args.figures} figures)")
+        try:
+            failures = run_soak(args, work_dir)
+        finally:
+            if not args.keep:
+                shutil.rmtree(work_dir, ignore_errors=True)
+        if failures:
+            print(f"❌ Resource growth: {'; '.join(failures)}")
+            sys.exit(1)
+        print("✅ Memory, file descriptors and child processes stayed flat")
+        return
+
+    print(f"🏁 Benchmarking in {work_dir} ({args.pages} pages, {args.figures} figures, {args.language})")
+    try:
+        current = run_benchmarks(args, work_dir)
+    finally:
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("\n📊 Results (median):")
+    for name, stats in current['results'].items():
+        print(f"   {name:<42} {stats['median_s']:8.3f}s")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+        print(f"💾 Baseline saved: {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\n📈 Compared with {args.baseline}:")
+        regressions = compare_to_baseline(current, baseline, args.tolerance, args.min_delta)
+        if regressions:
+            print(f"\n❌ Regressions: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
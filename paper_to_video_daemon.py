@@ -0,0 +1,318 @@
+"""Long-running render service for paper_to_video_v5_multilang.py.
+
+Accepts render jobs over HTTP (or a UNIX socket), keeps Pipelines warm
+(Coqui model, fonts, slide templates, avatar) between jobs, and applies
+backpressure: when the bounded queue is full new jobs are rejected with
+503 instead of piling up.
+
+Usage:
+    python paper_to_video_daemon.py --port 8700 --workers 2 --max-queue 8
+    python paper_to_video_daemon.py --socket /tmp/paper_to_video.sock
+
+API:
+    POST /jobs        {"paper_location": "...", "language": "en,ko", "renditions": "720p,vertical", ...}
+                      -> 202 {"id": ...}
+    GET  /jobs/<id>   job status, output directory and video path
+    GET  /status      queue depth, running jobs and stage limits
+"""
+import os
+import json
+import queue
+import argparse
+import datetime
+import threading
+import traceback
+import uuid
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import paper_to_video_v5_multilang as ptv
+
+# Job options a client may set, with their allowed values (None = free-form)
+JOB_OPTIONS = {
+    'summarizer': ["gemini", "ollama", "manual"],
+    'voice_engine': ["gtts", "coqui", "elevenlabs"],
+    'voice_sample': None,
+    'avatar_image': None,
+    'language': ["en", "ko", "ja", "zh"],
+    'renditions': list(ptv.RENDITIONS),
+    'draft': [False, True],
+    'estimate_audio': [False, True],
+    'contact_sheet': [False, True],
+    'output_format': ptv.OUTPUT_FORMATS,
+    'summary_format': ptv.SUMMARY_FORMATS,
+}
+
+
+class QueueFullError(Exception):
+    """Raised when the daemon is at capacity and cannot accept another job."""
+
+
+class RenderDaemon:
+    """Bounded job queue in front of a pool of warm Pipelines."""
+
+    def __init__(self, output_root="renders", workers=2, max_queue=8, max_jobs_kept=1000, pipeline_options=None):
+        self.output_root = output_root
+        # Server-side Pipeline settings (scratch space) applied to every job
+        self.pipeline_options = pipeline_options or {}
+        self.workers = workers
+        self.max_jobs_kept = max_jobs_kept
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.jobs = {}
+        self.pipelines = {}
+        self._lock = threading.Lock()
+        self._threads = []
+        os.makedirs(output_root, exist_ok=True)
+
+    def start(self):
+        """Starts the worker threads."""
+        for idx in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"render-{idx}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def get_pipeline(self, options):
+        """Returns the warm Pipeline for this option set, creating it on first use."""
+        key = tuple(sorted(options.items()))
+        with self._lock:
+            pipeline = self.pipelines.get(key)
+        if pipeline is None:
+            pipeline = ptv.Pipeline(**options, **self.pipeline_options)
+            with self._lock:
+                pipeline = self.pipelines.setdefault(key, pipeline)
+        return pipeline
+
+    def submit(self, request):
+        """Validates and enqueues a job; raises ValueError or QueueFullError."""
+        paper_location = request.get('paper_location')
+        if not paper_location or not isinstance(paper_location, str):
+            raise ValueError("paper_location is required (a URL or path)")
+        options = dict(ptv.JOB_DEFAULTS)
+        for key, value in request.items():
+            if key == 'paper_location':
+                continue
+            if key not in JOB_OPTIONS:
+                raise ValueError(f"Unknown option: {key}")
+            allowed = JOB_OPTIONS[key]
+            # Values are checked by type too: a wrong one would only fail deep inside the
+            # render, and every value must be hashable to key the warm Pipelines
+            if key in ('language', 'renditions'):
+                # One job may render several languages ("en,ko,ja") and renditions ("720p,vertical")
+                if isinstance(value, str):
+                    codes = ptv.parse_languages(value)
+                elif isinstance(value, list) and all(isinstance(code, str) for code in value):
+                    codes = ptv.parse_languages(",".join(value))
+                else:
+                    raise ValueError(f"Invalid {key}: {value!r} (expected a comma-separated string or a list of strings)")
+                if not codes or any(code not in allowed for code in codes):
+                    raise ValueError(f"Invalid {key}: {value} (choose from {', '.join(allowed)})")
+                value = ",".join(codes)
+            elif allowed == [False, True]:
+                if not isinstance(value, bool):
+                    raise ValueError(f"Invalid {key}: {value!r} (expected true or false)")
+            elif allowed is None:
+                if value is not None and not isinstance(value, str):
+                    raise ValueError(f"Invalid {key}: {value!r} (expected a string or null)")
+            elif not isinstance(value, str) or value not in allowed:
+                raise ValueError(f"Invalid {key}: {value!r} (choose from {', '.join(allowed)})")
+            options[key] = value
+
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            'id': job_id,
+            'status': "queued",
+            'paper_location': paper_location,
+            'options': options,
+            'submitted_at': _now(),
+        }
+        with self._lock:
+            try:
+                self.queue.put_nowait(job_id)
+            except queue.Full:
+                raise QueueFullError(f"Queue is full ({self.queue.maxsize} jobs waiting)")
+            self.jobs[job_id] = job
+            self._forget_old_jobs()
+        return job
+
+    def _forget_old_jobs(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job['status'] in ("done", "failed")]
+        for job_id in finished[:max(0, len(self.jobs) - self.max_jobs_kept)]:
+            del self.jobs[job_id]
+
+    def _work(self):
+        while True:
+            job_id = self.queue.get()
+            with self._lock:
+                job = self.jobs[job_id]
+                job['status'] = "running"
+                job['started_at'] = _now()
+            try:
+                pipeline = self.get_pipeline(job['options'])
+                output_dir = os.path.join(self.output_root, job_id)
+                artifacts = pipeline.render(job['paper_location'], output_dir=output_dir)
+                update = {
+                    'status': "done",
+                    'output_dir': output_dir,
+                    'video_path': artifacts['video_path'],
+                    'sections': len(artifacts['sections']),
+                    'slides': len(artifacts['slides']),
+                    'duration': sum(duration for _, duration in artifacts['audio']),
+                }
+            except Exception as e:
+                traceback.print_exc()
+                update = {'status': "failed", 'error': str(e)}
+            with self._lock:
+                job.update(update, finished_at=_now())
+            self.queue.task_done()
+
+    def job(self, job_id):
+        """Returns a copy of a job's record, or None."""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def status(self):
+        """Returns queue depth, capacity and job counts."""
+        with self._lock:
+            counts = {}
+            for job in self.jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+            return {
+                'queue_depth': self.queue.qsize(),
+                'queue_capacity': self.queue.maxsize,
+                'workers': self.workers,
+                'jobs': counts,
+                'warm_pipelines': len(self.pipelines),
+                'stage_limits': ptv.get_stage_limits(),
+            }
+
+
+def _now():
+    return datetime.datetime.now().isoformat(timespec='seconds')
+
+
+class DaemonRequestHandler(BaseHTTPRequestHandler):
+    """JSON API over the RenderDaemon attached to the server."""
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        daemon = self.server.render_daemon
+        if self.path == "/status":
+            self._send_json(200, daemon.status())
+        elif self.path.startswith("/jobs/"):
+            job = daemon.job(self.path[len("/jobs/"):])
+            if job:
+                self._send_json(200, job)
+            else:
+                self._send_json(404, {'error': "Unknown job"})
+        else:
+            self._send_json(404, {'error': "Not found"})
+
+    def do_POST(self):
+        if self.path != "/jobs":
+            self._send_json(404, {'error': "Not found"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("Request body must be a JSON object")
+            job = self.server.render_daemon.submit(request)
+        except QueueFullError as e:
+            self._send_json(503, {'error': str(e)}, headers={'Retry-After': "30"})
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json(400, {'error': str(e)})
+        else:
+            self._send_json(202, job, headers={'Location': f"/jobs/{job['id']}"})
+
+    def address_string(self):
+        # UNIX-socket clients have no (host, port) address
+        return self.client_address[0] if self.client_address else "unix"
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP server listening on a UNIX domain socket."""
+    daemon_threads = True
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name = "localhost"
+        self.server_port = 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Long-running paper-to-video render service.")
+    parser.add_argument("--host", default="127.0.0.1", help="HTTP bind address")
+    parser.add_argument("--port", type=int, default=8700, help="HTTP port")
+    parser.add_argument("--socket", default=None, help="Listen on this UNIX socket instead of TCP")
+    parser.add_argument("--output-root", default="renders", help="Directory for per-job output dirs")
+    parser.add_argument("--workers", type=int, default=2, help="Papers rendered concurrently")
+    parser.add_argument("--max-queue", type=int, default=8, help="Jobs waiting before new ones are rejected")
+    parser.add_argument("--tts-concurrency", type=int, default=1, help="TTS stages running at once")
+    parser.add_argument("--summarize-concurrency", type=int, default=1,
+                       help="LLM calls (summaries and translations) running at once")
+    parser.add_argument("--slides-concurrency", type=int, default=2, help="Slide rasterizers running at once")
+    parser.add_argument("--encode-concurrency", type=int, default=1, help="Video encodes running at once")
+    parser.add_argument("--coqui-precision", default="fp32", choices=ptv.COQUI_PRECISIONS,
+                       help="Coqui CPU inference precision for every job")
+    parser.add_argument("--coqui-threads", type=int, default=None, help="Torch intra-op threads for Coqui")
+    parser.add_argument("--coqui-batch", action="store_true",
+                       help="Synthesize Coqui sections in one pass with shared speaker conditioning")
+    parser.add_argument("--tts-budget-scale", type=float, default=1.0, metavar="FACTOR",
+                       help="Scale TTS latency budgets before hedging with gTTS (0 = no hedging)")
+    parser.add_argument("--scratch-dir", default=ptv.SCRATCH_DIR, metavar="DIR",
+                       help="Keep job intermediates in workspaces here (e.g. /dev/shm); job dirs get only deliverables")
+    parser.add_argument("--scratch-max-gb", type=float, default=None, help="Scratch size limit (oldest removed first)")
+    parser.add_argument("--scratch-max-age-hours", type=float, default=None, help="Scratch workspace lifetime")
+    parser.add_argument("--preload", action="append", default=[], metavar="VOICE_ENGINE:LANGUAGE",
+                       help="Warm a pipeline at startup, e.g. coqui:ko (repeatable)")
+    args = parser.parse_args()
+
+    ptv.set_stage_limits({
+        'tts': args.tts_concurrency,
+        'summarize': args.summarize_concurrency,
+        'slides': args.slides_concurrency,
+        'encode': args.encode_concurrency,
+    })
+    ptv.set_coqui_options(args.coqui_precision, args.coqui_threads, args.coqui_batch)
+    ptv.set_tts_budget_scale(args.tts_budget_scale)
+    daemon = RenderDaemon(output_root=args.output_root, workers=args.workers, max_queue=args.max_queue,
+                          pipeline_options={'scratch_dir': args.scratch_dir, 'scratch_max_gb': args.scratch_max_gb,
+                                            'scratch_max_age_hours': args.scratch_max_age_hours})
+    for spec in args.preload:
+        voice_engine, _, language = spec.partition(":")
+        print(f"🔥 Warming pipeline: {voice_engine} / {language or 'en'}")
+        daemon.get_pipeline({**ptv.JOB_DEFAULTS, 'voice_engine': voice_engine, 'language': language or "en"})
+    daemon.start()
+
+    if args.socket:
+        server = UnixHTTPServer(args.socket, DaemonRequestHandler)
+        where = args.socket
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), DaemonRequestHandler)
+        where = f"http://{args.host}:{args.port}"
+    server.render_daemon = daemon
+    print(f"🎬 Render daemon listening on {where} ({args.workers} workers, queue {args.max_queue})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down")
+    finally:
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+
+
+if __name__ == "__main__":
+    main()
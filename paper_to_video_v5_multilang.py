@@ -1,20 +1,33 @@
 import os
-import requests
-import pypdf
-import fitz  # PyMuPDF
 import io
-from gtts import gTTS
-from moviepy import ImageClip, concatenate_videoclips, AudioFileClip, CompositeAudioClip
-from pydub import AudioSegment
-from PIL import Image, ImageDraw, ImageFont
 import argparse
 import datetime
 import re
 import subprocess
+import hashlib
+import json
+import threading
+import time
+import concurrent.futures
+import shutil
+import contextlib
+import mmap
+import sys
+import functools
+import tempfile
+import bisect
+import inspect
+import collections
+
+# Heavy backends (requests, pypdf, PyMuPDF, gTTS, pydub, PIL, moviepy, Coqui)
+# are imported inside the functions that use them, so --help, argument
+# errors and partial --stages runs never load the video stack.
 
 # API Keys (OPTIONAL)
 GEMINI_API_KEY = None  # Set if using --summarizer=gemini
+GEMINI_API_URL = os.environ.get("GEMINI_API_URL", "https://generativelanguage.googleapis.com")
 ELEVENLABS_API_KEY = None  # Set if using --voice-engine=elevenlabs
+ELEVENLABS_API_URL = os.environ.get("ELEVENLABS_API_URL", "https://api.elevenlabs.io")
 
 # Language-specific font mapping
 LANGUAGE_FONTS = {
@@ -24,32 +37,346 @@ LANGUAGE_FONTS = {
     'zh': 'NotoSansSC-Regular.ttf',   # Simplified Chinese
 }
 
+# Output renditions (frame width, height). Audio and the timeline are shared;
+# each rendition gets its own slide layout and encode.
+RENDITIONS = {
+    '720p': (1280, 720),
+    '1080p': (1920, 1080),
+    'vertical': (1080, 1920),
+}
+DEFAULT_RENDITION = '720p'
+
+# Draft mode (--draft): quick layout previews at a fraction of the
+# resolution, a couple of frames per second and the fastest x264 preset.
+DRAFT_SCALE = 0.5
+DRAFT_FPS = 2
+DRAFT_PRESET = 'ultrafast'
+DRAFT_VIDEO_NAME = "draft.mp4"
+CONTACT_SHEET_NAME = "contact_sheet.png"
+
+# Segmented output (--output-format hls): an HLS EVENT playlist over
+# fragmented-MP4 segments, written progressively as the encode proceeds.
+OUTPUT_FORMATS = ['mp4', 'hls']
+HLS_DIR_NAME = "hls"
+HLS_PLAYLIST_NAME = "stream.m3u8"
+HLS_INIT_NAME = "init.mp4"
+HLS_SEGMENT_SECONDS = 6
+# With a scratch workspace, finished segments are published this often while encoding
+HLS_PUBLISH_INTERVAL = 1.0
+
+# Tracing (--profile): spans around stages and external calls, exported as
+# a JSON summary and a Chrome trace-event file (chrome://tracing, Perfetto).
+PROFILE_SUMMARY_NAME = "profile.json"
+PROFILE_TRACE_NAME = "trace.json"
+
+def current_rss_bytes():
+    """Returns the current resident set size of this process (0 if unknown)."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        # ru_maxrss is the lifetime peak (KiB on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+class Tracer:
+    """Collects timed spans with peak RSS and exports them for profiling."""
+
+    def __init__(self, sample_interval=0.05):
+        self.t0 = time.perf_counter()
+        self.events = []
+        self._active = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sample_interval = sample_interval
+        self._sampler = threading.Thread(target=self._sample_rss, name="rss-sampler", daemon=True)
+        self._sampler.start()
+
+    def _sample_rss(self):
+        while not self._stop.wait(self._sample_interval):
+            rss = current_rss_bytes()
+            with self._lock:
+                for span in self._active.values():
+                    span['peak_rss'] = max(span['peak_rss'], rss)
+
+    @contextlib.contextmanager
+    def span(self, name, cat, **args):
+        """Times the enclosed block; yields a dict the caller can add span args to."""
+        span = {'name': name, 'cat': cat, 'args': dict(args), 'peak_rss': current_rss_bytes(),
+                'tid': threading.get_ident(), 'thread': threading.current_thread().name,
+                'start': time.perf_counter() - self.t0}
+        with self._lock:
+            self._active[id(span)] = span
+        try:
+            yield span['args']
+        finally:
+            span['end'] = time.perf_counter() - self.t0
+            span['peak_rss'] = max(span['peak_rss'], current_rss_bytes())
+            with self._lock:
+                del self._active[id(span)]
+                self.events.append(span)
+
+    def record(self, name, cat, start, **args):
+        """Records an already-finished span that began at perf_counter() == start."""
+        span = {'name': name, 'cat': cat, 'args': dict(args), 'peak_rss': current_rss_bytes(),
+                'tid': threading.get_ident(), 'thread': threading.current_thread().name,
+                'start': start - self.t0, 'end': time.perf_counter() - self.t0}
+        with self._lock:
+            self.events.append(span)
+
+    def summary(self):
+        """Aggregates spans by category and name."""
+        totals = {}
+        for span in self.events:
+            key = f"{span['cat']}:{span['name']}"
+            entry = totals.setdefault(key, {'count': 0, 'total_s': 0.0, 'max_s': 0.0, 'peak_rss_mb': 0.0})
+            duration = span['end'] - span['start']
+            entry['count'] += 1
+            entry['total_s'] = round(entry['total_s'] + duration, 4)
+            entry['max_s'] = round(max(entry['max_s'], duration), 4)
+            entry['peak_rss_mb'] = round(max(entry['peak_rss_mb'], span['peak_rss'] / 2**20), 1)
+        return {
+            'wall_s': round(time.perf_counter() - self.t0, 4),
+            'spans': totals,
+            'events': [
+                {'name': span['name'], 'cat': span['cat'], 'start_s': round(span['start'], 4),
+                 'duration_s': round(span['end'] - span['start'], 4),
+                 'peak_rss_mb': round(span['peak_rss'] / 2**20, 1), **span['args']}
+                for span in sorted(self.events, key=lambda span: span['start'])
+            ],
+        }
+
+    def chrome_trace(self):
+        """Returns the spans in Chrome trace-event format."""
+        pid = os.getpid()
+        events = []
+        threads = {}
+        for span in self.events:
+            threads[span['tid']] = span['thread']
+            events.append({
+                'name': span['name'], 'cat': span['cat'], 'ph': 'X', 'pid': pid, 'tid': span['tid'],
+                'ts': round(span['start'] * 1e6), 'dur': round((span['end'] - span['start']) * 1e6),
+                'args': {**span['args'], 'peak_rss_mb': round(span['peak_rss'] / 2**20, 1)},
+            })
+        for tid, thread_name in threads.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                           'args': {'name': thread_name}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write(self, output_dir):
+        """Stops sampling and writes the JSON summary and Chrome trace into output_dir."""
+        self._stop.set()
+        summary_path = os.path.join(output_dir, PROFILE_SUMMARY_NAME)
+        trace_path = os.path.join(output_dir, PROFILE_TRACE_NAME)
+        with self._lock:
+            summary = self.summary()
+            trace = self.chrome_trace()
+        with open(summary_path, "w", encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        with open(trace_path, "w", encoding='utf-8') as f:
+            json.dump(trace, f)
+        return summary_path, trace_path
+
+_tracer = None
+
+def start_tracing():
+    """Enables span collection for this process and returns the tracer."""
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+@contextlib.contextmanager
+def trace_span(name, cat='stage', **args):
+    """Times the enclosed block when tracing is on; yields a dict for extra span args."""
+    if _tracer is None:
+        yield {}
+        return
+    with _tracer.span(name, cat, **args) as span_args:
+        yield span_args
+
+def trace_record(name, cat, start, **args):
+    """Records a span that started at perf_counter() == start, if tracing is on."""
+    if _tracer is not None:
+        _tracer.record(name, cat, start, **args)
+
+# Downloaded PDFs are cached here and revalidated with conditional GETs
+PDF_CACHE_DIR = os.environ.get(
+    "PAPER_TO_VIDEO_PDF_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "paper_to_video", "pdfs")
+)
+HTTP_TIMEOUT = (10, 60)  # (connect, read) seconds
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def get_http_session():
+    """Returns the shared, connection-pooled HTTP session."""
+    import requests
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            _http_session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=2)
+            _http_session.mount("http://", adapter)
+            _http_session.mount("https://", adapter)
+        return _http_session
+
+def _link_or_copy(src, dst):
+    """Hard-links src to dst when possible (same filesystem), else copies it; dst is replaced atomically."""
+    if os.path.abspath(src) == os.path.abspath(dst) or (os.path.exists(dst) and os.path.samefile(src, dst)):
+        return
+    part_path = f"{dst}.{os.getpid()}.{threading.get_ident()}.part"
+    try:
+        os.link(src, part_path)
+    except OSError:
+        shutil.copyfile(src, part_path)
+    os.replace(part_path, dst)
+
+def fetch_paper(url, dest_path=None, cache_dir=None, timeout=HTTP_TIMEOUT, attempts=3):
+    """Fetches a PDF into the local cache, streaming it to disk.
+
+    A cached copy is revalidated with If-None-Match/If-Modified-Since, so an
+    unchanged paper costs a single 304 round trip. Interrupted downloads are
+    continued with Range requests. Returns the path of the PDF (dest_path if
+    given, otherwise the cache entry).
+    """
+    import requests
+    cache_dir = cache_dir or PDF_CACHE_DIR
+    os.makedirs(cache_dir, exist_ok=True)
+    key = hash_bytes(url.encode('utf-8'))
+    cached_path = os.path.join(cache_dir, f"{key}.pdf")
+    meta_path = os.path.join(cache_dir, f"{key}.json")
+    part_path = cached_path + ".part"
+
+    meta = {}
+    if os.path.exists(meta_path):
+        with open(meta_path, "r", encoding='utf-8') as f:
+            meta = json.load(f)
+    session = get_http_session()
+
+    with trace_span('download', 'io', url=url) as span:
+        for attempt in range(1, attempts + 1):
+            headers = {}
+            if os.path.exists(cached_path):
+                if meta.get('etag'):
+                    headers['If-None-Match'] = meta['etag']
+                if meta.get('last_modified'):
+                    headers['If-Modified-Since'] = meta['last_modified']
+            offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            if offset and (meta.get('part_etag') or meta.get('part_last_modified')):
+                headers['Range'] = f"bytes={offset}-"
+                headers['If-Range'] = meta.get('part_etag') or meta['part_last_modified']
+            else:
+                offset = 0
+
+            try:
+                with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+                    span['status'] = response.status_code
+                    if response.status_code == 304:
+                        print("   Cached copy is current (304 Not Modified)")
+                        break
+                    # The range starts at the end of the file: the previous attempt
+                    # received every byte but was interrupted before finalizing
+                    total = re.fullmatch(r'bytes \*/(\d+)', response.headers.get('Content-Range', '').strip())
+                    if response.status_code == 416 and offset and total and int(total.group(1)) == offset:
+                        print("   Partial download is already complete")
+                    else:
+                        response.raise_for_status()
+
+                        mode = "ab" if response.status_code == 206 else "wb"
+                        if mode == "ab":
+                            print(f"   Resuming download at byte {offset}")
+                        else:
+                            offset = 0
+                        meta['part_etag'] = response.headers.get('ETag')
+                        meta['part_last_modified'] = response.headers.get('Last-Modified')
+                        with open(meta_path, "w", encoding='utf-8') as f:
+                            json.dump(meta, f)
+
+                        with open(part_path, mode) as f:
+                            for chunk in response.iter_content(chunk_size=1 << 16):
+                                f.write(chunk)
+
+                os.replace(part_path, cached_path)
+                span['bytes'] = os.path.getsize(cached_path) - offset
+                meta = {
+                    'url': url,
+                    'etag': meta.get('part_etag'),
+                    'last_modified': meta.get('part_last_modified'),
+                    'size': os.path.getsize(cached_path),
+                }
+                with open(meta_path, "w", encoding='utf-8') as f:
+                    json.dump(meta, f)
+                break
+            except (requests.ConnectionError, requests.Timeout,
+                    requests.exceptions.ChunkedEncodingError) as e:
+                if attempt == attempts:
+                    raise
+                print(f"   ⚠️  Download interrupted ({e}); retrying ({attempt}/{attempts})...")
+
+    if dest_path:
+        _link_or_copy(cached_path, dest_path)
+        return dest_path
+    return cached_path
+
 def download_paper(url):
     """Downloads the paper from the given URL."""
-    response = requests.get(url)
-    response.raise_for_status()
-    return response.content
+    with open(fetch_paper(url), "rb") as f:
+        return f.read()
 
 def read_local_pdf(file_path):
     """Reads a local PDF file."""
     with open(file_path, "rb") as f:
         return f.read()
 
-def extract_text_from_pdf(pdf_content):
-    """Extracts text from PDF."""
-    text = ""
-    with io.BytesIO(pdf_content) as f:
+def is_pdf_path(pdf_source):
+    """True if pdf_source is a filesystem path rather than in-memory PDF bytes."""
+    return isinstance(pdf_source, (str, os.PathLike))
+
+@contextlib.contextmanager
+def open_pdf_stream(pdf_source):
+    """Yields a seekable stream over a PDF given as a path or as bytes.
+
+    Paths are memory-mapped read-only, so pages are paged in from the OS
+    cache on demand instead of copying the whole file into the Python heap.
+    """
+    if not is_pdf_path(pdf_source):
+        with io.BytesIO(pdf_source) as f:
+            yield f
+        return
+    with open(pdf_source, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+def extract_text_from_pdf(pdf_source):
+    """Extracts text from PDF (path or bytes)."""
+    import pypdf
+    with trace_span('pypdf_extract', 'cpu') as span, open_pdf_stream(pdf_source) as f:
         reader = pypdf.PdfReader(f)
-        for page in reader.pages:
-            text += page.extract_text()
-    return text
+        span['pages'] = len(reader.pages)
+        return "".join(page.extract_text() for page in reader.pages)
 
-def extract_images_from_pdf(pdf_content, output_dir, max_images=5):
-    """Extracts images from PDF using PyMuPDF."""
+def extract_images_from_pdf(pdf_source, output_dir, max_images=5):
+    """Extracts images from PDF (path or bytes) using PyMuPDF."""
     images = []
+    with trace_span('pymupdf_extract', 'cpu') as span:
+        _extract_images(pdf_source, output_dir, max_images, images)
+        span['images'] = len(images)
+    return images
+
+def _extract_images(pdf_source, output_dir, max_images, images):
+    """Appends the paths of extracted figures to images."""
+    import fitz  # PyMuPDF
+    from PIL import Image
     try:
-        with io.BytesIO(pdf_content) as f:
-            doc = fitz.open(stream=f, filetype="pdf")
+        # PyMuPDF reads a path through its own file I/O; bytes are handed
+        # over directly rather than through another BytesIO copy.
+        if is_pdf_path(pdf_source):
+            doc = fitz.open(pdf_source, filetype="pdf")
+        else:
+            doc = fitz.open(stream=pdf_source, filetype="pdf")
+        with doc:
             img_count = 0
             for page_num in range(min(len(doc), 10)):
                 page = doc[page_num]
@@ -63,21 +390,19 @@ def extract_images_from_pdf(pdf_content, output_dir, max_images=5):
                     base_image = doc.extract_image(xref)
                     image_bytes = base_image["image"]
 
-                    img = Image.open(io.BytesIO(image_bytes))
-                    if img.width < 200 or img.height < 100:
-                        continue
+                    with Image.open(io.BytesIO(image_bytes)) as img:
+                        if img.width < 200 or img.height < 100:
+                            continue
 
-                    image_path = os.path.join(output_dir, f"figure_{img_count+1}.png")
-                    img.save(image_path)
+                        image_path = os.path.join(output_dir, f"figure_{img_count+1}.png")
+                        img.save(image_path)
                     images.append(image_path)
                     img_count += 1
 
                     if img_count >= max_images:
                         break
-            doc.close()
     except Exception as e:
         print(f"⚠️  Could not extract images: {e}")
-    return images
 
 def get_language_prompt(language='en'):
     """Returns language-specific prompt template."""
@@ -135,11 +460,10 @@ IMPORTANT: Use complete English sentences with proper punctuation. Do NOT includ
     }
     return prompts.get(language, prompts['en'])
 
-def summarize_with_ollama(text, model="llama3.2", language='en'):
-    """Summarizes text using local Ollama LLM in specified language."""
+def build_summary_prompt(text, language='en'):
+    """Builds the full-paper summarization prompt for a language."""
     prompt_template = get_language_prompt(language)
-
-    prompt = f"""{prompt_template['instruction']}
+    return f"""{prompt_template['instruction']}
 
 {prompt_template['format']}
 
@@ -147,14 +471,28 @@ Paper text:
 ---
 {text[:15000]}"""
 
+def run_ollama(prompt, model="llama3.2", response_format=None):
+    """Sends a prompt to the local Ollama CLI and returns the response text.
+
+    response_format="json" constrains the output to a JSON value.
+    """
+    # --verbose makes Ollama print token counts and rates to stderr
+    command = ["ollama", "run", model]
+    if response_format:
+        command += ["--format", response_format]
+    if _tracer is not None:
+        command.append("--verbose")
+
     try:
-        result = subprocess.run(
-            ["ollama", "run", model],
-            input=prompt,
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
+        with trace_span('ollama', 'llm', model=model, prompt_chars=len(prompt)) as span:
+            result = subprocess.run(
+                command,
+                input=prompt,
+                capture_output=True,
+                text=True,
+                timeout=120
+            )
+            span.update(parse_ollama_stats(result.stderr))
         if result.returncode == 0:
             return result.stdout.strip()
         else:
@@ -162,29 +500,198 @@ Paper text:
     except FileNotFoundError:
         raise Exception("Ollama not installed. Install: curl -fsSL https://ollama.com/install.sh | sh")
 
-def summarize_with_gemini(text, model="gemini-1.5-flash", language='en'):
-    """Summarizes text using Gemini API in specified language."""
-    if not GEMINI_API_KEY:
-        raise Exception("Gemini API key not set. Use --summarizer=ollama (free, local)")
-
+def parse_ollama_stats(stderr):
+    """Extracts token counts and generation rate from `ollama run --verbose` output."""
+    stats = {}
+    patterns = {
+        'prompt_tokens': r'^prompt eval count:\s+(\d+)',
+        'response_tokens': r'^eval count:\s+(\d+)',
+        'tokens_per_s': r'^eval rate:\s+([\d.]+)',
+    }
+    for key, pattern in patterns.items():
+        match = re.search(pattern, stderr or "", flags=re.MULTILINE)
+        if match:
+            stats[key] = float(match.group(1)) if key == 'tokens_per_s' else int(match.group(1))
+    return stats
+
+GEMINI_MODEL = "gemini-1.5-flash"
+GEMINI_TIMEOUT = (10, 120)  # (connect, read) seconds per request
+# Requests one client keeps in flight; more callers wait for a slot
+GEMINI_MAX_IN_FLIGHT = 4
+# Quota (429) and transient server errors are retried with jittered exponential backoff
+GEMINI_RETRY_STATUSES = {429, 500, 502, 503, 504}
+GEMINI_MAX_ATTEMPTS = 5
+GEMINI_BACKOFF = (1.0, 30.0)  # (first delay, cap) seconds
+
+
+class GeminiError(Exception):
+    """Raised when a Gemini request fails for good (after retries, or with a non-retryable error)."""
+
+
+class GeminiClient:
+    """Long-lived Gemini REST client shared by every summarization and translation.
+
+    Reuses pooled connections, keeps at most max_in_flight requests open
+    at once (extra callers block until a slot frees), retries quota and
+    transient errors with backoff, and bounds every request with a timeout.
+    generate() blocks; submit() and map() run requests on the client's own
+    threads, and agenerate() awaits one from asyncio code.
+    """
+
+    def __init__(self, api_key, model=GEMINI_MODEL, base_url=None, max_in_flight=GEMINI_MAX_IN_FLIGHT,
+                 timeout=GEMINI_TIMEOUT, max_attempts=GEMINI_MAX_ATTEMPTS, backoff=GEMINI_BACKOFF):
+        import requests
+        self.api_key = api_key
+        self.model = model
+        self.url = f"{(base_url or GEMINI_API_URL).rstrip('/')}/v1beta/models/{model}:generateContent"
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max_in_flight)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_in_flight,
+                                                               thread_name_prefix='gemini')
+
+    def generate(self, prompt, response_schema=None):
+        """Sends one prompt and returns the response text.
+
+        With response_schema (a JSON schema) the response is JSON matching it.
+        """
+        import random
+        import requests
+        body = {'contents': [{'role': 'user', 'parts': [{'text': prompt}]}]}
+        if response_schema is not None:
+            body['generationConfig'] = {'responseMimeType': 'application/json',
+                                        'responseSchema': _gemini_schema(response_schema)}
+        with trace_span('gemini', 'llm', model=self.model, prompt_chars=len(prompt)) as span:
+            for attempt in range(1, self.max_attempts + 1):
+                retry_after = None
+                with self._slots:
+                    started = time.perf_counter()
+                    try:
+                        response = self._session.post(self.url, json=body, timeout=self.timeout,
+                                                      headers={'x-goog-api-key': self.api_key})
+                    except (requests.ConnectionError, requests.Timeout) as e:
+                        error = f"{type(e).__name__}: {e}"
+                    else:
+                        if response.status_code == 200:
+                            elapsed = time.perf_counter() - started
+                            span['attempts'] = attempt
+                            return self._response_text(response.json(), span, elapsed)
+                        error = f"HTTP {response.status_code}: {response.text[:200]}"
+                        if response.status_code not in GEMINI_RETRY_STATUSES:
+                            raise GeminiError(f"Gemini request failed ({error})")
+                        retry_after = _gemini_retry_delay(response)
+
+                if attempt == self.max_attempts:
+                    break
+                first, cap = self.backoff
+                if retry_after is not None:
+                    # Honoured up to the backoff cap, so a bad header cannot stall the caller
+                    delay = min(cap, max(0.0, retry_after))
+                else:
+                    delay = random.uniform(0, min(cap, first * 2 ** (attempt - 1)))
+                print(f"   ⏳ Gemini {error.split(':')[0]}, retrying in {delay:.1f}s ({attempt}/{self.max_attempts})")
+                time.sleep(delay)
+            span['attempts'] = self.max_attempts
+        raise GeminiError(f"Gemini request failed after {self.max_attempts} attempts ({error})")
+
+    @staticmethod
+    def _response_text(payload, span, elapsed):
+        usage = payload.get('usageMetadata') or {}
+        if 'promptTokenCount' in usage:
+            span['prompt_tokens'] = usage['promptTokenCount']
+        if 'candidatesTokenCount' in usage:
+            span['response_tokens'] = usage['candidatesTokenCount']
+            if elapsed > 0:
+                span['tokens_per_s'] = round(usage['candidatesTokenCount'] / elapsed, 1)
+        candidates = payload.get('candidates') or []
+        parts = (candidates[0].get('content') or {}).get('parts', []) if candidates else []
+        text = ''.join(part.get('text', '') for part in parts)
+        if not text:
+            reason = (payload.get('promptFeedback') or {}).get('blockReason') or \
+                (candidates[0].get('finishReason') if candidates else "no candidates")
+            raise GeminiError(f"Gemini returned no text ({reason})")
+        return text
+
+    def submit(self, prompt, response_schema=None):
+        """Starts a request in the background; returns a Future of the response text."""
+        return self._executor.submit(self.generate, prompt, response_schema)
+
+    def map(self, prompts):
+        """Runs many prompts concurrently (at most max_in_flight at a time); returns their texts in order."""
+        return [future.result() for future in [self.submit(prompt) for prompt in prompts]]
+
+    async def agenerate(self, prompt):
+        """Awaitable generate() for asyncio callers."""
+        import asyncio
+        return await asyncio.wrap_future(self.submit(prompt))
+
+    def close(self):
+        """Stops the worker threads and closes pooled connections."""
+        self._executor.shutdown(wait=True)
+        self._session.close()
+
+
+def _gemini_schema(schema):
+    """Converts a JSON schema to Gemini's OpenAPI subset (upper-case types, ordered properties)."""
+    converted = {key: value for key, value in schema.items() if key not in ('type', 'properties', 'items')}
+    converted['type'] = schema['type'].upper()
+    if 'properties' in schema:
+        converted['properties'] = {name: _gemini_schema(prop) for name, prop in schema['properties'].items()}
+        converted['propertyOrdering'] = list(schema['properties'])
+    if 'items' in schema:
+        converted['items'] = _gemini_schema(schema['items'])
+    return converted
+
+def _gemini_retry_delay(response):
+    """Returns the server-requested retry delay in seconds (Retry-After or RetryInfo), if any."""
+    header = response.headers.get('Retry-After')
+    if header:
+        try:
+            return float(header)
+        except ValueError:
+            pass
     try:
-        import google.generativeai as genai
-        genai.configure(api_key=GEMINI_API_KEY)
-    except ImportError:
-        raise Exception("google-generativeai not installed. Use --summarizer=ollama")
+        details = response.json().get('error', {}).get('details', [])
+    except ValueError:
+        return None
+    for detail in details:
+        delay = detail.get('retryDelay') if isinstance(detail, dict) else None
+        if delay and delay.endswith('s'):
+            try:
+                return float(delay[:-1])
+            except ValueError:
+                pass
+    return None
 
-    prompt_template = get_language_prompt(language)
-    prompt = f"""{prompt_template['instruction']}
+_gemini_clients = {}
+_gemini_clients_lock = threading.Lock()
 
-{prompt_template['format']}
+def get_gemini_client(model=GEMINI_MODEL):
+    """Returns the process-wide Gemini client for a model, creating it on first use."""
+    if not GEMINI_API_KEY:
+        raise Exception("Gemini API key not set. Use --summarizer=ollama (free, local)")
+    key = (GEMINI_API_KEY, GEMINI_API_URL, model)
+    with _gemini_clients_lock:
+        if key not in _gemini_clients:
+            _gemini_clients[key] = GeminiClient(GEMINI_API_KEY, model=model)
+        return _gemini_clients[key]
 
-Paper text:
----
-{text[:15000]}"""
+def run_gemini(prompt, model=GEMINI_MODEL, response_schema=None):
+    """Sends a prompt to the Gemini API and returns the response text."""
+    return get_gemini_client(model).generate(prompt, response_schema=response_schema)
 
-    gemini_model = genai.GenerativeModel(model)
-    response = gemini_model.generate_content(prompt)
-    return response.text
+def summarize_with_ollama(text, model="llama3.2", language='en'):
+    """Summarizes text using local Ollama LLM in specified language."""
+    return run_ollama(build_summary_prompt(text, language), model=model)
+
+def summarize_with_gemini(text, model=GEMINI_MODEL, language='en'):
+    """Summarizes text using Gemini API in specified language."""
+    return run_gemini(build_summary_prompt(text, language), model=model)
 
 def summarize_text(text, method="ollama", language='en'):
     """Summarizes text using specified method and language."""
@@ -204,109 +711,735 @@ def summarize_text(text, method="ollama", language='en'):
     else:
         raise ValueError(f"Unknown summarizer: {method}")
 
-def clean_gemini_response(text):
-    """Cleans AI response by removing preamble."""
-    lines = text.split('\n')
-    cleaned_lines = []
-    started = False
-
-    for line in lines:
-        line_lower = line.lower().strip()
-        if not started:
-            # English and Korean preamble patterns
-            skip_patterns = [
-                'of course', 'here is', 'here\'s', 'i\'ll provide',
-                'let me', 'i can', 'certainly', 'sure', 'formatted into',
-                '물론', '여기', '다음은', '제공', '요약'
-            ]
-            if any(pattern in line_lower for pattern in skip_patterns) and len(line_lower) < 100:
-                continue
-            started = True
-        cleaned_lines.append(line)
+LANGUAGE_NAMES = {
+    'en': 'English',
+    'ko': 'Korean (한국어)',
+    'ja': 'Japanese (日本語)',
+    'zh': 'Simplified Chinese (简体中文)',
+}
 
-    return '\n'.join(cleaned_lines).strip()
+def parse_languages(value):
+    """Splits a comma-separated language list ("en,ko") into unique codes, keeping order."""
+    languages = []
+    for code in str(value).split(','):
+        code = code.strip()
+        if code and code not in languages:
+            languages.append(code)
+    return languages
+
+def parse_renditions(value):
+    """Splits a comma-separated rendition list ("720p,vertical") into known rendition names."""
+    renditions = parse_languages(value)
+    unknown = [name for name in renditions if name not in RENDITIONS]
+    if unknown or not renditions:
+        raise ValueError(f"Unknown rendition {', '.join(unknown) or repr(value)} "
+                         f"(choose from {', '.join(RENDITIONS)})")
+    return renditions
+
+def rendition_size(rendition, draft=False):
+    """Returns a rendition's (width, height), scaled down by DRAFT_SCALE for drafts (kept even for x264)."""
+    width, height = RENDITIONS[rendition]
+    if draft:
+        width, height = (int(width * DRAFT_SCALE) // 2 * 2, int(height * DRAFT_SCALE) // 2 * 2)
+    return width, height
+
+def sections_to_markdown(sections):
+    """Serialises parsed sections back into the `## Header` summary format."""
+    return "\n\n".join(f"## {section['title']}\n{section['content']}".rstrip() for section in sections)
+
+def translate_summary(sections, language, method="ollama"):
+    """Localizes an already-parsed summary into another language.
+
+    Translating the short summary is far cheaper than re-summarizing the
+    full paper text, and keeps every language's video structurally aligned.
+    """
+    if method == "manual":
+        manual_path = f"summary_{language}.txt"
+        if not os.path.exists(manual_path):
+            raise Exception(f"Manual mode needs {manual_path} for language '{language}'")
+        with open(manual_path, "r", encoding='utf-8') as f:
+            return f.read()
+
+    prompt = f"""Translate the following video summary of an academic paper into {LANGUAGE_NAMES.get(language, language)}.
+Keep exactly the same "## " markdown headers structure: the same number of sections, in the same order, with each header translated.
+Use complete, natural sentences with proper punctuation. Do NOT include preamble. Start with the first "## " header.
+
+{sections_to_markdown(sections)}"""
+    if method == "ollama":
+        print(f"   Translating with Ollama (language: {language})...")
+        return run_ollama(prompt)
+    elif method == "gemini":
+        print(f"   Translating with Gemini API (language: {language})...")
+        return run_gemini(prompt)
+    raise ValueError(f"Unknown summarizer: {method}")
+
+# Structured summaries (--summary-format json): the model answers with one
+# JSON object holding a field per section, constrained by Ollama's JSON mode
+# or Gemini's response schema. Each field is validated on its own, and only
+# the missing or malformed ones are asked for again, by a short follow-up
+# prompt over the matching part of the paper instead of a full re-summary.
+SUMMARY_FORMATS = ['markdown', 'json']
+SUMMARY_FIELDS = ['title', 'abstract', 'introduction', 'methods', 'results', 'conclusion']
+SUMMARY_HEADERS = {
+    'en': ['Title', 'Abstract', 'Introduction', 'Methods', 'Results', 'Conclusion'],
+    'ko': ['제목', '초록', '서론', '방법론', '결과', '결론'],
+    'ja': ['タイトル', '概要', '序論', '手法', '結果', '結論'],
+    'zh': ['标题', '摘要', '引言', '方法', '结果', '结论'],
+}
+SUMMARY_HEADER_FIELDS = {
+    header.lower(): field
+    for headers in SUMMARY_HEADERS.values() for header, field in zip(headers, SUMMARY_FIELDS)
+}
+SUMMARY_HEADER_FIELDS.update({'method': 'methods', 'methodology': 'methods', 'conclusions': 'conclusion'})
+# (min, max) sentences asked for per field; fewer than min - 1 is malformed
+SUMMARY_FIELD_SENTENCES = {
+    'abstract': (2, 3),
+    'introduction': (3, 4),
+    'methods': (4, 5),
+    'results': (3, 4),
+    'conclusion': (2, 3),
+}
+# Paper headings a regenerated field's excerpt starts from
+SUMMARY_FIELD_KEYWORDS = {
+    'title': [],
+    'abstract': ['abstract'],
+    'introduction': ['introduction', 'background', 'motivation'],
+    'methods': ['method', 'approach', 'model', 'architecture'],
+    'results': ['result', 'experiment', 'evaluation'],
+    'conclusion': ['conclusion', 'discussion', 'summary'],
+}
+SUMMARY_EXCERPT_CHARS = 6000  # paper text sent with a follow-up prompt
+SUMMARY_REPAIR_ATTEMPTS = 2
+SUMMARY_TITLE_MAX_CHARS = 300
+MARKDOWN_HEADER_LINE = re.compile(r'^[ \t]*#{1,6}[ \t]', re.MULTILINE)
+
+def summary_schema(fields=SUMMARY_FIELDS):
+    """Returns the JSON schema of a structured summary holding the given fields."""
+    return {
+        'type': 'object',
+        'properties': {field: {'type': 'string'} for field in fields},
+        'required': list(fields),
+    }
 
-def parse_markdown_to_sections(text):
-    """Parses markdown into sections (supports multilingual headers)."""
-    sections = []
-    current_title = None
-    current_content = []
+def _summary_field_list(fields):
+    lines = []
+    for field in fields:
+        if field == 'title':
+            lines.append('- "title": the paper title, one line')
+        else:
+            low, high = SUMMARY_FIELD_SENTENCES[field]
+            lines.append(f'- "{field}": {low}-{high} complete sentences')
+    return "\n".join(lines)
 
-    for line in text.split('\n'):
-        if line.strip().startswith('##'):
-            if current_title:
-                sections.append({
-                    'title': current_title,
-                    'content': '\n'.join(current_content).strip()
-                })
-            current_title = line.replace('##', '').strip()
-            current_content = []
-        elif line.strip().startswith('**') and line.strip().endswith('**'):
-            if current_title:
-                sections.append({
-                    'title': current_title,
-                    'content': '\n'.join(current_content).strip()
-                })
-            current_title = line.replace('**', '').strip()
-            current_content = []
+def build_structured_summary_prompt(text, language='en'):
+    """Builds the full-paper summarization prompt asking for a JSON object."""
+    language_name = LANGUAGE_NAMES.get(language, language)
+    return f"""Summarize the following academic paper into key sections for a short video presentation in {language_name}.
+Answer with only a JSON object with these string fields, written in {language_name} as plain sentences without markdown:
+{_summary_field_list(SUMMARY_FIELDS)}
+
+Paper text:
+---
+{text[:15000]}"""
+
+def summary_excerpt(text, fields, limit=SUMMARY_EXCERPT_CHARS):
+    """Returns the parts of the paper text that the given summary fields draw on.
+
+    Each field gets an equal share of limit, starting at the first heading
+    that names it (e.g. "4. Experiments" for results); fields without one
+    start at the top of the paper. Overlapping parts are merged.
+    """
+    share = max(500, limit // len(fields))
+    windows = []
+    for field in fields:
+        start = 0
+        keywords = SUMMARY_FIELD_KEYWORDS[field]
+        if keywords:
+            heading = re.search(rf'^[ \t]*(?:[\dIVX]+\.?[ \t]*)?(?:{"|".join(keywords)})[^\n]{{0,60}}$', text,
+                                flags=re.IGNORECASE | re.MULTILINE)
+            if heading:
+                start = heading.start()
+        windows.append([start, min(len(text), start + share)])
+    windows.sort()
+    merged = [windows[0]]
+    for start, end in windows[1:]:
+        if start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return "\n[...]\n".join(text[start:end].strip() for start, end in merged)
+
+def build_summary_repair_prompt(text, summary, fields, language='en'):
+    """Builds a short follow-up prompt asking only for the given summary fields."""
+    language_name = LANGUAGE_NAMES.get(language, language)
+    written = {field: summary[field] for field in SUMMARY_FIELDS
+               if field not in fields and isinstance(summary.get(field), str)}
+    return f"""These sections of a short video summary of an academic paper are already written in {language_name}:
+{json.dumps(written, ensure_ascii=False, indent=1)}
+
+Write the remaining sections from the paper text below.
+Answer with only a JSON object with these string fields, written in {language_name} as plain sentences without markdown:
+{_summary_field_list(fields)}
+
+Paper text (excerpts):
+---
+{summary_excerpt(text, fields)}"""
+
+def parse_structured_summary(text, language=None):
+    """Reads a structured summary response into {field: value}.
+
+    Takes the outermost JSON object in the text (so code fences and a
+    preamble are tolerated). If the model answered in the markdown format
+    instead, its sections are matched to fields by their headers in any
+    supported language.
+    """
+    start, end = text.find('{'), text.rfind('}')
+    if start != -1 and end > start:
+        try:
+            data = json.loads(text[start:end + 1])
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            return {str(key).strip().lower(): value for key, value in data.items()}
+    summary = {}
+    for section in parse_summary(text, language):
+        field = SUMMARY_HEADER_FIELDS.get(section['title'].strip().lower())
+        if field and field not in summary:
+            summary[field] = section['content']
+    return summary
+
+def usable_summary_value(value):
+    """True when a summary field can go into the video: non-empty text without markdown headers."""
+    return isinstance(value, str) and bool(value.strip()) and not MARKDOWN_HEADER_LINE.search(value)
+
+def validate_summary(summary, language='en'):
+    """Checks each field of a structured summary; returns {field: problem} for the bad ones.
+
+    Values failing usable_summary_value are unusable; the other problems
+    (a long title, too few sentences) are worth one more try but not fatal.
+    """
+    problems = {}
+    for field in SUMMARY_FIELDS:
+        value = summary.get(field)
+        if value is None:
+            problems[field] = "missing"
+        elif not isinstance(value, str):
+            problems[field] = f"not text ({type(value).__name__})"
+        elif not value.strip():
+            problems[field] = "empty"
+        elif field == 'title':
+            if '\n' in value.strip() or len(value) > SUMMARY_TITLE_MAX_CHARS:
+                problems[field] = "not a single short line"
+        elif MARKDOWN_HEADER_LINE.search(value):
+            problems[field] = "contains markdown headers"
         else:
-            if line.strip():
-                current_content.append(line)
+            low, _ = SUMMARY_FIELD_SENTENCES[field]
+            count = len(split_sentences(clean_text_for_speech(value, language)))
+            if count < max(1, low - 1):
+                problems[field] = f"{count} sentence(s), expected {low}+"
+    return problems
+
+def run_structured(prompt, fields, method="ollama"):
+    """Sends a prompt whose answer must be a JSON object with the given string fields."""
+    if method == "ollama":
+        return run_ollama(prompt, response_format="json")
+    elif method == "gemini":
+        return run_gemini(prompt, response_schema=summary_schema(fields))
+    raise ValueError(f"Unknown summarizer: {method}")
+
+def summarize_structured(text, method="ollama", language='en'):
+    """Summarizes text into validated {field: text}, regenerating only the bad fields.
+
+    Returns (summary, problems). A repair only replaces a field's value
+    with a usable one (see usable_summary_value). After
+    SUMMARY_REPAIR_ATTEMPTS follow-up prompts, fields that are still
+    unusable are listed in problems and left out of summary; fields with
+    only soft problems (too few sentences, a long title) are kept with a
+    warning. Manual summaries (summary.txt, JSON or markdown) are validated
+    but cannot be regenerated.
+    """
+    if method == "manual":
+        raw = summarize_text(text, method=method, language=language)
+    else:
+        print(f"   Using {method} with structured output (language: {language})...")
+        raw = run_structured(build_structured_summary_prompt(text, language), SUMMARY_FIELDS, method)
+    summary = parse_structured_summary(raw, language)
+    problems = validate_summary(summary, language)
+    for attempt in range(1, SUMMARY_REPAIR_ATTEMPTS + 1):
+        if not problems or method == "manual":
+            break
+        fields = [field for field in SUMMARY_FIELDS if field in problems]
+        print(f"   🩹 Regenerating {', '.join(f'{field} ({problems[field]})' for field in fields)} "
+              f"({attempt}/{SUMMARY_REPAIR_ATTEMPTS})...")
+        with trace_span('summary_repair', 'llm', fields=fields, attempt=attempt):
+            raw = run_structured(build_summary_repair_prompt(text, summary, fields, language), fields, method)
+        repaired = parse_structured_summary(raw, language)
+        for field in fields:
+            if usable_summary_value(repaired.get(field)) or not usable_summary_value(summary.get(field)):
+                summary[field] = repaired.get(field, summary.get(field))
+        problems = validate_summary(summary, language)
+    kept = {field: summary[field].strip() for field in SUMMARY_FIELDS if usable_summary_value(summary.get(field))}
+    for field in kept:
+        if field in problems:
+            print(f"   ⚠️  Keeping {field} despite: {problems.pop(field)}")
+    return kept, problems
+
+def structured_summary_markdown(summary, language='en'):
+    """Renders a structured summary in the `## Header` format, with the language's section headers."""
+    headers = dict(zip(SUMMARY_FIELDS, SUMMARY_HEADERS.get(language, SUMMARY_HEADERS['en'])))
+    return sections_to_markdown([{'title': headers[field], 'content': summary[field]}
+                                 for field in SUMMARY_FIELDS if field in summary])
+
+# Summary markdown is normalized by one tokenizer pass over its lines.
+# Each line is classified with cheap string checks (header, list item,
+# text, blank), its inline markup is removed by one precompiled pattern
+# (only on lines that contain markup characters), and the section
+# structure, speech text and slide text are all built from those tokens.
+PREAMBLE_PATTERNS = {
+    'en': ['of course', 'here is', 'here\'s', 'i\'ll provide', 'let me', 'i can', 'certainly', 'sure',
+           'formatted into'],
+    'ko': ['물론', '여기', '다음은', '제공', '요약'],
+    'ja': ['もちろん', '以下は', 'こちらは', '要約'],
+    'zh': ['当然', '以下是', '这是', '摘要'],
+}
+# Bump when a normalization rule changes so cached speech and slides are rebuilt
+TEXT_RULES_VERSION = 4
+CJK_CHARS = '\u3000-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uff00-\uffef'
+LIST_MARKER = re.compile(r'(?:[-*+]|\d+\.)[ \t]+')
+INLINE_MARKUP = re.compile(
+    r'\*\*([^*\n]+)\*\*|\*([^*\n]+)\*|__([^_\n]+)__|(?<![^\W_])_([^_\n]+)_(?![^\W_])|(#{1,6}[ \t]+)')
+MULTIPLE_SPACES = re.compile(r' {2,}')
+MULTIPLE_DOTS = re.compile(r'\.{2,}')
+
+def _strip_markup(match):
+    return match.group(match.lastindex) if match.lastindex < 5 else ''
+
+# Inserted where a paragraph ends without punctuation
+PARAGRAPH_BREAK = {'ja': '。', 'zh': '。'}
+SENTENCE_END_CHARS = '.!?。！？'
+# A line break between these characters starts a new sentence...
+WRAP_BEFORE = re.compile(r'[a-z가-힣]')
+WRAP_AFTER = re.compile(r'[A-Z가-힣]')
+# ...and between two CJK characters it is just a line wrap
+CJK_CHAR = re.compile(f'[{CJK_CHARS}]')
+
+PREAMBLES = {language: re.compile('|'.join(re.escape(pattern) for pattern in
+                                           PREAMBLE_PATTERNS['en'] + PREAMBLE_PATTERNS[language]))
+             for language in PREAMBLE_PATTERNS}
+# Without a language, preamble in any supported language is recognised
+ANY_PREAMBLE = re.compile('|'.join(re.escape(pattern) for patterns in PREAMBLE_PATTERNS.values()
+                                   for pattern in patterns))
+
+def _preamble(language):
+    return PREAMBLES.get(language, ANY_PREAMBLE)
+
+def tokenize_markdown(text):
+    """Splits markdown into (kind, text) line tokens with inline markup removed.
+
+    kind is 'header' (`## Title` or a whole-line `**Title**`), 'item' (a
+    bullet or numbered line, marker kept in the raw text), 'text' or 'blank'.
+    """
+    tokens = []
+    for line in text.split('\n'):
+        stripped = line.strip()
+        if not stripped:
+            tokens.append(('blank', ''))
+            continue
+        first = stripped[0]
+        if first == '#' and stripped.startswith('##'):
+            tokens.append(('header', stripped.replace('##', '').strip()))
+            continue
+        if first == '*' and stripped.startswith('**') and stripped.endswith('**'):
+            tokens.append(('header', stripped.replace('**', '').strip()))
+            continue
+        kind = 'item' if first in '-*+0123456789' and LIST_MARKER.match(stripped) else 'text'
+        tokens.append((kind, stripped))
+    return tokens
+
+def _plain(line):
+    """Removes inline markup, list markers and repeated spaces/dots from one stripped line."""
+    marker = LIST_MARKER.match(line) if line[0] in '-*+0123456789' else None
+    if marker:
+        line = line[marker.end():]
+    if '*' in line or '_' in line or '#' in line:
+        line = INLINE_MARKUP.sub(_strip_markup, line)
+    if '  ' in line:
+        line = MULTIPLE_SPACES.sub(' ', line)
+    if '..' in line:
+        line = MULTIPLE_DOTS.sub('.', line)
+    return line.strip()
+
+def _speech_from_tokens(tokens, language):
+    """Joins (kind, plain text) line tokens into one speech string."""
+    sentence_break = PARAGRAPH_BREAK.get(language, '. ')
+    parts = []
+    previous = ''
+    paragraph = False
+    for kind, line in tokens:
+        if kind == 'blank':
+            paragraph = True
+            continue
+        if not line:
+            continue
+        if previous:
+            if paragraph:
+                if previous[-1] in SENTENCE_END_CHARS:
+                    separator = '' if previous[-1] in '。！？' or sentence_break == '。' else ' '
+                else:
+                    separator = sentence_break
+            elif WRAP_BEFORE.match(previous[-1]) and WRAP_AFTER.match(line[0]):
+                separator = '. '
+            elif CJK_CHAR.match(previous[-1]) and CJK_CHAR.match(line[0]):
+                separator = ''
+            else:
+                separator = ' '
+            if separator.startswith('.') and previous[-1] == '.':
+                separator = separator[1:]
+            parts.append(separator)
+        parts.append(line)
+        previous = line
+        paragraph = False
+    return ''.join(parts)
+
+def _slide_lines(tokens):
+    """Builds slide lines from (kind, stripped line, plain text) tokens; bullets become •."""
+    lines = []
+    for kind, line, text in tokens:
+        if not text:
+            continue
+        if kind == 'item':
+            marker = LIST_MARKER.match(line).group().strip()
+            text = ('•' if marker in '-*+' else marker) + ' ' + text
+        lines.append(text)
+    return lines
+
+def _title_speech(title, language):
+    return _plain(title) + ('。' if language in ('ja', 'zh') else '.')
+
+def _is_preamble(line, kind, preamble):
+    """Whether a line is the model's preamble; headers never are (the zh Abstract header 摘要 is also a preamble word)."""
+    stripped = line.strip()
+    return kind != 'header' and len(stripped) < 100 and bool(preamble.search(stripped.lower()))
+
+def _parse_tokens(text, language, skip_preamble):
+    """Single pass shared by parse_summary and normalize_summary: sections with their raw lines and tokens."""
+    lines = text.split('\n')
+    tokens = tokenize_markdown(text)
+    start = 0
+    if skip_preamble:
+        preamble = _preamble(language)
+        while start < len(lines) and _is_preamble(lines[start], tokens[start][0], preamble):
+            start += 1
+
+    sections = []
+    current = None
+    for raw_line, (kind, line) in zip(lines[start:], tokens[start:]):
+        if kind == 'header':
+            current = {'title': line, 'lines': [], 'tokens': []}
+            if line:
+                sections.append(current)  # an empty header drops its content, as the original parser did
+        elif current is not None:
+            if kind != 'blank':
+                current['lines'].append(raw_line)
+            if kind != 'blank' or current['lines']:
+                current['tokens'].append((kind, line))
+    return sections
+
+def parse_summary(text, language=None, skip_preamble=True):
+    """Parses summary markdown into sections with a single tokenizer pass.
 
-    if current_title:
+    Drops the model's preamble, takes `## Header` and whole-line `**Header**`
+    lines as section titles and keeps the other non-blank lines as content.
+    Text before the first title is ignored.
+    """
+    return [{'title': section['title'], 'content': '\n'.join(section['lines']).strip()}
+            for section in _parse_tokens(text, language, skip_preamble)]
+
+def normalize_summary(text, language="en"):
+    """Parses a summary once into sections carrying their speech and slide text as well.
+
+    Each section has 'title', 'content' (as parse_summary), 'speech' (as
+    section_speech_text) and 'slide_lines' (as slide_paragraphs).
+    """
+    sections = []
+    for section in _parse_tokens(text, language, skip_preamble=True):
+        tokens = [(kind, line, _plain(line) if kind != 'blank' else '') for kind, line in section['tokens']]
+        speech_tokens = [('text', _title_speech(section['title'], language))]
+        speech_tokens += [(kind, plain) for kind, _, plain in tokens]
         sections.append({
-            'title': current_title,
-            'content': '\n'.join(current_content).strip()
+            'title': section['title'],
+            'content': '\n'.join(section['lines']).strip(),
+            'speech': _speech_from_tokens(speech_tokens, language),
+            'slide_lines': _slide_lines(tokens),
         })
-
     return sections
 
-def clean_text_for_speech(text):
-    """Cleans text for TTS (multilingual)."""
-    text = re.sub(r'#{1,6}\s+', '', text)
-    text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)
-    text = re.sub(r'\*([^*]+)\*', r'\1', text)
-    text = re.sub(r'__([^_]+)__', r'\1', text)
-    text = re.sub(r'_([^_]+)_', r'\1', text)
-    text = re.sub(r'^\s*[-*+]\s+', '', text, flags=re.MULTILINE)
-    text = re.sub(r'^\s*\d+\.\s+', '', text, flags=re.MULTILINE)
-    text = re.sub(r'([a-z가-힣])\n([A-Z가-힣])', r'\1. \2', text)
-    text = re.sub(r' +', ' ', text)
-    text = re.sub(r'\n\s*\n', '. ', text)
-    text = re.sub(r'\n', ' ', text)
-    text = re.sub(r'\.\.+', '.', text)
-    return text.strip()
-
-def text_to_speech_coqui(text, output_path, speaker_wav=None, language="en"):
-    """Generate speech using Coqui TTS with language support."""
-    try:
-        from TTS.api import TTS
-
-        # Map language codes for Coqui
-        coqui_lang_map = {
-            'en': 'en',
-            'ko': 'ko',
-            'ja': 'ja',
-            'zh': 'zh-cn'
-        }
-        coqui_lang = coqui_lang_map.get(language, 'en')
+def clean_gemini_response(text, language=None):
+    """Cleans AI response by removing preamble."""
+    preamble = _preamble(language)
+    lines = text.split('\n')
+    for idx, (line, (kind, _)) in enumerate(zip(lines, tokenize_markdown(text))):
+        if not _is_preamble(line, kind, preamble):
+            return '\n'.join(lines[idx:]).strip()
+    return ''
 
-        tts = TTS("tts_models/multilingual/multi-dataset/xtts_v2", gpu=False)
+def parse_markdown_to_sections(text):
+    """Parses markdown into sections (supports multilingual headers)."""
+    return parse_summary(text, skip_preamble=False)
 
-        if speaker_wav and os.path.exists(speaker_wav):
-            print(f"      Cloning voice from: {speaker_wav}")
-            tts.tts_to_file(
-                text=text,
-                file_path=output_path,
-                speaker_wav=speaker_wav,
-                language=coqui_lang
-            )
+def clean_text_for_speech(text, language="en"):
+    """Cleans text for TTS (multilingual)."""
+    tokens = [(kind, _plain(line) if kind != 'blank' else '') for kind, line in tokenize_markdown(text)]
+    return _speech_from_tokens(tokens, language)
+
+def slide_paragraphs(content, language="en"):
+    """Returns a section's content as slide lines: inline markup removed, bullets shown as •."""
+    return _slide_lines([(kind, line, _plain(line) if kind != 'blank' else '')
+                         for kind, line in tokenize_markdown(content)])
+
+# Longest piece of text handed to a TTS engine in one call. These are XTTS's
+# per-language limits (longer input degrades or errors); the other engines
+# use them too, which keeps request latency short and even.
+TTS_CHUNK_CHARS = {
+    'en': 250,
+    'ko': 95,
+    'ja': 71,
+    'zh': 82,
+}
+# Chunks of one section synthesized at once (Coqui: one at a time, see coqui_inference_lock)
+TTS_CHUNK_WORKERS = 4
+# Silence inserted between chunks when a section is stitched together
+SENTENCE_PAUSE_MS = 250
+SENTENCE_END = re.compile(r'(?<=[.!?…])\s+|(?<=[。！？．])\s*')
+CLAUSE_END = re.compile(r'(?<=[,;:])\s+|(?<=[、，；：])\s*')
+# Periods that end a known abbreviation or a dotted initialism ("U.S.", "J.R.R.")
+# rather than a sentence; a lone capital ("vitamin C.") still ends one
+ABBREVIATION_END = re.compile(r'(?:\b(?:e\.g|i\.e|et al|etc|vs|cf|approx|Fig|Figs|Eq|Eqs|Sec|Ref|Tab|No|Dr|Mr|Mrs|Ms|Prof)|\b(?:[A-Za-z]\.)+[A-Za-z])\.$')
+
+def split_sentences(text):
+    """Splits cleaned speech text into sentences at Latin and CJK sentence punctuation."""
+    sentences = []
+    for piece in SENTENCE_END.split(text):
+        piece = piece.strip()
+        if not piece:
+            continue
+        if sentences and ABBREVIATION_END.search(sentences[-1]):
+            sentences[-1] += ' ' + piece
         else:
-            tts.tts_to_file(
-                text=text,
-                file_path=output_path,
-                language=coqui_lang
-            )
+            sentences.append(piece)
+    return sentences
+
+def _pack(pieces, max_chars, separator):
+    """Greedily joins consecutive pieces while the result stays within max_chars."""
+    packed = []
+    for piece in pieces:
+        if packed and len(packed[-1]) + len(separator) + len(piece) <= max_chars:
+            packed[-1] += separator + piece
+        else:
+            packed.append(piece)
+    return packed
+
+def chunk_speech_text(text, language="en", max_chars=None):
+    """Splits speech text into chunks of whole sentences no longer than the engine limit.
+
+    Sentences longer than the limit are split at clause punctuation, then
+    at spaces, and as a last resort (unspaced CJK text) every max_chars.
+    """
+    max_chars = max_chars or TTS_CHUNK_CHARS.get(language, 250)
+    separator = '' if language in ('ja', 'zh') else ' '
+    pieces = []
+    for sentence in split_sentences(text):
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        clauses = [clause.strip() for clause in CLAUSE_END.split(sentence) if clause.strip()]
+        for clause in _pack(clauses, max_chars, separator):
+            if len(clause) > max_chars:
+                clause = _pack(clause.split(' '), max_chars, ' ')
+            for part in ([clause] if isinstance(clause, str) else clause):
+                pieces.extend(part[start:start + max_chars] for start in range(0, len(part), max_chars))
+    return _pack(pieces, max_chars, separator)
+
+COQUI_MODEL_NAME = "tts_models/multilingual/multi-dataset/xtts_v2"
+# CPU inference precision for Coqui: 'int8' applies dynamic quantization to
+# the linear layers. Process-wide, like the torch thread pool it runs on.
+COQUI_PRECISIONS = ['fp32', 'int8']
+COQUI_LANGUAGES = {
+    'en': 'en',
+    'ko': 'ko',
+    'ja': 'ja',
+    'zh': 'zh-cn'
+}
+_coqui_options = {'precision': 'fp32', 'threads': None, 'batch': False}
+_coqui_models = {}
+_coqui_lock = threading.Lock()
+_coqui_conditioning = {}
+_coqui_conditioning_lock = threading.Lock()
+# One synthesis pass per model at a time: a call abandoned by a gTTS hedge
+# keeps running, and the next call must not share the model with it.
+_coqui_inference_locks = {}
+
+def set_coqui_options(precision='fp32', threads=None, batch=False):
+    """Selects Coqui's CPU inference precision, torch thread count and whether sections are batched for this process."""
+    if precision not in COQUI_PRECISIONS:
+        raise ValueError(f"Unknown Coqui precision {precision!r} (choose from {', '.join(COQUI_PRECISIONS)})")
+    _coqui_options.update(precision=precision, threads=threads, batch=bool(batch))
+
+def get_coqui_options():
+    """Returns the current Coqui precision and thread settings."""
+    return dict(_coqui_options)
+
+def get_coqui_model(model_name=COQUI_MODEL_NAME):
+    """Loads a Coqui TTS model once per process and precision and returns the shared instance."""
+    precision = _coqui_options['precision']
+    with _coqui_lock:
+        if (model_name, precision) not in _coqui_models:
+            import torch
+            from TTS.api import TTS
+            if _coqui_options['threads']:
+                torch.set_num_threads(_coqui_options['threads'])
+            tts = TTS(model_name, gpu=False)
+            if precision == 'int8':
+                quantize_coqui_model(tts)
+            _coqui_models[(model_name, precision)] = tts
+        return _coqui_models[(model_name, precision)]
+
+def coqui_inference_lock(tts):
+    """Returns the lock serializing synthesis on a loaded Coqui model."""
+    with _coqui_lock:
+        return _coqui_inference_locks.setdefault(id(tts), threading.Lock())
+
+def quantize_coqui_model(tts):
+    """Applies int8 dynamic quantization to a loaded Coqui model's linear layers, in place.
+
+    The XTTS GPT is a Hugging Face GPT-2, whose projections are Conv1D
+    modules rather than nn.Linear; they are swapped for equivalent Linear
+    layers first so the quantizer reaches the bulk of the weights.
+    """
+    import torch
+    model = tts.synthesizer.tts_model
+    _conv1d_to_linear(model)
+    model.eval()
+    torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+def _conv1d_to_linear(module):
+    """Recursively replaces Hugging Face Conv1D layers with equivalent nn.Linear layers."""
+    import torch
+    for child_name, child in module.named_children():
+        if type(child).__name__ == 'Conv1D' and hasattr(child, 'nf'):
+            # Conv1D computes x @ weight + bias with weight shaped (in, out)
+            linear = torch.nn.Linear(child.weight.shape[0], child.nf)
+            linear.weight.data = child.weight.data.t().contiguous()
+            linear.bias.data = child.bias.data
+            setattr(module, child_name, linear)
+        else:
+            _conv1d_to_linear(child)
+
+
+def get_coqui_conditioning(speaker_wav=None):
+    """Returns XTTS (gpt_cond_latent, speaker_embedding) for a voice sample, computed once per file.
+
+    Without a sample the model's first built-in speaker is used.
+    """
+    import torch
+    model = get_coqui_model().synthesizer.tts_model
+    if speaker_wav and os.path.exists(speaker_wav):
+        key = (id(model), os.path.abspath(speaker_wav), os.path.getmtime(speaker_wav))
+    else:
+        key = (id(model), None, None)
+    with _coqui_conditioning_lock:
+        if key not in _coqui_conditioning:
+            if key[1]:
+                with torch.inference_mode():
+                    _coqui_conditioning[key] = model.get_conditioning_latents(audio_path=[speaker_wav])
+            else:
+                speaker = next(iter(model.speaker_manager.speakers.values()))
+                _coqui_conditioning[key] = (speaker['gpt_cond_latent'], speaker['speaker_embedding'])
+        return _coqui_conditioning[key]
+
+def synthesize_sections_coqui(texts, output_paths, speaker_wav=None, language="en"):
+    """Synthesizes several sections with XTTS chunk by chunk; returns their durations in seconds.
+
+    Every chunk (see chunk_speech_text) of every section shares one set of
+    speaker conditioning latents and goes through the model one at a time:
+    XTTS keeps per-call state on the model, so calls on it must not overlap.
+    Chunks are reassembled per section with SENTENCE_PAUSE_MS of silence
+    between them, and durations are taken from the sample count.
+    """
+    import torch
+    import numpy as np
+    from pydub import AudioSegment
+
+    model = get_coqui_model().synthesizer.tts_model
+    gpt_cond_latent, speaker_embedding = get_coqui_conditioning(speaker_wav)
+    coqui_lang = COQUI_LANGUAGES.get(language, 'en')
+    sample_rate = model.config.audio.output_sample_rate
+    jobs = [(section_idx, chunk) for section_idx, text in enumerate(texts)
+            for chunk in chunk_speech_text(text, language)]
+
+    def infer(chunk):
+        with torch.inference_mode():
+            wav = model.inference(chunk, coqui_lang, gpt_cond_latent, speaker_embedding)['wav']
+        if hasattr(wav, 'cpu'):
+            wav = wav.cpu().numpy()
+        return np.asarray(wav, dtype=np.float32).reshape(-1)
+
+    with trace_span('tts_batch', 'tts', engine="coqui", chunks=len(jobs)) as span:
+        started = time.perf_counter()
+        # Single calls wait for the whole batch
+        with coqui_inference_lock(get_coqui_model()):
+            wavs = [infer(chunk) for _, chunk in jobs]
+        synth_seconds = time.perf_counter() - started
+
+        pause = np.zeros(int(sample_rate * SENTENCE_PAUSE_MS / 1000), dtype=np.float32)
+        durations = []
+        for section_idx, output_path in enumerate(output_paths):
+            parts = []
+            for (job_section, _), wav in zip(jobs, wavs):
+                if job_section == section_idx:
+                    parts.extend([wav, pause] if parts else [wav])
+            samples = np.concatenate(parts) if parts else pause
+            pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+            AudioSegment(pcm.tobytes(), frame_rate=sample_rate, sample_width=2, channels=1).export(
+                output_path, format="mp3")
+            durations.append(len(samples) / sample_rate)
+
+        audio_seconds = sum(durations)
+        span['audio_s'] = round(audio_seconds, 2)
+        span['rtf'] = round(synth_seconds / audio_seconds, 3) if audio_seconds else 0.0
+    print(f"   Coqui batch: {len(jobs)} chunks, {audio_seconds:.1f}s of audio in {synth_seconds:.1f}s "
+          f"({audio_seconds / synth_seconds if synth_seconds else 0:.2f}s of audio per second)")
+    return durations
+
+def text_to_speech_coqui(text, output_path, speaker_wav=None, language="en", cancel=None):
+    """Generate speech using Coqui TTS with language support.
+
+    Calls on one model run one at a time; a call whose cancel event (a
+    threading.Event) is set by the time the model is free is skipped.
+    """
+    try:
+        coqui_lang = COQUI_LANGUAGES.get(language, 'en')
+
+        import torch
+        tts = get_coqui_model()
+
+        with coqui_inference_lock(tts), torch.inference_mode():
+            if cancel is not None and cancel.is_set():
+                return False
+            if speaker_wav and os.path.exists(speaker_wav):
+                print(f"      Cloning voice from: {speaker_wav}")
+                tts.tts_to_file(
+                    text=text,
+                    file_path=output_path,
+                    speaker_wav=speaker_wav,
+                    language=coqui_lang
+                )
+            else:
+                tts.tts_to_file(
+                    text=text,
+                    file_path=output_path,
+                    language=coqui_lang
+                )
 
         return True
     except ImportError:
@@ -316,14 +1449,25 @@ def text_to_speech_coqui(text, output_path, speaker_wav=None, language="en"):
         print(f"      ⚠️  Coqui TTS failed: {e}")
         return False
 
-def text_to_speech_elevenlabs(text, output_path, voice_id="EXAVITQu4vr4xnSDxMaL"):
-    """Generate speech using ElevenLabs API."""
+# (connect, read) seconds; the read timeout bounds each gap between audio chunks
+ELEVENLABS_TIMEOUT = (10, 30)
+ELEVENLABS_CHUNK_BYTES = 1 << 14
+
+def text_to_speech_elevenlabs(text, output_path, voice_id="EXAVITQu4vr4xnSDxMaL", on_first_audio=None,
+                              timeout=ELEVENLABS_TIMEOUT, cancel=None):
+    """Generate speech using the ElevenLabs streaming API, writing audio to disk as it arrives.
+
+    on_first_audio(output_path), if given, is called once the first audio
+    bytes are on disk; the file keeps growing until this function returns.
+    Setting the cancel event (a threading.Event) abandons the stream and
+    removes the partial file, as does a failure mid-stream.
+    """
     if not ELEVENLABS_API_KEY:
         print("      ⚠️  ElevenLabs API key not set")
         return False
 
     try:
-        url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
+        url = f"{ELEVENLABS_API_URL}/v1/text-to-speech/{voice_id}/stream"
         headers = {
             "Accept": "audio/mpeg",
             "Content-Type": "application/json",
@@ -338,70 +1482,304 @@ def text_to_speech_elevenlabs(text, output_path, voice_id="EXAVITQu4vr4xnSDxMaL"
             }
         }
 
-        response = requests.post(url, json=data, headers=headers)
-
-        if response.status_code == 200:
-            with open(output_path, 'wb') as f:
-                f.write(response.content)
-            return True
-        else:
-            print(f"      ⚠️  ElevenLabs API error: {response.status_code}")
+        with trace_span('elevenlabs', 'tts', chars=len(text)) as span:
+            started = time.perf_counter()
+            with get_http_session().post(url, json=data, headers=headers, stream=True, timeout=timeout) as response:
+                span['status'] = response.status_code
+                if response.status_code != 200:
+                    print(f"      ⚠️  ElevenLabs API error: {response.status_code}")
+                    return False
+                if cancel is not None and cancel.is_set():
+                    span['cancelled'] = True
+                    return False
+
+                written = 0
+                with open(output_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=ELEVENLABS_CHUNK_BYTES):
+                        if cancel is not None and cancel.is_set():
+                            span['cancelled'] = True
+                            break
+                        if not chunk:
+                            continue
+                        f.write(chunk)
+                        if not written:
+                            f.flush()
+                            span['first_audio_s'] = round(time.perf_counter() - started, 3)
+                            if on_first_audio:
+                                on_first_audio(output_path)
+                        written += len(chunk)
+                if span.get('cancelled'):
+                    _discard(output_path)
+                    return False
+            span['bytes'] = written
+        if not written:
+            print("      ⚠️  ElevenLabs returned no audio")
             return False
+        return True
     except Exception as e:
         print(f"      ⚠️  ElevenLabs failed: {e}")
+        _discard(output_path)
         return False
 
-def text_to_speech_per_section(sections, output_dir, voice_engine="gtts", voice_sample=None, language="en"):
-    """Generates separate audio file for each section with language support."""
-    audio_files = []
-
-    # Map language codes for gTTS
-    gtts_lang_map = {
-        'en': 'en',
-        'ko': 'ko',
-        'ja': 'ja',
-        'zh': 'zh-CN'
-    }
-
-    for idx, section in enumerate(sections):
-        text_parts = [section['title'] + '.']
-        if section['content']:
-            text_parts.append(section['content'])
-
-        combined_text = ' '.join(text_parts)
-        clean_text = clean_text_for_speech(combined_text)
+def section_speech_text(section, language="en"):
+    """Returns the text spoken for a section: its title, then its content.
+
+    Sections from normalize_summary carry it already; others are tokenized here.
+    """
+    if 'speech' in section:
+        return section['speech']
+    tokens = [('text', _title_speech(section['title'], language))]
+    if section['content']:
+        tokens += [(kind, _plain(line) if kind != 'blank' else '') for kind, line in tokenize_markdown(section['content'])]
+    return _speech_from_tokens(tokens, language)
+
+# Typical narration speed, used to time draft renders without synthesizing
+# audio. CJK scripts pack more speech into each character.
+SPEECH_CHARS_PER_SECOND = {
+    'en': 15,
+    'ko': 7,
+    'ja': 8,
+    'zh': 5,
+}
 
-        audio_path = os.path.join(output_dir, f"audio_section_{idx:02d}.mp3")
+def estimate_section_duration(section, language="en"):
+    """Estimates how long a section takes to narrate, in seconds, from its text length."""
+    text = section_speech_text(section, language)
+    pauses = (len(chunk_speech_text(text, language)) - 1) * SENTENCE_PAUSE_MS / 1000
+    return max(1.0, round(len(text) / SPEECH_CHARS_PER_SECOND.get(language, 15) + pauses, 1))
+
+# Map language codes for gTTS
+GTTS_LANGUAGES = {
+    'en': 'en',
+    'ko': 'ko',
+    'ja': 'ja',
+    'zh': 'zh-CN'
+}
 
-        success = False
+# Latency budget for one synthesis call, as (fixed seconds, seconds per
+# second of expected speech). When a call runs over its budget (or fails),
+# TTS_HEDGE_ENGINE is started alongside it and the first valid audio wins.
+TTS_BUDGETS = {
+    'elevenlabs': (4.0, 0.5),
+    'coqui': (10.0, 2.0),
+}
+TTS_HEDGE_ENGINE = "gtts"
+
+_tts_budget_scale = 1.0
+_tts_executor = None
+_tts_executor_lock = threading.Lock()
+
+def set_tts_budget_scale(scale):
+    """Scales every TTS latency budget; 0 disables hedging (engines fall back only on failure)."""
+    global _tts_budget_scale
+    _tts_budget_scale = scale
+
+def tts_budget(voice_engine, text, language="en"):
+    """Returns the seconds a synthesis call may take before it is hedged, or None for no budget."""
+    if voice_engine not in TTS_BUDGETS or not _tts_budget_scale:
+        return None
+    fixed, per_speech_second = TTS_BUDGETS[voice_engine]
+    speech_seconds = len(text) / SPEECH_CHARS_PER_SECOND.get(language, 15)
+    return (fixed + per_speech_second * speech_seconds) * _tts_budget_scale
+
+def get_tts_executor():
+    """Returns the thread pool engine calls run on, so a stalled call can be raced and abandoned."""
+    global _tts_executor
+    with _tts_executor_lock:
+        if _tts_executor is None:
+            _tts_executor = concurrent.futures.ThreadPoolExecutor(max_workers=32, thread_name_prefix='tts-engine')
+        return _tts_executor
+
+def _run_voice_engine(voice_engine, text, output_path, voice_sample, language, cancel):
+    """Runs one engine; returns True once it has written audio to output_path."""
+    if voice_engine == "coqui":
+        return text_to_speech_coqui(text, output_path, speaker_wav=voice_sample, language=language, cancel=cancel)
+    if voice_engine == "elevenlabs":
+        return text_to_speech_elevenlabs(text, output_path, cancel=cancel)
+    from gtts import gTTS
+    tts = gTTS(text=text, lang=GTTS_LANGUAGES.get(language, 'en'), slow=False)
+    tts.save(output_path)
+    return True
+
+def _discard(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+def synthesize_speech(text, output_path, voice_engine="gtts", voice_sample=None, language="en"):
+    """Synthesizes one piece of text with the chosen engine, hedged by gTTS; returns the engine used.
+
+    Each engine writes its own copy ("<output_path>.<engine>"). If the
+    chosen engine fails, or is still running when its tts_budget expires,
+    TTS_HEDGE_ENGINE starts in parallel; the first to finish with audio is
+    moved to output_path and the other is cancelled (ElevenLabs) or left
+    to finish in the background and discarded.
+    """
+    if voice_engine == "gtts":
+        _run_voice_engine("gtts", text, output_path, voice_sample, language, None)
+        return voice_engine
+
+    if voice_engine == "coqui":
+        try:
+            get_coqui_model()  # loading the model is not part of a call's budget
+        except Exception:
+            pass  # reported by the call itself
+    budget = tts_budget(voice_engine, text, language)
+    cancel = threading.Event()
+    paths = {}
+    pending = {}
+
+    def start(engine):
+        paths[engine] = f"{output_path}.{engine}"
+        future = get_tts_executor().submit(_run_voice_engine, engine, text, paths[engine], voice_sample, language,
+                                           cancel)
+        pending[future] = engine
+
+    with trace_span('tts_call', 'tts', engine=voice_engine, chars=len(text), budget_s=budget) as span:
+        started = time.perf_counter()
+        start(voice_engine)
+        winner, error = None, None
+        while pending and winner is None:
+            hedged = TTS_HEDGE_ENGINE in paths
+            timeout = None if hedged or budget is None else max(0.0, started + budget - time.perf_counter())
+            done, _ = concurrent.futures.wait(pending, timeout=timeout,
+                                              return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                engine = pending.pop(future)
+                try:
+                    succeeded = future.result()
+                except Exception as e:
+                    succeeded, error = False, e
+                if succeeded and winner is None:
+                    winner = engine
+                else:
+                    _discard(paths[engine])
+            if winner is None and not hedged:
+                elapsed = time.perf_counter() - started
+                if done:
+                    print(f"      Falling back to {TTS_HEDGE_ENGINE}...")
+                else:
+                    print(f"      {voice_engine} still running after {elapsed:.1f}s (budget {budget:.1f}s); "
+                          f"hedging with {TTS_HEDGE_ENGINE}...")
+                span['hedged_after_s'] = round(elapsed, 3)
+                start(TTS_HEDGE_ENGINE)
+
+        # Abandon the slower engine; whatever it still writes is removed when it ends
+        cancel.set()
+        for future, engine in pending.items():
+            future.add_done_callback(lambda _, path=paths[engine]: _discard(path))
+        if winner is None:
+            raise error or Exception(f"No voice engine produced audio ({', '.join(paths)})")
+        os.replace(paths[winner], output_path)
+        span['winner'] = winner
+        span['latency_s'] = round(time.perf_counter() - started, 3)
+    return winner
+
+def trim_silence(segment, threshold_dbfs=-50.0):
+    """Strips leading and trailing silence (encoder padding) from a clip; all-silent clips are kept whole."""
+    from pydub.silence import detect_leading_silence
+    lead = detect_leading_silence(segment, silence_threshold=threshold_dbfs)
+    trail = detect_leading_silence(segment.reverse(), silence_threshold=threshold_dbfs)
+    if lead + trail >= len(segment):
+        return segment
+    return segment[lead:len(segment) - trail]
+
+def synthesize_chunked(chunks, output_path, voice_engine="gtts", voice_sample=None, language="en"):
+    """Synthesizes text chunks concurrently and joins them into one mp3; returns the engines used.
+
+    Each chunk's own leading and trailing silence is trimmed so the only
+    gaps in the section are the SENTENCE_PAUSE_MS pauses placed between chunks.
+    """
+    from pydub import AudioSegment
+    # Coqui calls are serialized per model (coqui_inference_lock); queued
+    # chunks would only spend their latency budgets waiting for the lock
+    workers = 1 if voice_engine == "coqui" else TTS_CHUNK_WORKERS
+    part_dir = tempfile.mkdtemp(prefix=".chunks_", dir=os.path.dirname(output_path) or ".")
+    try:
+        # No extension: engines write mp3 or wav, and ffmpeg sniffs which
+        part_paths = [os.path.join(part_dir, f"chunk_{idx:03d}.part") for idx in range(len(chunks))]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(workers, len(chunks)),
+                                                   thread_name_prefix='tts-chunk') as pool:
+            engines = list(pool.map(
+                lambda chunk, path: synthesize_speech(chunk, path, voice_engine, voice_sample, language),
+                chunks, part_paths))
+
+        pause = AudioSegment.silent(duration=SENTENCE_PAUSE_MS)
+        audio = None
+        for path in part_paths:
+            segment = trim_silence(AudioSegment.from_file(path))
+            audio = segment if audio is None else audio + pause + segment
+        audio.export(output_path, format="mp3")
+    finally:
+        shutil.rmtree(part_dir, ignore_errors=True)
+    return engines
+
+def text_to_speech_section(section, idx, output_dir, voice_engine="gtts", voice_sample=None, language="en",
+                           stats=None):
+    """Generates the audio file for a single section and returns (path, duration).
+
+    The text is split into sentence chunks (see chunk_speech_text); several
+    chunks are synthesized concurrently and stitched together with short pauses.
+    If given, the stats dict receives the engine that produced the audio
+    ("elevenlabs+gtts" when chunks were hedged) and the synthesis time.
+    """
+    from pydub import AudioSegment
+
+    clean_text = section_speech_text(section, language)
+    chunks = chunk_speech_text(clean_text, language)
+
+    audio_path = os.path.join(output_dir, f"audio_section_{idx:02d}.mp3")
+
+    with trace_span('tts_section', 'tts', section=idx, engine=voice_engine, chars=len(clean_text),
+                    chunks=len(chunks)) as span:
+        synth_started = time.perf_counter()
 
         if voice_engine == "coqui":
-            print(f"   Section {idx} ({section['title']}): Using Coqui TTS...")
-            success = text_to_speech_coqui(clean_text, audio_path, speaker_wav=voice_sample, language=language)
-
+            print(f"   Section {idx} ({section['title']}): Using Coqui TTS ({len(chunks)} chunks)...")
         elif voice_engine == "elevenlabs":
-            print(f"   Section {idx} ({section['title']}): Using ElevenLabs...")
-            success = text_to_speech_elevenlabs(clean_text, audio_path)
+            print(f"   Section {idx} ({section['title']}): Using ElevenLabs ({len(chunks)} chunks)...")
+
+        if len(chunks) > 1:
+            engines = synthesize_chunked(chunks, audio_path, voice_engine, voice_sample, language)
+        else:
+            engines = [synthesize_speech(clean_text, audio_path, voice_engine, voice_sample, language)]
+        produced_by = "+".join(dict.fromkeys(engines))
+        span['produced_by'] = produced_by
+        if voice_engine != "gtts" and "gtts" in engines:
+            span['fallback'] = "gtts"
 
-        # Fallback to gTTS
-        if not success or voice_engine == "gtts":
-            if voice_engine != "gtts":
-                print(f"      Falling back to gTTS...")
-            gtts_lang = gtts_lang_map.get(language, 'en')
-            tts = gTTS(text=clean_text, lang=gtts_lang, slow=False)
-            tts.save(audio_path)
+        synth_seconds = time.perf_counter() - synth_started
+        if stats is not None:
+            stats.update(engine=produced_by, synth_s=round(synth_seconds, 3))
 
         # Get duration
-        audio = AudioSegment.from_mp3(audio_path)
+        audio = AudioSegment.from_file(audio_path)
         duration = len(audio) / 1000.0
+        span['audio_s'] = duration
+        # Real-time factor: synthesis time per second of speech (< 1 is faster than real time)
+        rtf = synth_seconds / duration if duration else 0.0
+        span['rtf'] = round(rtf, 3)
 
-        audio_files.append((audio_path, duration))
-        print(f"      Duration: {duration:.1f}s")
+    print(f"      Duration: {duration:.1f}s (synthesized in {synth_seconds:.1f}s by {produced_by}, RTF {rtf:.2f})")
+    return audio_path, duration
+
+def text_to_speech_per_section(sections, output_dir, voice_engine="gtts", voice_sample=None, language="en"):
+    """Generates separate audio file for each section with language support."""
+    audio_files = []
+
+    for idx, section in enumerate(sections):
+        audio_files.append(text_to_speech_section(
+            section, idx, output_dir,
+            voice_engine=voice_engine,
+            voice_sample=voice_sample,
+            language=language
+        ))
 
     return audio_files
 
+@functools.lru_cache(maxsize=64)
 def get_font_for_language(language, size, style='regular'):
     """Returns appropriate font for the language."""
+    from PIL import ImageFont
     # Try to find language-specific font
     font_name = LANGUAGE_FONTS.get(language, 'DejaVuSans.ttf')
 
@@ -423,6 +1801,22 @@ def get_font_for_language(language, size, style='regular'):
     # Ultimate fallback to default
     return ImageFont.load_default()
 
+def fit_text(text, language, sizes, max_width, max_height, line_spacing):
+    """Wraps text at the largest font size in sizes whose lines fit in max_height; returns (font, lines, size).
+
+    At the smallest size, lines that still do not fit are dropped and the
+    last kept line ends with an ellipsis.
+    """
+    for size in sizes:
+        font = get_font_for_language(language, size)
+        lines = wrap_text(text, font, max_width)
+        fitting = max(1, (max_height + line_spacing) // (size + line_spacing))
+        if len(lines) <= fitting:
+            return font, lines, size
+    lines = lines[:fitting]
+    lines[-1] = lines[-1].rstrip('.,;: ') + '…'
+    return font, lines, size
+
 def wrap_text(text, font, max_width):
     """Wraps text to fit within max_width (multilingual)."""
     words = text.split()
@@ -451,8 +1845,23 @@ def wrap_text(text, font, max_width):
 
     return lines
 
+_gradient_cache = {}
+_gradient_lock = threading.Lock()
+
 def create_gradient_background(width, height, color1, color2):
-    """Creates a vertical gradient background."""
+    """Creates a vertical gradient background (a fresh copy of a cached template)."""
+    key = (width, height, color1, color2)
+    with _gradient_lock:
+        template = _gradient_cache.get(key)
+    if template is None:
+        template = _render_gradient(width, height, color1, color2)
+        with _gradient_lock:
+            _gradient_cache[key] = template
+    return template.copy()
+
+def _render_gradient(width, height, color1, color2):
+    """Renders a vertical gradient from color1 (top) to color2 (bottom)."""
+    from PIL import Image
     base = Image.new('RGB', (width, height), color1)
     top = Image.new('RGB', (width, height), color2)
     mask = Image.new('L', (width, height))
@@ -463,68 +1872,242 @@ def create_gradient_background(width, height, color1, color2):
     base.paste(top, (0, 0), mask)
     return base
 
-def create_slides_with_avatar(sections, output_dir, figures=None, avatar_image=None, language='en'):
-    """Creates slides with language-appropriate fonts."""
+# Avatar and figure renditions, pre-scaled per slide size and keyed by source hash
+ASSET_CACHE_DIR = os.environ.get(
+    "PAPER_TO_VIDEO_ASSET_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "paper_to_video", "assets")
+)
+ASSET_CACHE_VERSION = 1  # bump when the scaling below changes
+# Bounds on the in-memory caches, which live as long as a daemon or worker
+ASSET_MEMORY_ENTRIES = 8
+ASSET_DIGEST_ENTRIES = 256
+
+# Least recently used first
+_asset_cache = collections.OrderedDict()
+_asset_digests = collections.OrderedDict()
+_asset_lock = threading.Lock()
+
+def _remember(cache, key, value, max_entries):
+    """Stores value in an LRU cache (call with _asset_lock held); returns the entry kept for key."""
+    value = cache.setdefault(key, value)
+    cache.move_to_end(key)
+    while len(cache) > max_entries:
+        cache.popitem(last=False)
+    return value
+
+def fit_size(source_size, max_size):
+    """Returns source_size scaled to max_size's width, or its height if that is too tall."""
+    source_width, source_height = source_size
+    max_width, max_height = max_size
+    width = max_width
+    height = int(source_height * (width / source_width))
+    if height > max_height:
+        height = max_height
+        width = int(source_width * (height / source_height))
+    return width, height
+
+def _asset_digest(path):
+    """Returns the SHA-256 of an asset file, remembered per path, size and modification time."""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    with _asset_lock:
+        digest = _asset_digests.get(key)
+        if digest is not None:
+            _asset_digests.move_to_end(key)
+    if digest is None:
+        digest = hash_file(path)
+        with _asset_lock:
+            _remember(_asset_digests, key, digest, ASSET_DIGEST_ENTRIES)
+    return digest
+
+def load_scaled_asset(path, size, fit=False, mode=None, cache_dir=None, keep_in_memory=False):
+    """Returns the image at path scaled to size (or fitted inside it when fit is set).
+
+    Renditions are kept as PNGs under cache_dir (ASSET_CACHE_DIR by default),
+    keyed by the source's hash, the target size and mode, so a repeated
+    render does no decoding of the source and no resampling. Assets reused
+    by every render (the avatar) also set keep_in_memory, which keeps the
+    last ASSET_MEMORY_ENTRIES of them decoded in memory. On a
+    miss, JPEGs are decoded at a reduced scale via draft() and other formats
+    are reduced by an integer factor before the final LANCZOS pass.
+    """
+    from PIL import Image
+    cache_dir = cache_dir or ASSET_CACHE_DIR
+    digest = _asset_digest(path)
+    with trace_span('scale_asset', 'io', source=os.path.basename(path)) as span:
+        with Image.open(path) as img:
+            target = fit_size(img.size, size) if fit else tuple(size)
+            key = (digest, target, mode, ASSET_CACHE_VERSION)
+            with _asset_lock:
+                cached = _asset_cache.get(key)
+                if cached is not None:
+                    _asset_cache.move_to_end(key)
+            if cached is not None:
+                span['cache'] = "memory"
+                return cached
+            cached_path = os.path.join(
+                cache_dir, f"{digest}-{target[0]}x{target[1]}-{mode or 'orig'}-v{ASSET_CACHE_VERSION}.png")
+            if os.path.exists(cached_path):
+                span['cache'] = "disk"
+                with Image.open(cached_path) as cached_file:
+                    cached_file.load()
+                    scaled = cached_file.copy()
+            else:
+                span['cache'] = "miss"
+                span['source_size'] = list(img.size)
+                img.draft(mode, target)  # JPEG only: decode at 1/2, 1/4 or 1/8 scale
+                scaled = img.convert(mode) if mode and img.mode != mode else img
+                scaled = scaled.resize(target, Image.Resampling.LANCZOS, reducing_gap=3.0)
+                try:
+                    os.makedirs(cache_dir, exist_ok=True)
+                    part_path = f"{cached_path}.{os.getpid()}.{threading.get_ident()}.part"
+                    scaled.save(part_path, format='PNG')
+                    os.replace(part_path, cached_path)
+                except OSError as e:
+                    print(f"   ⚠️  Could not cache scaled asset: {e}")
+            span['size'] = list(target)
+        if not keep_in_memory:
+            return scaled
+        with _asset_lock:
+            return _remember(_asset_cache, key, scaled, ASSET_MEMORY_ENTRIES)
+
+def load_avatar(avatar_image, size=(300, 400)):
+    """Returns the avatar resized to size, from the scaled asset cache."""
+    return load_scaled_asset(avatar_image, size, keep_in_memory=True)
+
+# Bump when slide drawing changes so cached slides are re-rendered
+SLIDE_LAYOUT_VERSION = 1
+
+def slide_layout(size):
+    """Returns pixel metrics for slides of the given (width, height).
+
+    Everything is designed at 1280x720 and scaled to fit, so 720p reproduces
+    the original layout exactly. Portrait frames stack the avatar, figure and
+    text vertically and scale with their width, as if 720 pixels wide.
+    """
+    width, height = size
+    scale = width / 720 if height > width else min(width / 1280, height / 720)
+
+    def px(value):
+        return max(1, round(value * scale))
+
+    return {
+        'width': width,
+        'height': height,
+        'portrait': height > width,
+        'margin': px(60),
+        'avatar_size': (px(300), px(400)),
+        'font_sizes': tuple(px(size) for size in (52, 38, 26, 20)),  # title, header, body, caption
+        'header_height': px(100),
+        'header_text_y': px(30),
+        'body_top': px(130),
+        'line_spacing': px(12),
+        'title_gap': px(30),
+        'title_avatar_x': px(50),
+        'title_text_x': px(400),  # title start when the avatar is beside it
+        'avatar_column': px(400),  # width the avatar takes from content text
+        'highlight_pad': px(5),
+        'title_rule': (px(400), px(4)),
+        'figure_max': (px(500), px(300)),
+        'figure_gap': px(40),
+        'shadow': px(3),
+    }
+
+def create_slides_with_avatar(sections, output_dir, figures=None, avatar_image=None, language='en', size=(1280, 720)):
+    """Creates slides with language-appropriate fonts at the given (width, height)."""
+    from PIL import ImageDraw
     slides = []
     slide_to_section = []
     figures = figures or []
     figure_idx = 0
+    layout = slide_layout(size)
+    width, height = size
+    margin = layout['margin']
+    portrait = layout['portrait']
+    avatar_w, avatar_h = layout['avatar_size']
 
     # Load avatar
     avatar = None
     if avatar_image and os.path.exists(avatar_image):
         try:
-            avatar = Image.open(avatar_image)
-            avatar = avatar.resize((300, 400), Image.Resampling.LANCZOS)
+            avatar = load_avatar(avatar_image, size=layout['avatar_size'])
             print(f"   Using avatar: {avatar_image}")
         except Exception as e:
             print(f"   ⚠️  Could not load avatar: {e}")
 
     # Fonts for language
-    title_font = get_font_for_language(language, 52)
-    header_font = get_font_for_language(language, 38)
-    body_font = get_font_for_language(language, 26)
-    small_font = get_font_for_language(language, 20)
-
-    width, height = 1280, 720
-    margin = 60
+    title_size, header_size, body_size, small_size = layout['font_sizes']
+    title_font = get_font_for_language(language, title_size)
+    body_font = get_font_for_language(language, body_size)
+    small_font = get_font_for_language(language, small_size)
+
+    # Content text runs from body_top down to text_bottom; in portrait the
+    # avatar sits below the text instead of beside it.
+    if portrait:
+        text_bottom = height - margin - (avatar_h + margin if avatar else 0)
+        full_text_width = width - (2 * margin)
+        avatar_pos = ((width - avatar_w) // 2, height - avatar_h - margin)
+    else:
+        text_bottom = height - margin
+        full_text_width = width - (2 * margin) if not avatar else width - layout['avatar_column'] - margin
+        avatar_pos = (margin, height - avatar_h - margin)
 
     for idx, section in enumerate(sections):
         # Title slide
+        slide_started = time.perf_counter()
         title_image = create_gradient_background(width, height, '#1e3a5f', '#2c5282')
         draw = ImageDraw.Draw(title_image)
 
         if avatar:
-            avatar_x = 50
-            avatar_y = (height - 400) // 2
-            title_image.paste(avatar, (avatar_x, avatar_y), avatar if avatar.mode == 'RGBA' else None)
+            if portrait:
+                title_avatar_pos = ((width - avatar_w) // 2, height // 2 - avatar_h - margin)
+            else:
+                title_avatar_pos = (layout['title_avatar_x'], (height - avatar_h) // 2)
+            title_image.paste(avatar, title_avatar_pos, avatar if avatar.mode == 'RGBA' else None)
 
         title_text = section['title']
+        title_lines = wrap_text(title_text, title_font, width - (2 * margin)) if portrait else [title_text]
         try:
             title_bbox = title_font.getbbox(title_text)
             title_width = title_bbox[2] - title_bbox[0]
             title_height = title_bbox[3] - title_bbox[1]
         except:
             title_width = len(title_text) * 30
-            title_height = 52
-
-        if avatar:
-            title_x = 400
+            title_height = title_size
+
+        if portrait:
+            title_width = min(title_width, width - (2 * margin))
+            title_x = margin
+            title_y = height // 2 if avatar else (height - title_height * len(title_lines)) // 2
+        elif avatar:
+            title_x = layout['title_text_x']
             title_y = (height - title_height) // 2
         else:
             title_x = (width - title_width) // 2
             title_y = (height - title_height) // 2
 
-        draw.text((title_x + 3, title_y + 3), title_text, fill='#00000080', font=title_font)
-        draw.text((title_x, title_y), title_text, fill='white', font=title_font)
-
-        line_width = min(400, title_width)
-        line_x = title_x
-        line_y = title_y + title_height + 30
-        draw.rectangle([line_x, line_y, line_x + line_width, line_y + 4], fill='#60a5fa')
+        shadow = layout['shadow']
+        line_y = title_y
+        for line in title_lines:
+            if portrait:
+                try:
+                    line_bbox = title_font.getbbox(line)
+                    title_x = (width - (line_bbox[2] - line_bbox[0])) // 2
+                except:
+                    title_x = margin
+            draw.text((title_x + shadow, line_y + shadow), line, fill='#00000080', font=title_font)
+            draw.text((title_x, line_y), line, fill='white', font=title_font)
+            line_y += title_height + layout['line_spacing']
+        line_y += layout['title_gap'] - layout['line_spacing']
+
+        rule_width, rule_height = layout['title_rule']
+        line_width = min(rule_width, title_width)
+        line_x = (width - line_width) // 2 if portrait else title_x
+        draw.rectangle([line_x, line_y, line_x + line_width, line_y + rule_height], fill='#60a5fa')
 
         title_slide_path = os.path.join(output_dir, f"slide_{len(slides):03d}_title.png")
         title_image.save(title_slide_path)
+        trace_record('slide', 'raster', slide_started, section=idx, kind='title')
         slides.append(title_slide_path)
         slide_to_section.append(idx)
 
@@ -533,95 +2116,142 @@ def create_slides_with_avatar(sections, output_dir, figures=None, avatar_image=N
         if not content:
             continue
 
-        paragraphs = [p.strip() for p in content.split('\n') if p.strip()]
-
-        content_image = create_gradient_background(width, height, '#f8fafc', '#e2e8f0')
-        draw = ImageDraw.Draw(content_image)
-
-        draw.rectangle([0, 0, width, 100], fill='#1e3a5f')
-        draw.text((margin, 30), section['title'], fill='white', font=header_font)
+        paragraphs = section['slide_lines'] if 'slide_lines' in section else slide_paragraphs(content, language)
 
-        if avatar:
-            avatar_x = margin
-            avatar_y = height - 400 - margin
-            content_image.paste(avatar, (avatar_x, avatar_y), avatar if avatar.mode == 'RGBA' else None)
-
-        y_offset = 130
-        line_spacing = 12
-        max_text_width = width - (2 * margin)
-
-        if avatar:
-            max_text_width = width - 400 - margin
+        # Long titles wrap inside the header band, shrinking towards body size on narrow slides
+        header_gap = layout['highlight_pad']
+        header_title_font, header_lines, header_line_size = fit_text(
+            section['title'], language, (header_size, body_size, small_size), width - (2 * margin),
+            layout['header_height'] - 2 * header_gap, header_gap)
+        if len(header_lines) == 1 and header_line_size == header_size:
+            header_y = layout['header_text_y']
+        else:
+            header_y = (layout['header_height'] - len(header_lines) * (header_line_size + header_gap) + header_gap) // 2
+
+        def new_content_image():
+            image = create_gradient_background(width, height, '#f8fafc', '#e2e8f0')
+            draw = ImageDraw.Draw(image)
+            draw.rectangle([0, 0, width, layout['header_height']], fill='#1e3a5f')
+            for line_idx, line in enumerate(header_lines):
+                draw.text((margin, header_y + line_idx * (header_line_size + header_gap)), line, fill='white',
+                          font=header_title_font)
+            if avatar:
+                image.paste(avatar, avatar_pos, avatar if avatar.mode == 'RGBA' else None)
+            return image, draw
+
+        slide_started = time.perf_counter()
+        content_image, draw = new_content_image()
+
+        y_offset = layout['body_top']
+        line_spacing = layout['line_spacing']
+        max_text_width = full_text_width
 
         if figure_idx < len(figures) and idx > 0:
             try:
-                fig_img = Image.open(figures[figure_idx])
-                fig_width = 500
-                fig_height = int(fig_img.height * (fig_width / fig_img.width))
-                if fig_height > 300:
-                    fig_height = 300
-                    fig_width = int(fig_img.width * (fig_height / fig_img.height))
-
-                fig_img = fig_img.resize((fig_width, fig_height), Image.Resampling.LANCZOS)
-                fig_x = width - margin - fig_width
+                if portrait:
+                    # Full-width figure under the header, text below it
+                    max_fig_size = (width - (2 * margin), (text_bottom - y_offset) // 2)
+                else:
+                    max_fig_size = layout['figure_max']
+                fig_img = load_scaled_asset(figures[figure_idx], max_fig_size, fit=True, mode='RGB')
+                fig_width, fig_height = fig_img.size
+                fig_x = (width - fig_width) // 2 if portrait else width - margin - fig_width
                 fig_y = y_offset
                 content_image.paste(fig_img, (fig_x, fig_y))
 
                 draw.text((fig_x, fig_y + fig_height + 5), f"Figure {figure_idx + 1}",
                          fill='#475569', font=small_font)
 
-                max_text_width = min(max_text_width, fig_x - margin - 40)
+                if portrait:
+                    y_offset = fig_y + fig_height + small_size + layout['figure_gap']
+                else:
+                    max_text_width = min(max_text_width, fig_x - margin - layout['figure_gap'])
                 figure_idx += 1
             except Exception as e:
                 print(f"⚠️  Could not add figure: {e}")
 
         for para_idx, para in enumerate(paragraphs):
             wrapped_lines = wrap_text(para, body_font, max_text_width)
-            para_height = len(wrapped_lines) * (26 + line_spacing)
+            para_height = len(wrapped_lines) * (body_size + line_spacing)
 
-            if y_offset + para_height > height - margin:
+            if y_offset + para_height > text_bottom:
                 content_slide_path = os.path.join(output_dir, f"slide_{len(slides):03d}_content.png")
                 content_image.save(content_slide_path)
+                trace_record('slide', 'raster', slide_started, section=idx, kind='content')
                 slides.append(content_slide_path)
                 slide_to_section.append(idx)
 
-                content_image = create_gradient_background(width, height, '#f8fafc', '#e2e8f0')
-                draw = ImageDraw.Draw(content_image)
-                draw.rectangle([0, 0, width, 100], fill='#1e3a5f')
-                draw.text((margin, 30), section['title'], fill='white', font=header_font)
-
-                if avatar:
-                    content_image.paste(avatar, (avatar_x, avatar_y), avatar if avatar.mode == 'RGBA' else None)
+                slide_started = time.perf_counter()
+                content_image, draw = new_content_image()
 
-                y_offset = 130
-                max_text_width = width - (2 * margin) if not avatar else width - 400 - margin
+                y_offset = layout['body_top']
+                max_text_width = full_text_width
 
             for line_idx, line in enumerate(wrapped_lines):
                 if line_idx == 0 and para_idx < 3:
                     try:
                         bbox = body_font.getbbox(line)
-                        draw.rectangle([margin - 5, y_offset - 5,
-                                      margin + bbox[2] - bbox[0] + 5,
-                                      y_offset + 26 + 5],
+                        pad = layout['highlight_pad']
+                        draw.rectangle([margin - pad, y_offset - pad,
+                                      margin + bbox[2] - bbox[0] + pad,
+                                      y_offset + body_size + pad],
                                      fill='#dbeafe', outline='#3b82f6', width=1)
                     except:
                         pass
 
                 draw.text((margin, y_offset), line, fill='#1e293b', font=body_font)
-                y_offset += 26 + line_spacing
+                y_offset += body_size + line_spacing
 
             y_offset += line_spacing * 2
 
         content_slide_path = os.path.join(output_dir, f"slide_{len(slides):03d}_content.png")
         content_image.save(content_slide_path)
+        trace_record('slide', 'raster', slide_started, section=idx, kind='content')
         slides.append(content_slide_path)
         slide_to_section.append(idx)
 
     return slides, slide_to_section
 
-def create_video(slides, slide_to_section, section_audio_files, output_dir, output_file="output.mp4"):
-    """Creates video with per-section audio sync."""
-    output_path = os.path.join(output_dir, output_file)
+def create_contact_sheet(slides, slide_to_section, output_path, columns=4, thumb_width=320):
+    """Tiles every slide into one labelled PNG for reviewing a layout at a glance."""
+    from PIL import Image, ImageDraw
+    if not slides:
+        return None
+    with Image.open(slides[0]) as first:
+        thumb_height = round(first.height * thumb_width / first.width)
+    gap = 8
+    label_height = 24
+    rows = (len(slides) + columns - 1) // columns
+    sheet = Image.new('RGB', (gap + columns * (thumb_width + gap),
+                              gap + rows * (thumb_height + label_height + gap)), '#0f172a')
+    draw = ImageDraw.Draw(sheet)
+    label_font = get_font_for_language('en', 14)
+
+    for slide_idx, slide_path in enumerate(slides):
+        with Image.open(slide_path) as img:
+            thumb = img.convert('RGB').resize((thumb_width, thumb_height), Image.Resampling.LANCZOS)
+        x = gap + (slide_idx % columns) * (thumb_width + gap)
+        y = gap + (slide_idx // columns) * (thumb_height + label_height + gap)
+        sheet.paste(thumb, (x, y))
+        draw.text((x, y + thumb_height + 4), f"#{slide_idx}  section {slide_to_section[slide_idx]}",
+                  fill='#e2e8f0', font=label_font)
+
+    sheet.save(output_path)
+    return output_path
+
+@contextlib.contextmanager
+def composed_video(slides, slide_to_section, section_audio_files):
+    """Yields the slideshow clip, in section order, with per-section audio sync.
+
+    Frames are generated on demand and only the slide on screen is decoded,
+    so memory does not grow with the slide count. Every audio reader (an
+    ffmpeg subprocess each) is closed on exit instead of waiting for GC.
+    An audio path of None gives a silent section of the given duration
+    (used by drafts timed from text length).
+    """
+    import numpy as np
+    from PIL import Image
+    from moviepy import VideoClip, AudioFileClip, CompositeAudioClip
 
     section_slides = {}
     for slide_idx, section_idx in enumerate(slide_to_section):
@@ -632,128 +2262,1291 @@ def create_video(slides, slide_to_section, section_audio_files, output_dir, outp
     print(f"   Total slides: {len(slides)}")
     print(f"   Total sections: {len(section_audio_files)}")
 
-    clips = []
+    starts = []
+    schedule = []
+    audio_readers = []
     audio_clips = []
     current_time = 0
 
-    for section_idx, (audio_path, audio_duration) in enumerate(section_audio_files):
-        if section_idx not in section_slides:
+    try:
+        for section_idx, (audio_path, audio_duration) in enumerate(section_audio_files):
+            if section_idx not in section_slides:
+                continue
+
+            section_slide_indices = section_slides[section_idx]
+            num_slides = len(section_slide_indices)
+            slide_duration = audio_duration / num_slides
+
+            print(f"   Section {section_idx}: {num_slides} slides, {slide_duration:.1f}s each")
+
+            for offset, slide_idx in enumerate(section_slide_indices):
+                starts.append(current_time + offset * slide_duration)
+                schedule.append(slides[slide_idx])
+
+            if audio_path:
+                # with_start returns a copy sharing the reader; both get closed
+                audio_readers.append(AudioFileClip(audio_path))
+                audio_clips.append(audio_readers[-1].with_start(current_time))
+            current_time += audio_duration
+
+        final_audio = CompositeAudioClip(audio_clips) if audio_clips else None
+        # The last slide stays up until the audio ends
+        duration = final_audio.duration if final_audio else current_time
+        current = {'index': None, 'frame': None}
+
+        def frame_function(t):
+            index = max(0, bisect.bisect_right(starts, t) - 1)
+            if index != current['index']:
+                with Image.open(schedule[index]) as img:
+                    current['frame'] = np.asarray(img.convert('RGB'))
+                current['index'] = index
+            return current['frame']
+
+        video = VideoClip(frame_function, duration=duration)
+        if final_audio:
+            video = video.with_audio(final_audio)
+        try:
+            yield video
+        finally:
+            video.close()
+            current['frame'] = None
+    finally:
+        for audio_clip in audio_clips + audio_readers:
+            audio_clip.close()
+
+def create_video(slides, slide_to_section, section_audio_files, output_dir, output_file="output.mp4",
+                 fps=24, preset='medium'):
+    """Creates video with per-section audio sync."""
+    output_path = os.path.join(output_dir, output_file)
+    with composed_video(slides, slide_to_section, section_audio_files) as video, \
+            trace_span('write_videofile', 'encode', slides=len(slides), duration_s=round(video.duration, 2),
+                       fps=fps, preset=preset):
+        # MoviePy's temporary audio track goes next to the output (the workspace), not the CWD
+        video.write_videofile(output_path, fps=fps, codec='libx264', audio_codec='aac',
+                             threads=4, preset=preset, temp_audiofile_path=os.path.dirname(output_path))
+
+    return output_path
+
+def _publish_hls(hls_dir, publish_dir, published):
+    """Copies the segments hls_dir's playlist lists, then the playlist, to publish_dir.
+
+    published is the set of file names already copied; the playlist goes
+    last and is replaced atomically, so it never lists a missing segment.
+    """
+    try:
+        with open(os.path.join(hls_dir, HLS_PLAYLIST_NAME), "r", encoding='utf-8') as f:
+            playlist = f.read()
+    except FileNotFoundError:
+        return
+    names = [HLS_INIT_NAME] + [line.strip() for line in playlist.split('\n')
+                               if line.strip() and not line.startswith('#')]
+    if not playlist.endswith('\n') or not all(os.path.exists(os.path.join(hls_dir, name)) for name in names):
+        return  # read while ffmpeg was rewriting it; the next pass picks it up
+    os.makedirs(publish_dir, exist_ok=True)
+    for name in names:
+        if name not in published:
+            _link_or_copy(os.path.join(hls_dir, name), os.path.join(publish_dir, name))
+            published.add(name)
+    part_path = os.path.join(publish_dir, f"{HLS_PLAYLIST_NAME}.part")
+    with open(part_path, "w", encoding='utf-8') as f:
+        f.write(playlist)
+    os.replace(part_path, os.path.join(publish_dir, HLS_PLAYLIST_NAME))
+
+def create_hls_stream(slides, slide_to_section, section_audio_files, output_dir, segment_seconds=None,
+                      fps=24, preset='medium', publish_dir=None):
+    """Encodes the video as HLS with fragmented-MP4 segments; returns (playlist_path, segment_paths).
+
+    ffmpeg's HLS muxer writes each segment as soon as it is encoded and
+    rewrites the EVENT playlist after every one, so an origin can start
+    serving the opening sections while the rest is still rendering.
+    #EXT-X-ENDLIST is appended once the last section is done. Keyframes are
+    forced every segment_seconds so segments cut on time. When output_dir
+    is a scratch workspace, publish_dir receives the segments and playlist
+    as they are finished (every HLS_PUBLISH_INTERVAL seconds).
+    """
+    segment_seconds = segment_seconds or HLS_SEGMENT_SECONDS
+    os.makedirs(output_dir, exist_ok=True)
+    playlist_path = os.path.join(output_dir, HLS_PLAYLIST_NAME)
+    hls_params = [
+        '-f', 'hls',
+        '-hls_time', str(segment_seconds),
+        '-hls_playlist_type', 'event',
+        '-hls_segment_type', 'fmp4',
+        '-hls_fmp4_init_filename', HLS_INIT_NAME,
+        '-hls_segment_filename', os.path.join(output_dir, "segment_%05d.m4s"),
+        '-hls_flags', 'independent_segments',
+        '-force_key_frames', f"expr:gte(t,n_forced*{segment_seconds})",
+    ]
+    published = set()
+    stop_publishing = threading.Event()
+
+    def publish():
+        while not stop_publishing.wait(HLS_PUBLISH_INTERVAL):
+            _publish_hls(output_dir, publish_dir, published)
+
+    publisher = threading.Thread(target=publish, name='hls-publish', daemon=True) if publish_dir else None
+    if publisher:
+        publisher.start()
+    try:
+        with composed_video(slides, slide_to_section, section_audio_files) as video, \
+                trace_span('write_hls', 'encode', slides=len(slides), duration_s=round(video.duration, 2),
+                           fps=fps, preset=preset):
+            video.write_videofile(playlist_path, fps=fps, codec='libx264', audio_codec='aac',
+                                 threads=4, preset=preset, ffmpeg_params=hls_params,
+                                 temp_audiofile_path=output_dir)
+    finally:
+        if publisher:
+            stop_publishing.set()
+            publisher.join()
+    if publish_dir:
+        _publish_hls(output_dir, publish_dir, published)
+
+    segment_paths = [os.path.join(output_dir, HLS_INIT_NAME)]
+    with open(playlist_path, "r", encoding='utf-8') as f:
+        segment_paths += [os.path.join(output_dir, line.strip()) for line in f
+                          if line.strip() and not line.startswith('#')]
+    print(f"   HLS: {len(segment_paths) - 1} segments of ~{segment_seconds}s")
+    return playlist_path, segment_paths
+
+
+# Pipeline stages and the artifacts they depend on. Every stage's cache key is
+# a hash over its parameters plus the content hashes of its upstream outputs,
+# so a change anywhere invalidates exactly the stages downstream of it.
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+# CLI options recorded in the manifest and restored by --resume
+RESUMABLE_OPTIONS = ['paper_location', 'summarizer', 'voice_engine', 'voice_sample', 'avatar_image', 'language',
+                     'renditions', 'draft', 'estimate_audio', 'contact_sheet', 'output_format', 'summary_format']
+STAGE_GRAPH = {
+    'fetch': [],
+    'extract': ['fetch'],
+    'figures': ['fetch'],
+    'summarize': ['extract'],
+    'parse': ['summarize'],
+    'tts': ['parse'],
+    'slides': ['parse', 'figures'],
+    'encode': ['tts', 'slides'],
+}
+# Stages repeated for every output language when rendering several at once
+PER_LANGUAGE_STAGES = ['tts', 'slides', 'encode']
+# Which worker pool a stage runs in: 'io' stages mostly wait on the network,
+# the LLM or a TTS engine; 'cpu' stages keep a core busy.
+STAGE_KINDS = {
+    'fetch': 'io',
+    'extract': 'cpu',
+    'figures': 'cpu',
+    'summarize': 'io',
+    'parse': 'cpu',
+    'localize': 'io',
+    'tts': 'io',
+    'slides': 'cpu',
+    'encode': 'cpu',
+}
+_manifest_lock = threading.Lock()
+
+def hash_bytes(data):
+    """Returns the SHA-256 hex digest of a bytes object."""
+    return hashlib.sha256(data).hexdigest()
+
+def hash_file(path, chunk_size=1 << 20):
+    """Returns the SHA-256 hex digest of a file without loading it whole."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def hash_inputs(inputs):
+    """Returns a stable hash of a JSON-serialisable stage input description."""
+    encoded = json.dumps(inputs, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hash_bytes(encoded)
+
+def load_manifest(output_dir):
+    """Loads the stage manifest from output_dir (empty manifest if none)."""
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == MANIFEST_VERSION:
+            return manifest
+        print(f"   ⚠️  Ignoring manifest with unsupported version {manifest.get('version')}")
+    return {'version': MANIFEST_VERSION, 'stages': {}}
+
+def save_manifest(output_dir, manifest):
+    """Atomically writes the stage manifest to output_dir."""
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, manifest_path)
+
+def _outputs_intact(output_dir, outputs):
+    """Checks that every recorded output file still exists with its recorded size."""
+    for rel_path, info in outputs.items():
+        path = os.path.join(output_dir, rel_path)
+        if not os.path.exists(path) or os.path.getsize(path) != info['size']:
+            return False
+    return True
+
+def stage_digest(manifest, name):
+    """Returns a content hash of a completed stage's result and output files."""
+    entry = manifest['stages'][name]
+    return hash_inputs({
+        'result': entry['result'],
+        'outputs': {rel: info['sha256'] for rel, info in entry['outputs'].items()},
+    })
+
+def stage_is_current(manifest, output_dir, name, inputs):
+    """Returns whether the manifest holds an up-to-date result for a stage with these inputs."""
+    with _manifest_lock:
+        entry = manifest['stages'].get(name)
+    return bool(entry and entry['key'] == hash_inputs(inputs) and _outputs_intact(output_dir, entry['outputs']))
+
+def run_stage(manifest, output_dir, name, inputs, compute):
+    """Runs a pipeline stage unless the manifest already holds an up-to-date result.
+
+    `inputs` describes everything the stage depends on (parameters and upstream
+    digests). `compute` returns (result, output_paths); the result must be
+    JSON-serialisable and output paths must live inside output_dir.
+    """
+    key = hash_inputs(inputs)
+    if stage_is_current(manifest, output_dir, name, inputs):
+        print(f"   ↻ {name}: up to date, reusing previous result")
+        with _manifest_lock:
+            return manifest['stages'][name]['result']
+
+    result, output_paths = compute()
+    outputs = {}
+    for path in output_paths:
+        outputs[os.path.relpath(path, output_dir)] = {
+            'sha256': hash_file(path),
+            'size': os.path.getsize(path),
+        }
+    with _manifest_lock:
+        manifest['stages'][name] = {
+            'key': key,
+            'result': result,
+            'outputs': outputs,
+            'completed_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        }
+        save_manifest(output_dir, manifest)
+    return result
+
+
+# Scratch space: with a scratch directory (e.g. tmpfs at /dev/shm) every
+# intermediate is written to a per-output workspace there, and only the
+# deliverables are published to the output directory. Workspaces are kept
+# for --resume until the retention policy removes them.
+SCRATCH_DIR = os.environ.get("PAPER_TO_VIDEO_SCRATCH") or None
+SCRATCH_PREFIX = "ptv-"
+# Stages whose outputs are deliverables; contact sheets are published too
+DELIVERABLE_STAGES = ['summarize', 'localize', 'encode']
+
+# Renders hold a shared flock on this file in their workspace; pruning
+# takes an exclusive one, so it never removes a workspace in use
+SCRATCH_LOCK_NAME = ".in_use"
+
+def _lock_workspace(work_dir, exclusive=False, blocking=True):
+    """Opens and flocks work_dir's lock file; returns it, or None if the workspace is gone or (non-blocking) in use."""
+    import fcntl
+    try:
+        lock = open(os.path.join(work_dir, SCRATCH_LOCK_NAME), "a")
+    except FileNotFoundError:
+        return None
+    try:
+        fcntl.flock(lock, (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | (0 if blocking else fcntl.LOCK_NB))
+    except BlockingIOError:
+        lock.close()
+        return None
+    return lock
+
+@contextlib.contextmanager
+def scratch_workspace(scratch_dir, output_dir):
+    """Creates the scratch workspace for an output directory (the same one on every resume) and holds it.
+
+    Yields the workspace path; while the block runs, prune_scratch in this
+    or any other process leaves the workspace alone.
+    """
+    output_dir = os.path.abspath(output_dir)
+    name = f"{SCRATCH_PREFIX}{os.path.basename(output_dir)}-{hash_bytes(output_dir.encode('utf-8'))[:10]}"
+    work_dir = os.path.join(scratch_dir, name)
+    while True:
+        os.makedirs(work_dir, exist_ok=True)
+        lock = _lock_workspace(work_dir)
+        if lock is None:
             continue
+        # A prune holding the exclusive lock may have removed the workspace while we waited
+        try:
+            if os.path.samestat(os.fstat(lock.fileno()), os.stat(lock.name)):
+                break
+        except FileNotFoundError:
+            pass
+        lock.close()
+    try:
+        os.utime(work_dir)  # retention ages workspaces from their last use
+        yield work_dir
+    finally:
+        lock.close()
+
+def directory_size(path):
+    """Returns the total size in bytes of the files under path."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for file_name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, file_name))
+            except OSError:
+                pass
+    return total
+
+def prune_scratch(scratch_dir, max_bytes=None, max_age_seconds=None, keep=()):
+    """Applies the retention policy to the workspaces under scratch_dir; returns the removed paths.
+
+    Workspaces unused for longer than max_age_seconds are removed, then
+    the least recently used ones until the rest fit in max_bytes. Those
+    listed in keep, and those a render holds (see scratch_workspace), are
+    never removed.
+    """
+    if not os.path.isdir(scratch_dir):
+        return []
+    keep = {os.path.abspath(path) for path in keep}
+    workspaces = []
+    for entry in os.scandir(scratch_dir):
+        if entry.name.startswith(SCRATCH_PREFIX) and entry.is_dir(follow_symlinks=False):
+            workspaces.append((entry.stat().st_mtime, os.path.abspath(entry.path), directory_size(entry.path)))
+    workspaces.sort()
+
+    now = time.time()
+    total = sum(size for _, _, size in workspaces)
+    removed = []
+    for mtime, path, size in workspaces:
+        if path in keep:
+            continue
+        expired = max_age_seconds is not None and now - mtime > max_age_seconds
+        over_budget = max_bytes is not None and total > max_bytes
+        if not (expired or over_budget):
+            continue
+        lock = _lock_workspace(path, exclusive=True, blocking=False)
+        if lock is None:
+            continue
+        with lock:
+            shutil.rmtree(path, ignore_errors=True)
+        total -= size
+        removed.append(path)
+        print(f"   🧹 Removed scratch workspace {os.path.basename(path)} ({size / 1e6:.1f} MB, "
+              f"{'expired' if expired else 'over size limit'})")
+    return removed
+
+def publish_deliverables(manifest, work_dir, output_dir):
+    """Links or copies deliverable stage outputs from the workspace into output_dir; returns their paths."""
+    published = []
+    if os.path.abspath(work_dir) == os.path.abspath(output_dir):
+        return published
+    with _manifest_lock:
+        stages = list(manifest['stages'].items())
+    for name, entry in stages:
+        deliverable = stage_base(name) in DELIVERABLE_STAGES
+        for rel_path in entry['outputs']:
+            if deliverable or os.path.basename(rel_path) == CONTACT_SHEET_NAME:
+                src, dst = os.path.join(work_dir, rel_path), os.path.join(output_dir, rel_path)
+                if os.path.exists(src):
+                    os.makedirs(os.path.dirname(dst), exist_ok=True)
+                    _link_or_copy(src, dst)
+                    published.append(dst)
+    return published
+
+def stage_bytes(manifest):
+    """Returns {stage: (bytes written, file count)} from the manifest, per-language/rendition stages combined."""
+    totals = {}
+    with _manifest_lock:
+        stages = list(manifest['stages'].items())
+    for name, entry in stages:
+        written, count = totals.get(stage_base(name), (0, 0))
+        totals[stage_base(name)] = (written + sum(info['size'] for info in entry['outputs'].values()),
+                                    count + len(entry['outputs']))
+    return totals
+
+def print_stage_bytes(totals):
+    """Prints how much each stage wrote."""
+    print("💾 Bytes written per stage:")
+    for name, (written, count) in sorted(totals.items(), key=lambda item: -item[1][0]):
+        print(f"   {name:<18} {written / 1e6:9.2f} MB in {count} files")
+    print(f"   {'total':<18} {sum(written for written, _ in totals.values()) / 1e6:9.2f} MB")
+
+def build_pipeline_stages(args, output_dir, manifest, publish_dir=None):
+    """Returns the stage callables for one paper, keyed by STAGE_GRAPH node.
+
+    Each callable reads its upstream results from the shared `results` dict
+    (filled in by the scheduler) and goes through run_stage, so finished
+    stages are reused on --resume. When output_dir is a scratch workspace,
+    publish_dir is the output directory that HLS encodes publish to while
+    they run.
+    """
+    results = {}
+    languages = parse_languages(args.language)
+    primary = languages[0]
+    renditions = parse_renditions(getattr(args, 'renditions', None) or DEFAULT_RENDITION)
+    draft = getattr(args, 'draft', False)
+    estimate_audio = getattr(args, 'estimate_audio', False)
+    contact_sheet = draft or getattr(args, 'contact_sheet', False)
+    output_format = getattr(args, 'output_format', None) or 'mp4'
+    summary_format = getattr(args, 'summary_format', None) or 'markdown'
+
+    def artifact(name):
+        return os.path.join(output_dir, name)
+
+    # Fetch: a URL is downloaded into the run directory, a local file is
+    # used in place and keyed by its content hash.
+    is_url = args.paper_location.startswith('http')
+
+    def stage_fetch():
+        if is_url:
+            fetch_inputs = {'location': args.paper_location}
+        else:
+            fetch_inputs = {'location': args.paper_location, 'sha256': hash_file(args.paper_location)}
 
-        section_slide_indices = section_slides[section_idx]
-        num_slides = len(section_slide_indices)
-        slide_duration = audio_duration / num_slides
+        def fetch():
+            if is_url:
+                print("📥 Downloading paper...")
+                fetch_paper(args.paper_location, artifact("paper.pdf"), cache_dir=args.pdf_cache)
+                return {'pdf': "paper.pdf"}, [artifact("paper.pdf")]
+            print("📄 Reading local paper...")
+            return {'pdf': os.path.abspath(args.paper_location)}, []
 
-        print(f"   Section {section_idx}: {num_slides} slides, {slide_duration:.1f}s each")
+        fetched = run_stage(manifest, output_dir, 'fetch', fetch_inputs, fetch)
+        return {
+            'path': artifact(fetched['pdf']) if is_url else fetched['pdf'],
+            'digest': stage_digest(manifest, 'fetch') if is_url else fetch_inputs['sha256'],
+        }
 
-        for slide_idx in section_slide_indices:
-            clip = ImageClip(slides[slide_idx], duration=slide_duration)
-            clips.append(clip)
+    def stage_extract():
+        def extract():
+            print("📝 Extracting text...")
+            text = extract_text_from_pdf(results['fetch']['path'])
+            with open(artifact("paper_text.txt"), "w", encoding='utf-8') as f:
+                f.write(text)
+            return {'chars': len(text)}, [artifact("paper_text.txt")]
+
+        extracted = run_stage(manifest, output_dir, 'extract', {'pdf': results['fetch']['digest']}, extract)
+        print(f"   Extracted {extracted['chars']} characters")
+        return extracted
+
+    def stage_figures():
+        def figures():
+            print("🖼️  Extracting figures...")
+            paths = extract_images_from_pdf(results['fetch']['path'], output_dir, max_images=5)
+            return [os.path.basename(path) for path in paths], paths
+
+        figure_inputs = {'pdf': results['fetch']['digest'], 'max_images': 5}
+        figure_names = run_stage(manifest, output_dir, 'figures', figure_inputs, figures)
+        print(f"   Extracted {len(figure_names)} figures")
+        return [artifact(name) for name in figure_names]
+
+    def stage_summarize():
+        def summarize():
+            print(f"🤖 Generating {primary.upper()} summary using {args.summarizer}...")
+            with open(artifact("paper_text.txt"), "r", encoding='utf-8') as f:
+                paper_text = f.read()
+            if summary_format != 'json':
+                raw_summary = summarize_text(paper_text, method=args.summarizer, language=primary)
+                with open(artifact("summary_raw.txt"), "w", encoding='utf-8') as f:
+                    f.write(raw_summary)
+                return None, [artifact("summary_raw.txt")]
+
+            summary, problems = summarize_structured(paper_text, method=args.summarizer, language=primary)
+            if not summary:
+                raise Exception(f"Summary has no usable sections ({', '.join(problems.values())})")
+            if problems:
+                print(f"   ⚠️  Leaving out {', '.join(f'{field} ({problem})' for field, problem in problems.items())}")
+            with open(artifact("summary.json"), "w", encoding='utf-8') as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+            with open(artifact("summary_raw.txt"), "w", encoding='utf-8') as f:
+                f.write(structured_summary_markdown(summary, primary))
+            return None, [artifact("summary_raw.txt"), artifact("summary.json")]
+
+        summarize_inputs = {
+            'text': stage_digest(manifest, 'extract'),
+            'summarizer': args.summarizer,
+            'language': primary,
+        }
+        if summary_format == 'json':
+            summarize_inputs['format'] = {'name': summary_format, 'fields': SUMMARY_FIELDS,
+                                          'repair_attempts': SUMMARY_REPAIR_ATTEMPTS}
+        if args.summarizer == "manual" and os.path.exists("summary.txt"):
+            summarize_inputs['manual_summary'] = hash_file("summary.txt")
+        return run_stage(manifest, output_dir, 'summarize', summarize_inputs, summarize)
+
+    def stage_parse():
+        def parse():
+            print("🧹 Cleaning and parsing...")
+            with open(artifact("summary_raw.txt"), "r", encoding='utf-8') as f:
+                raw_summary = f.read()
+            return normalize_summary(raw_summary, primary), []
+
+        parse_inputs = {'summary': stage_digest(manifest, 'summarize'), 'text_rules': TEXT_RULES_VERSION}
+        sections = run_stage(manifest, output_dir, 'parse', parse_inputs, parse)
+        print(f"   Parsed {len(sections)} sections")
+        return sections
 
-        audio_clip = AudioFileClip(audio_path).with_start(current_time)
-        audio_clips.append(audio_clip)
-        current_time += audio_duration
+    def add_language_stages(language):
+        # With several languages each one renders into its own subdirectory
+        # under per-language stage names; a single language keeps the flat
+        # layout and plain stage names.
+        multi = len(languages) > 1
+        lang_dir = os.path.join(output_dir, language) if multi else output_dir
+        os.makedirs(lang_dir, exist_ok=True)
 
-    video = concatenate_videoclips(clips, method="compose")
-    final_audio = CompositeAudioClip(audio_clips)
+        def name(base):
+            return stage_name(base, language, languages)
 
-    if video.duration < final_audio.duration:
-        extension = final_audio.duration - video.duration
-        last_clip = ImageClip(slides[-1], duration=clips[-1].duration + extension)
-        clips[-1] = last_clip
-        video = concatenate_videoclips(clips, method="compose")
-    elif video.duration > final_audio.duration:
-        video = video.subclipped(0, final_audio.duration)
+        def lang_artifact(file_name):
+            return os.path.join(lang_dir, file_name)
 
-    video = video.with_audio(final_audio)
-    video.write_videofile(output_path, fps=24, codec='libx264', audio_codec='aac',
-                         threads=4, preset='medium')
+        if language == primary:
+            sections_stage = 'parse'
+        else:
+            sections_stage = name('localize')
+
+            def stage_localize():
+                def localize():
+                    print(f"🌐 Localizing summary into {language.upper()}...")
+                    translated = translate_summary(results['parse'], language, method=args.summarizer)
+                    with open(lang_artifact("summary_raw.txt"), "w", encoding='utf-8') as f:
+                        f.write(translated)
+                    sections = normalize_summary(translated, language)
+                    if len(sections) != len(results['parse']):
+                        print(f"   ⚠️  {language.upper()} summary has {len(sections)} sections, "
+                              f"{primary.upper()} has {len(results['parse'])}")
+                    return sections, [lang_artifact("summary_raw.txt")]
+
+                localize_inputs = {
+                    'summary': stage_digest(manifest, 'parse'),
+                    'summarizer': args.summarizer,
+                    'language': language,
+                }
+                if args.summarizer == "manual" and os.path.exists(f"summary_{language}.txt"):
+                    localize_inputs['manual_summary'] = hash_file(f"summary_{language}.txt")
+                return run_stage(manifest, output_dir, sections_stage, localize_inputs, localize)
+
+            stages[sections_stage] = stage_localize
+
+        def stage_tts():
+            sections = results[sections_stage]
+            if estimate_audio:
+                # Silent sections timed from text length; nothing to cache
+                print(f"⏱️  Estimating {language.upper()} narration timing from text length (no TTS)...")
+                return [(None, estimate_section_duration(section, language)) for section in sections]
+            print(f"🎤 Generating {language.upper()} voiceover using {args.voice_engine}...")
+            if args.voice_sample:
+                print(f"   Voice sample: {args.voice_sample}")
+            voice_sample_digest = None
+            if args.voice_sample and os.path.exists(args.voice_sample):
+                voice_sample_digest = hash_file(args.voice_sample)
+
+            coqui_batch = args.voice_engine == "coqui" and get_coqui_options()['batch']
+            section_inputs = []
+            for section in sections:
+                tts_inputs = {
+                    'section': section,
+                    'voice_engine': args.voice_engine,
+                    'voice_sample': voice_sample_digest,
+                    'language': language,
+                }
+                if args.voice_engine == "coqui" and get_coqui_options()['precision'] != 'fp32':
+                    tts_inputs['coqui_precision'] = get_coqui_options()['precision']
+                tts_inputs['chunking'] = [TTS_CHUNK_CHARS.get(language, 250), SENTENCE_PAUSE_MS]
+                tts_inputs['text_rules'] = TEXT_RULES_VERSION
+                section_inputs.append(tts_inputs)
+
+            # Batched Coqui synthesizes every section that is not cached in
+            # one pass; anything it cannot do falls back to the per-section path.
+            batched = {}
+            if coqui_batch:
+                missing = [idx for idx in range(len(sections))
+                           if not stage_is_current(manifest, output_dir, f"{name('tts')}_{idx:02d}", section_inputs[idx])]
+                if missing:
+                    paths = [lang_artifact(f"audio_section_{idx:02d}.mp3") for idx in missing]
+                    try:
+                        durations = synthesize_sections_coqui(
+                            [section_speech_text(sections[idx], language) for idx in missing], paths,
+                            speaker_wav=args.voice_sample, language=language)
+                        batched = {idx: (path, duration) for idx, path, duration in zip(missing, paths, durations)}
+                    except Exception as e:
+                        print(f"   ⚠️  Batched Coqui synthesis failed ({e}); synthesizing section by section")
+
+            section_audio_files = []
+            produced_by = []
+            for idx, section in enumerate(sections):
+                def tts(idx=idx, section=section):
+                    stats = {'engine': "coqui", 'batched': True}
+                    if idx in batched:
+                        audio_path, duration = batched[idx]
+                    else:
+                        stats = {}
+                        audio_path, duration = text_to_speech_section(
+                            section, idx, lang_dir,
+                            voice_engine=args.voice_engine,
+                            voice_sample=args.voice_sample,
+                            language=language,
+                            stats=stats
+                        )
+                    return {'audio': os.path.basename(audio_path), 'duration': duration, **stats}, [audio_path]
+
+                audio = run_stage(manifest, output_dir, f"{name('tts')}_{idx:02d}", section_inputs[idx], tts)
+                section_audio_files.append((lang_artifact(audio['audio']), audio['duration']))
+                produced_by.append(audio.get('engine', args.voice_engine))
+            if any(engine != args.voice_engine for engine in produced_by):
+                print(f"   ⚠️  {language.upper()} sections by engine: "
+                      + ", ".join(f"{idx}: {engine}" for idx, engine in enumerate(produced_by)))
+            return section_audio_files
+
+        def add_rendition_stages(rendition):
+            # Several renditions render into per-rendition subdirectories of
+            # the language directory; TTS output is shared between them.
+            multi_rendition = len(renditions) > 1
+            rendition_dir = os.path.join(lang_dir, rendition) if multi_rendition else lang_dir
+            os.makedirs(rendition_dir, exist_ok=True)
+            size = rendition_size(rendition, draft=draft)
+
+            def rname(base):
+                return stage_name(base, language, languages, rendition, renditions)
+
+            def rendition_artifact(file_name):
+                return os.path.join(rendition_dir, file_name)
+
+            def stage_slides():
+                sections = results[sections_stage]
+                figures = results['figures']
+
+                def slides():
+                    print(f"🎨 Creating {language.upper()} slides ({rendition}, {size[0]}x{size[1]})...")
+                    if args.avatar_image:
+                        print(f"   Avatar: {args.avatar_image}")
+                    slide_paths, slide_to_section = create_slides_with_avatar(
+                        sections, rendition_dir,
+                        figures=figures,
+                        avatar_image=args.avatar_image,
+                        language=language,
+                        size=size
+                    )
+                    result = {
+                        'slides': [os.path.basename(path) for path in slide_paths],
+                        'slide_to_section': slide_to_section,
+                        'contact_sheet': None,
+                    }
+                    if contact_sheet and slide_paths:
+                        sheet_path = create_contact_sheet(slide_paths, slide_to_section,
+                                                          rendition_artifact(CONTACT_SHEET_NAME))
+                        result['contact_sheet'] = CONTACT_SHEET_NAME
+                        return result, slide_paths + [sheet_path]
+                    return result, slide_paths
+
+                avatar_digest = None
+                if args.avatar_image and os.path.exists(args.avatar_image):
+                    avatar_digest = hash_file(args.avatar_image)
+                slides_inputs = {
+                    'sections': sections,
+                    'figures': stage_digest(manifest, 'figures'),
+                    'avatar': avatar_digest,
+                    'language': language,
+                    'size': list(size),
+                    'text_rules': TEXT_RULES_VERSION,
+                    'layout': SLIDE_LAYOUT_VERSION,
+                }
+                if contact_sheet:
+                    slides_inputs['contact_sheet'] = True
+                slide_result = run_stage(manifest, output_dir, rname('slides'), slides_inputs, slides)
+                print(f"   Created {len(slide_result['slides'])} {language.upper()} slides ({rendition})")
+                sheet = slide_result.get('contact_sheet')
+                return ([rendition_artifact(file_name) for file_name in slide_result['slides']],
+                        slide_result['slide_to_section'],
+                        rendition_artifact(sheet) if sheet else None)
+
+            def stage_encode():
+                slides, slide_to_section, _ = results[rname('slides')]
+                section_audio_files = results[name('tts')]
+
+                def encode():
+                    if output_format == 'hls':
+                        print(f"📡 Streaming {language.upper()} video ({rendition}) as HLS segments...")
+                        hls_dir = rendition_artifact(HLS_DIR_NAME)
+                        playlist_path, segment_paths = create_hls_stream(
+                            slides, slide_to_section, section_audio_files, hls_dir,
+                            fps=DRAFT_FPS if draft else 24,
+                            preset=DRAFT_PRESET if draft else 'medium',
+                            publish_dir=os.path.join(publish_dir, os.path.relpath(hls_dir, output_dir))
+                            if publish_dir else None)
+                        return os.path.relpath(playlist_path, rendition_dir), segment_paths + [playlist_path]
+                    if draft:
+                        print(f"🎬 Compiling {language.upper()} draft ({rendition}, {DRAFT_FPS} fps)...")
+                        video_path = create_video(slides, slide_to_section, section_audio_files, rendition_dir,
+                                                  output_file=DRAFT_VIDEO_NAME, fps=DRAFT_FPS, preset=DRAFT_PRESET)
+                    else:
+                        print(f"🎬 Compiling {language.upper()} video ({rendition})...")
+                        video_path = create_video(slides, slide_to_section, section_audio_files, rendition_dir)
+                    return os.path.basename(video_path), [video_path]
+
+                if estimate_audio:
+                    audio_inputs = [duration for _, duration in section_audio_files]
+                else:
+                    audio_inputs = [stage_digest(manifest, f"{name('tts')}_{idx:02d}")
+                                    for idx in range(len(section_audio_files))]
+                encode_inputs = {
+                    'slides': stage_digest(manifest, rname('slides')),
+                    'audio': audio_inputs,
+                }
+                if draft:
+                    encode_inputs['draft'] = {'fps': DRAFT_FPS, 'preset': DRAFT_PRESET}
+                if output_format != 'mp4':
+                    encode_inputs['format'] = {'name': output_format, 'segment_seconds': HLS_SEGMENT_SECONDS}
+                return rendition_artifact(run_stage(manifest, output_dir, rname('encode'), encode_inputs, encode))
+
+            stages[rname('slides')] = stage_slides
+            stages[rname('encode')] = stage_encode
+
+        stages[name('tts')] = stage_tts
+        for rendition in renditions:
+            add_rendition_stages(rendition)
+
+    stages = {
+        'fetch': stage_fetch,
+        'extract': stage_extract,
+        'figures': stage_figures,
+        'summarize': stage_summarize,
+        'parse': stage_parse,
+    }
+    for language in languages:
+        add_language_stages(language)
+    return stages, results, pipeline_stage_graph(languages, renditions)
+
+def pipeline_stage_graph(languages, renditions=(DEFAULT_RENDITION,)):
+    """Returns the stage dependency graph for one or more languages and renditions.
+
+    The first language is summarized from the paper; the others are
+    localized from its parsed summary, and every language gets its own
+    TTS stage sharing the same fetch/extract/figures. Each rendition of a
+    language then has its own slides and encode stages over that audio.
+    """
+    if len(languages) == 1 and len(renditions) == 1:
+        return dict(STAGE_GRAPH)
+    graph = {name: deps for name, deps in STAGE_GRAPH.items() if name not in PER_LANGUAGE_STAGES}
+    for language in languages:
+        sections_stage = 'parse'
+        if language != languages[0]:
+            sections_stage = stage_name('localize', language, languages)
+            graph[sections_stage] = ['parse']
+        tts_stage = stage_name('tts', language, languages)
+        graph[tts_stage] = [sections_stage]
+        for rendition in renditions:
+            slides_stage = stage_name('slides', language, languages, rendition, renditions)
+            graph[slides_stage] = [sections_stage, 'figures']
+            graph[stage_name('encode', language, languages, rendition, renditions)] = [tts_stage, slides_stage]
+    return graph
+
+def stage_name(base, language, languages, rendition=None, renditions=()):
+    """Returns a stage's name, qualified by language and rendition only when there are several."""
+    if len(languages) > 1:
+        base = f"{base}:{language}"
+    if rendition and len(renditions) > 1:
+        base = f"{base}:{rendition}"
+    return base
 
-    return output_path
+def parse_stage_selection(value):
+    """Splits a stage selection ("extract+summarize", "tts,slides" or a list) into known stage names."""
+    names = value if not isinstance(value, str) else [name.strip() for name in re.split(r'[+,]', value)]
+    names = [name for name in names if name]
+    unknown = [name for name in names if name not in STAGE_KINDS]
+    if unknown or not names:
+        raise ValueError(f"Unknown stage {', '.join(unknown) or repr(value)} (choose from {', '.join(STAGE_KINDS)})")
+    return names
+
+def select_stages(graph, targets):
+    """Returns the graph nodes needed to run the target stages: every node whose
+    base name is a target, plus everything upstream of those."""
+    needed = set()
+    pending = [name for name in graph if stage_base(name) in targets]
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(graph.get(name, []))
+    return needed
+
+def stage_base(name):
+    """Strips the language and rendition suffixes from a stage name ('slides:ko:1080p' -> 'slides')."""
+    return name.split(':', 1)[0]
+
+# Process-wide caps on concurrently running stages, shared by every render in
+# the process (e.g. one CPU-bound TTS at a time in a long-running service).
+_stage_limits = {}
+_stage_limit_counts = {}
+# Stages that count against another stage's cap: localize is an LLM call like summarize
+STAGE_LIMIT_GROUPS = {'localize': 'summarize'}
+
+def set_stage_limits(limits):
+    """Caps how many instances of each stage may run at once, e.g. {'tts': 1, 'slides': 2}.
+
+    Stages in STAGE_LIMIT_GROUPS share the cap (and the slots) of the stage they map to.
+    """
+    global _stage_limits, _stage_limit_counts
+    _stage_limit_counts = {name: count for name, count in limits.items() if count}
+    _stage_limits = {name: threading.BoundedSemaphore(count) for name, count in _stage_limit_counts.items()}
+
+def get_stage_limits():
+    """Returns the current per-stage concurrency caps."""
+    return dict(_stage_limit_counts)
+
+class RenderCancelled(Exception):
+    """Raised in place of the remaining stages once a render's cancel event is set."""
+
+
+def _run_timed(name, func, timing, t0, cancel=None):
+    """Runs a stage callable, recording its start/end offsets from t0."""
+    base = stage_base(name)
+    limit = _stage_limits.get(STAGE_LIMIT_GROUPS.get(base, base))
+    if limit:
+        limit.acquire()
+    try:
+        if cancel is not None and cancel.is_set():
+            raise RenderCancelled(f"Render cancelled before stage {name}")
+        timing['start'] = time.perf_counter() - t0
+        try:
+            with trace_span(name, 'stage'):
+                return func()
+        finally:
+            timing['end'] = time.perf_counter() - t0
+    finally:
+        if limit:
+            limit.release()
+
+def run_stage_graph(stages, results=None, graph=STAGE_GRAPH, io_workers=4, cpu_workers=2, cancel=None):
+    """Runs stage callables concurrently as soon as their dependencies finish.
+
+    I/O-bound stages (network, LLM, TTS) and CPU-bound stages (PDF parsing,
+    rasterisation, encoding) are bounded by separate pools, so figure
+    extraction overlaps the summarizer and slide rendering overlaps TTS.
+    Returns (results, timings); timings holds per-stage ready/start/end
+    offsets in seconds from the start of the run. Once cancel (a
+    threading.Event) is set no further stage starts, and RenderCancelled is
+    raised after the running ones finish.
+    """
+    results = {} if results is None else results
+    timings = {}
+    pools = {
+        'io': concurrent.futures.ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix='stage-io'),
+        'cpu': concurrent.futures.ThreadPoolExecutor(max_workers=cpu_workers, thread_name_prefix='stage-cpu'),
+    }
+    pending = {name: {dep for dep in graph.get(name, []) if dep in stages} for name in stages}
+    running = {}
+    t0 = time.perf_counter()
 
+    try:
+        while pending or running:
+            for name in [name for name, deps in pending.items() if not deps]:
+                del pending[name]
+                timings[name] = {'ready': time.perf_counter() - t0}
+                pool = pools[STAGE_KINDS.get(stage_base(name), 'cpu')]
+                running[pool.submit(_run_timed, name, stages[name], timings[name], t0, cancel)] = name
+            if not running:
+                raise RuntimeError(f"Unsatisfiable stage dependencies: {sorted(pending)}")
+
+            done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+                for deps in pending.values():
+                    deps.discard(name)
+    finally:
+        for pool in pools.values():
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    return results, timings
+
+def print_stage_report(timings):
+    """Prints when each stage became ready, how long it queued and how long it ran."""
+    print("⏱️  Stage timings (ready → queued → ran):")
+    for name, timing in sorted(timings.items(), key=lambda item: item[1]['ready']):
+        if 'end' not in timing:
+            continue
+        queued = timing['start'] - timing['ready']
+        ran = timing['end'] - timing['start']
+        print(f"   {name:<18} ready at {timing['ready']:6.1f}s  waited {queued:5.1f}s  ran {ran:6.1f}s")
+    finished = [timing['end'] for timing in timings.values() if 'end' in timing]
+    busy = sum(timing['end'] - timing['start'] for timing in timings.values() if 'end' in timing)
+    if finished:
+        print(f"   Wall clock {max(finished):.1f}s vs {busy:.1f}s of sequential stage time")
+
+class Pipeline:
+    """Reusable, in-process paper-to-video renderer.
+
+    Configure once, then call render() for as many papers as needed. The
+    Coqui model, fonts, avatar and slide background templates are loaded
+    up front and stay warm between renders.
+
+        pipeline = Pipeline(summarizer="ollama", voice_engine="coqui", language="ko")
+        artifacts = pipeline.render("paper.pdf")
+        artifacts['video_path'], artifacts['timeline']
+        shutil.rmtree(artifacts['output_dir'])  # the caller owns the output directory
+
+    language may list several codes ("en,ko" or ['en', 'ko']); the first is
+    summarized from the paper and the rest are localized from that summary.
+    renditions likewise lists RENDITIONS names ("720p,vertical"); they share
+    each language's audio. Per-language artifacts are under
+    artifacts['languages'] (with per-rendition slides and videos under
+    'renditions'), and the top-level keys describe the first language and
+    rendition.
+
+    draft=True renders quick previews (DRAFT_SCALE resolution, DRAFT_FPS,
+    DRAFT_PRESET) with a contact sheet; estimate_audio=True skips TTS and
+    times silent sections from their text length instead.
+    output_format='hls' writes an HLS playlist with fragmented-MP4 segments
+    instead of an MP4; 'video_path' is then the playlist.
+    summary_format='json' asks the summarizer for a JSON object with a field
+    per section, validates each field and regenerates only the bad ones
+    (see summarize_structured); summary.json is written alongside the
+    markdown summary.
+    stages limits each render to those stages and their upstream
+    dependencies (e.g. "extract+summarize"); artifacts then only hold what
+    those stages produced.
+    scratch_dir moves intermediates into a per-output workspace there (see
+    scratch_workspace); output_dir then only receives the summaries,
+    videos, contact sheets and manifest. Workspaces beyond scratch_max_gb
+    in total or unused for scratch_max_age_hours are removed.
+    """
+
+    def __init__(self, summarizer="ollama", voice_engine="gtts", voice_sample=None, avatar_image=None,
+                 language="en", renditions=DEFAULT_RENDITION, draft=False, estimate_audio=False,
+                 contact_sheet=False, output_format="mp4", summary_format="markdown", stages=None, work_dir=None,
+                 pdf_cache=None, io_workers=4, cpu_workers=2, scratch_dir=SCRATCH_DIR, scratch_max_gb=None,
+                 scratch_max_age_hours=None):
+        if not isinstance(language, str):
+            language = ",".join(language)
+        if not isinstance(renditions, str):
+            renditions = ",".join(renditions)
+        self.languages = parse_languages(language)
+        self.renditions = parse_renditions(renditions)
+        self.options = argparse.Namespace(
+            summarizer=summarizer,
+            voice_engine=voice_engine,
+            voice_sample=voice_sample,
+            avatar_image=avatar_image,
+            language=",".join(self.languages),
+            renditions=",".join(self.renditions),
+            draft=draft,
+            estimate_audio=estimate_audio,
+            contact_sheet=contact_sheet,
+            output_format=output_format,
+            summary_format=summary_format,
+            pdf_cache=pdf_cache,
+        )
+        self.stages = parse_stage_selection(stages) if stages else None
+        self.work_dir = work_dir
+        self.scratch_dir = scratch_dir
+        self.scratch_max_bytes = scratch_max_gb * 1e9 if scratch_max_gb is not None else None
+        self.scratch_max_age = scratch_max_age_hours * 3600 if scratch_max_age_hours is not None else None
+        self.io_workers = io_workers
+        self.cpu_workers = cpu_workers
+        self.warm_up()
+
+    def warm_up(self):
+        """Loads fonts, templates, the avatar and (for Coqui) the voice model, for the selected stages."""
+        if self.stages and 'slides' not in self.stages and 'encode' not in self.stages:
+            renditions = []
+        else:
+            renditions = self.renditions
+        for rendition in renditions:
+            width, height = rendition_size(rendition, draft=self.options.draft)
+            layout = slide_layout((width, height))
+            for language in self.languages:
+                for size in layout['font_sizes']:
+                    get_font_for_language(language, size)
+            create_gradient_background(width, height, '#1e3a5f', '#2c5282')
+            create_gradient_background(width, height, '#f8fafc', '#e2e8f0')
+            if self.options.avatar_image and os.path.exists(self.options.avatar_image):
+                load_avatar(self.options.avatar_image, size=layout['avatar_size'])
+        if self.options.voice_engine == "coqui" and (not self.stages or {'tts', 'encode'} & set(self.stages)):
+            try:
+                get_coqui_model()
+            except ImportError:
+                print("⚠️  Coqui TTS not installed; sections will fall back to gTTS")
+
+    def render(self, pdf_source, output_dir=None, return_bytes=False, cancel=None):
+        """Renders one paper and returns its artifacts.
+
+        pdf_source is a URL, a local path or the PDF bytes. Intermediates go
+        to output_dir, or to its scratch workspace when scratch_dir is set;
+        an existing manifest there is honoured, so re-rendering is
+        incremental. Without output_dir a fresh directory is created under
+        work_dir (or the system temp directory); it is returned as
+        artifacts['output_dir'] and, like any output_dir, belongs to the
+        caller, who removes it once done with the results. Setting cancel (a
+        threading.Event) stops the render between stages with
+        RenderCancelled, and nothing more is published to output_dir.
+        """
+        if output_dir is None:
+            if self.work_dir:
+                os.makedirs(self.work_dir, exist_ok=True)
+            output_dir = tempfile.mkdtemp(prefix="paper_", dir=self.work_dir)
+        os.makedirs(output_dir, exist_ok=True)
+        stage_dir = output_dir
+        in_use = contextlib.ExitStack()
+        if self.scratch_dir:
+            os.makedirs(self.scratch_dir, exist_ok=True)
+            stage_dir = in_use.enter_context(scratch_workspace(self.scratch_dir, output_dir))
+        with in_use:
+            return self._render(pdf_source, output_dir, stage_dir, return_bytes, cancel)
+
+    def _render(self, pdf_source, output_dir, stage_dir, return_bytes, cancel):
+        if stage_dir != output_dir:
+            prune_scratch(self.scratch_dir, self.scratch_max_bytes, self.scratch_max_age, keep=[stage_dir])
+        if isinstance(pdf_source, (bytes, bytearray, memoryview)):
+            input_path = os.path.join(stage_dir, "input.pdf")
+            with open(input_path, "wb") as f:
+                f.write(pdf_source)
+            pdf_source = input_path
+
+        args = argparse.Namespace(paper_location=os.fspath(pdf_source), **vars(self.options))
+        manifest = load_manifest(stage_dir)
+        manifest['options'] = {key: getattr(args, key) for key in RESUMABLE_OPTIONS}
+        stages, results, graph = build_pipeline_stages(args, stage_dir, manifest,
+                                                       publish_dir=output_dir if stage_dir != output_dir else None)
+        if self.stages:
+            needed = select_stages(graph, self.stages)
+            stages = {name: stage for name, stage in stages.items() if name in needed}
+        try:
+            results, timings = run_stage_graph(stages, results, graph=graph, io_workers=self.io_workers,
+                                               cpu_workers=self.cpu_workers, cancel=cancel)
+        finally:
+            if stage_dir != output_dir and not (cancel is not None and cancel.is_set()):
+                # Published even after a failure, so --resume OUTPUT_DIR finds the options and workspace
+                publish_deliverables(manifest, stage_dir, output_dir)
+                with _manifest_lock:
+                    save_manifest(output_dir, {**manifest, 'workspace': stage_dir})
+                prune_scratch(self.scratch_dir, self.scratch_max_bytes, self.scratch_max_age, keep=[stage_dir])
+
+        def published(path):
+            # Deliverable paths as they are in output_dir
+            return os.path.join(output_dir, os.path.relpath(path, stage_dir)) if path else path
+
+        # With a stage selection only the artifacts of the stages that ran are present
+        per_language = {}
+        for language in self.languages:
+            def name(base, rendition=None):
+                return stage_name(base, language, self.languages, rendition, self.renditions)
+
+            rendered = {}
+            sections_stage = 'parse' if language == self.languages[0] else name('localize')
+            if sections_stage in results:
+                rendered['sections'] = results[sections_stage]
+            if name('tts') in results:
+                audio = results[name('tts')]
+                timeline = []
+                start = 0.0
+                for idx, (audio_path, duration) in enumerate(audio):
+                    timeline.append({'section': idx, 'audio': audio_path, 'start': start, 'duration': duration})
+                    start += duration
+                rendered['audio'] = audio
+                rendered['timeline'] = timeline
+            per_rendition = {}
+            for rendition in self.renditions:
+                if name('slides', rendition) not in results:
+                    continue
+                slides, slide_to_section, sheet = results[name('slides', rendition)]
+                per_rendition[rendition] = {
+                    'slides': slides,
+                    'slide_to_section': slide_to_section,
+                    'contact_sheet': published(sheet),
+                }
+                if name('encode', rendition) in results:
+                    per_rendition[rendition]['video_path'] = published(results[name('encode', rendition)])
+                    if return_bytes:
+                        with open(per_rendition[rendition]['video_path'], "rb") as f:
+                            per_rendition[rendition]['video_bytes'] = f.read()
+            rendered['renditions'] = per_rendition
+            rendered.update(per_rendition.get(self.renditions[0], {}))
+            per_language[language] = rendered
+
+        artifacts = {
+            'output_dir': output_dir,
+            'work_dir': stage_dir,
+            'figures': results.get('figures', []),
+            'timings': timings,
+            'stage_bytes': stage_bytes(manifest),
+            'languages': per_language,
+            **per_language[self.languages[0]],
+        }
+        if 'summarize' in results:
+            artifacts['summary_path'] = os.path.join(output_dir, "summary_raw.txt")
+        return artifacts
+
+# Per-job Pipeline options with their defaults, shared by the render daemon and the worker queue
+JOB_DEFAULTS = {
+    name: inspect.signature(Pipeline).parameters[name].default
+    for name in RESUMABLE_OPTIONS if name != 'paper_location'
+}
 
 def main():
     parser = argparse.ArgumentParser(description="Generate multilingual academic paper videos.")
-    parser.add_argument("--paper-location", required=True, help="PDF URL or path")
+    parser.add_argument("--paper-location", default=None, help="PDF URL or path")
     parser.add_argument("--summarizer", default="ollama", choices=["gemini", "ollama", "manual"])
     parser.add_argument("--voice-engine", default="gtts", choices=["gtts", "coqui", "elevenlabs"])
     parser.add_argument("--voice-sample", default=None, help="Path to voice sample WAV")
+    parser.add_argument("--coqui-precision", default="fp32", choices=COQUI_PRECISIONS,
+                       help="Coqui CPU inference: fp32, or int8 dynamic quantization of the linear layers; "
+                            "compare real-time factors with paper_to_video_bench.py --coqui-rtf")
+    parser.add_argument("--coqui-threads", type=int, default=None,
+                       help="Torch intra-op threads for Coqui (default: torch's choice, usually all cores)")
+    parser.add_argument("--coqui-batch", action="store_true",
+                       help="Synthesize all missing sections in one pass, sentence by sentence, with "
+                            "shared speaker conditioning (default: one call per section)")
+    parser.add_argument("--tts-budget-scale", type=float, default=1.0, metavar="FACTOR",
+                       help="Scale the per-call latency budgets after which ElevenLabs/Coqui calls are hedged "
+                            f"with {TTS_HEDGE_ENGINE} (0 = only fall back on failure)")
     parser.add_argument("--avatar-image", default=None, help="Path to avatar image")
-    parser.add_argument("--language", default="en", choices=["en", "ko", "ja", "zh"],
-                       help="Output language (en=English, ko=Korean, ja=Japanese, zh=Chinese)")
+    parser.add_argument("--language", default="en",
+                       help="Output language(s), comma-separated: en=English, ko=Korean, ja=Japanese, zh=Chinese. "
+                            "With several (e.g. en,ko,ja,zh) the paper is processed once, the first language is "
+                            "summarized and the others are localized from that summary")
+    parser.add_argument("--renditions", default=DEFAULT_RENDITION,
+                       help=f"Output renditions, comma-separated ({', '.join(RENDITIONS)}). Audio is generated once "
+                            "and shared; each rendition only adds its own slides and encode")
+    parser.add_argument("--draft", action="store_true",
+                       help=f"Quick layout preview: {DRAFT_SCALE:g}x resolution, {DRAFT_FPS} fps, {DRAFT_PRESET} encode "
+                            f"into {DRAFT_VIDEO_NAME}, plus {CONTACT_SHEET_NAME}")
+    parser.add_argument("--estimate-audio", action="store_true",
+                       help="Skip TTS and time each section from its text length (silent video; pairs with --draft)")
+    parser.add_argument("--contact-sheet", action="store_true",
+                       help=f"Also write {CONTACT_SHEET_NAME}, a grid of all slides (always on with --draft)")
+    parser.add_argument("--output-format", default="mp4", choices=OUTPUT_FORMATS,
+                       help=f"mp4: a single file; hls: {HLS_DIR_NAME}/{HLS_PLAYLIST_NAME} with ~{HLS_SEGMENT_SECONDS}s "
+                            "fragmented-MP4 segments, published as they are encoded")
+    parser.add_argument("--summary-format", default="markdown", choices=SUMMARY_FORMATS,
+                       help="json: ask for a JSON object with a field per section, validate each field and "
+                            "regenerate only missing or malformed ones (also writes summary.json)")
+    parser.add_argument("--stages", default=None, metavar="STAGES",
+                       help=f"Run only these stages and what they depend on, joined by + or commas "
+                            f"(e.g. extract+summarize; choose from {', '.join(STAGE_KINDS)}). "
+                            "Not recorded for --resume, so a later resume completes the full video")
+    parser.add_argument("--resume", default=None, metavar="DIR",
+                       help="Resume a previous run in DIR, redoing only stages whose inputs changed or outputs are missing")
+    parser.add_argument("--pdf-cache", default=None, metavar="DIR",
+                       help=f"Cache directory for downloaded PDFs (default: {PDF_CACHE_DIR})")
+    parser.add_argument("--scratch-dir", default=SCRATCH_DIR, metavar="DIR",
+                       help="Write intermediates (figures, audio, slides) to a workspace here, e.g. /dev/shm, and "
+                            "publish only the summaries, videos and contact sheets to the output directory "
+                            "(default: $PAPER_TO_VIDEO_SCRATCH, else everything goes to the output directory)")
+    parser.add_argument("--scratch-max-gb", type=float, default=None,
+                       help="Remove the least recently used scratch workspaces beyond this total size")
+    parser.add_argument("--scratch-max-age-hours", type=float, default=None,
+                       help="Remove scratch workspaces unused for longer than this")
+    parser.add_argument("--profile", action="store_true",
+                       help=f"Record per-stage spans and peak RSS into {PROFILE_SUMMARY_NAME} and a Chrome trace ({PROFILE_TRACE_NAME})")
+    parser.add_argument("--io-workers", type=int, default=4,
+                       help="Concurrent I/O-bound stages (download, LLM, TTS)")
+    parser.add_argument("--cpu-workers", type=int, default=2,
+                       help="Concurrent CPU-bound stages (PDF parsing, slides, encode)")
     args = parser.parse_args()
 
+    if args.resume:
+        if not os.path.isdir(args.resume):
+            parser.error(f"--resume directory not found: {args.resume}")
+        # Options recorded by the original run become the defaults, so a bare
+        # --resume DIR continues the same job; explicit flags still override.
+        manifest = load_manifest(args.resume)
+        parser.set_defaults(**manifest.get('options', {}))
+        args = parser.parse_args()
+    if not args.paper_location:
+        parser.error("--paper-location is required (unless resuming a run that recorded it)")
+    unknown = [code for code in parse_languages(args.language) if code not in LANGUAGE_FONTS]
+    if unknown or not parse_languages(args.language):
+        parser.error(f"--language: invalid choice {', '.join(unknown) or repr(args.language)} "
+                     f"(choose from {', '.join(LANGUAGE_FONTS)})")
     try:
-        base_name = os.path.basename(args.paper_location).replace('.pdf', '')
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_dir = f"{base_name}_{timestamp}"
-        os.makedirs(output_dir, exist_ok=True)
-        print(f"✓ Created output directory: {output_dir}")
-
-        if args.paper_location.startswith('http'):
-            print("📥 Downloading paper...")
-            pdf_content = download_paper(args.paper_location)
+        parse_renditions(args.renditions)
+    except ValueError as e:
+        parser.error(f"--renditions: {e}")
+    if args.stages:
+        try:
+            parse_stage_selection(args.stages)
+        except ValueError as e:
+            parser.error(f"--stages: {e}")
+    set_coqui_options(args.coqui_precision, args.coqui_threads, args.coqui_batch)
+    set_tts_budget_scale(args.tts_budget_scale)
+
+    output_dir = None
+    tracer = start_tracing() if args.profile else None
+    try:
+        if args.resume:
+            output_dir = args.resume
+            print(f"✓ Resuming in output directory: {output_dir}")
         else:
-            print("📄 Reading local paper...")
-            pdf_content = read_local_pdf(args.paper_location)
-
-        print("📝 Extracting text...")
-        paper_text = extract_text_from_pdf(pdf_content)
-        print(f"   Extracted {len(paper_text)} characters")
-
-        print("🖼️  Extracting figures...")
-        figures = extract_images_from_pdf(pdf_content, output_dir, max_images=5)
-        print(f"   Extracted {len(figures)} figures")
-
-        print(f"🤖 Generating {args.language.upper()} summary using {args.summarizer}...")
-        raw_summary = summarize_text(paper_text, method=args.summarizer, language=args.language)
-
-        print("🧹 Cleaning and parsing...")
-        cleaned_summary = clean_gemini_response(raw_summary)
-        sections = parse_markdown_to_sections(cleaned_summary)
-        print(f"   Parsed {len(sections)} sections")
-
-        print(f"🎤 Generating {args.language.upper()} voiceover using {args.voice_engine}...")
-        if args.voice_sample:
-            print(f"   Voice sample: {args.voice_sample}")
-        section_audio_files = text_to_speech_per_section(
-            sections, output_dir,
+            base_name = os.path.basename(args.paper_location).replace('.pdf', '')
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_dir = f"{base_name}_{timestamp}"
+            os.makedirs(output_dir, exist_ok=True)
+            print(f"✓ Created output directory: {output_dir}")
+
+        pipeline = Pipeline(
+            summarizer=args.summarizer,
             voice_engine=args.voice_engine,
             voice_sample=args.voice_sample,
-            language=args.language
-        )
-
-        print(f"🎨 Creating {args.language.upper()} slides...")
-        if args.avatar_image:
-            print(f"   Avatar: {args.avatar_image}")
-        slides, slide_to_section = create_slides_with_avatar(
-            sections, output_dir,
-            figures=figures,
             avatar_image=args.avatar_image,
-            language=args.language
+            language=args.language,
+            renditions=args.renditions,
+            draft=args.draft,
+            estimate_audio=args.estimate_audio,
+            contact_sheet=args.contact_sheet,
+            output_format=args.output_format,
+            summary_format=args.summary_format,
+            stages=args.stages,
+            pdf_cache=args.pdf_cache,
+            io_workers=args.io_workers,
+            cpu_workers=args.cpu_workers,
+            scratch_dir=args.scratch_dir,
+            scratch_max_gb=args.scratch_max_gb,
+            scratch_max_age_hours=args.scratch_max_age_hours,
         )
-        print(f"   Created {len(slides)} slides")
-
-        print("🎬 Compiling video...")
-        final_video_path = create_video(slides, slide_to_section, section_audio_files, output_dir)
+        artifacts = pipeline.render(args.paper_location, output_dir=output_dir)
+        figures = artifacts['figures']
+        print_stage_report(artifacts['timings'])
+        print_stage_bytes(artifacts['stage_bytes'])
 
         print("\n" + "="*80)
-        print("✅ VIDEO GENERATION COMPLETE!")
+        if args.stages:
+            print(f"✅ STAGES COMPLETE: {args.stages}")
+        else:
+            print("✅ VIDEO GENERATION COMPLETE!")
         print("="*80)
-        print(f"📹 Video: {final_video_path}")
+        if artifacts.get('summary_path'):
+            print(f"📝 Summary: {artifacts['summary_path']}")
+        for language, rendered in artifacts['languages'].items():
+            for rendition, video in rendered['renditions'].items():
+                if video.get('video_path'):
+                    print(f"📹 Video ({language.upper()}, {rendition}): {video['video_path']}")
+                if video['contact_sheet']:
+                    print(f"🗂️  Contact sheet ({language.upper()}, {rendition}): {video['contact_sheet']}")
         print(f"🗣️  Language: {args.language.upper()}")
         print(f"🎵 Voice engine: {args.voice_engine}")
-        print(f"📊 Slides: {len(slides)}")
+        if 'slides' in artifacts:
+            print(f"📊 Slides: {len(artifacts['slides'])}")
         print(f"🖼️  Figures: {len(figures)}")
         if args.avatar_image:
             print(f"👤 Avatar: {args.avatar_image}")
         print(f"📂 Directory: {output_dir}")
+        if artifacts['work_dir'] != output_dir:
+            print(f"🗃️  Intermediates: {artifacts['work_dir']}")
         print("="*80)
 
     except Exception as e:
         print(f"\n❌ Error: {e}")
         import traceback
         traceback.print_exc()
+        if output_dir:
+            print(f"   Completed stages are kept; rerun with --resume {output_dir}")
+    finally:
+        if tracer and output_dir:
+            summary_path, trace_path = tracer.write(output_dir)
+            print(f"⏱️  Profile: {summary_path} (Chrome trace: {trace_path})")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,308 @@
+"""Multi-node render workers coordinated through a shared SQLite job queue.
+
+Every box in the farm runs `work` against the same queue database on the
+shared volume; there is no central service. A worker claims a job by
+taking a time-limited lease, renews it with heartbeats while rendering,
+and writes results into a per-job output directory next to the queue. If
+a worker dies its lease runs out and another worker re-claims the job.
+Without --scratch-dir the new worker resumes from the stage manifest the
+dead one left in the job's output directory; with it, the intermediates
+were on the dead worker's node and the job starts over. A worker that
+finds its lease taken stops the render before its next stage, and a job
+that fails is retried after a backoff that doubles with each attempt.
+
+Usage:
+    python paper_to_video_worker.py enqueue --queue /shared/jobs.db --paper-location paper.pdf --language ko
+    python paper_to_video_worker.py work --queue /shared/jobs.db --output-root /shared/renders
+    python paper_to_video_worker.py status --queue /shared/jobs.db
+"""
+import os
+import sys
+import json
+import time
+import socket
+import sqlite3
+import argparse
+import threading
+import traceback
+
+import paper_to_video_v5_multilang as ptv
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    paper_location TEXT NOT NULL,
+    options TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    output_dir TEXT,
+    video_path TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, lease_expires);
+"""
+
+
+def connect(queue_path):
+    """Opens the queue database, creating the schema on first use."""
+    # Autocommit mode so claims can use explicit BEGIN IMMEDIATE transactions.
+    # No WAL: it relies on shared memory, which network filesystems lack.
+    conn = sqlite3.connect(queue_path, timeout=60, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def enqueue(conn, paper_location, options, max_attempts=3):
+    """Adds a job and returns its id."""
+    now = time.time()
+    cursor = conn.execute(
+        "INSERT INTO jobs (paper_location, options, max_attempts, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+        (paper_location, json.dumps({**ptv.JOB_DEFAULTS, **options}), max_attempts, now, now))
+    return cursor.lastrowid
+
+
+def claim(conn, worker_id, lease_seconds):
+    """Atomically leases the oldest runnable job to worker_id; returns its row or None.
+
+    Runnable means queued (and past its retry time, kept in lease_expires,
+    if it failed before), or running under a lease that has expired (its
+    worker stopped heartbeating). Expired jobs that used up their attempts
+    are marked failed instead.
+    """
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(
+            "UPDATE jobs SET status = 'failed', error = 'Lease expired too many times', updated_at = ? "
+            "WHERE status = 'running' AND lease_expires < ? AND attempts >= max_attempts",
+            (now, now))
+        row = conn.execute(
+            "SELECT * FROM jobs WHERE (status = 'queued' AND (lease_expires IS NULL OR lease_expires <= ?)) "
+            "OR (status = 'running' AND lease_expires < ?) ORDER BY id LIMIT 1", (now, now)).fetchone()
+        if row is not None:
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, lease_expires = ?, attempts = attempts + 1, "
+                "updated_at = ? WHERE id = ?",
+                (worker_id, now + lease_seconds, now, row['id']))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    if row is not None and row['status'] == 'running':
+        print(f"♻️  Re-claimed job {row['id']} from {row['worker']} (lease expired)")
+    return row
+
+
+def renew_lease(conn, job_id, worker_id, lease_seconds):
+    """Extends our lease on a job; returns False if another worker has taken it."""
+    now = time.time()
+    cursor = conn.execute(
+        "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND worker = ? AND status = 'running'",
+        (now + lease_seconds, now, job_id, worker_id))
+    return cursor.rowcount == 1
+
+
+def finish(conn, job_id, worker_id, status, retry_at=None, **fields):
+    """Records a job's outcome if we still hold its lease; returns whether it did.
+
+    A job put back in the queue is not claimed again before retry_at.
+    """
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    cursor = conn.execute(
+        f"UPDATE jobs SET status = ?, lease_expires = ?, updated_at = ?{', ' if fields else ''}{assignments} "
+        "WHERE id = ? AND worker = ? AND status = 'running'",
+        (status, retry_at, time.time(), *fields.values(), job_id, worker_id))
+    return cursor.rowcount == 1
+
+
+class Heartbeat:
+    """Renews a job lease in the background until stopped; sets the lost event if another worker takes it."""
+
+    def __init__(self, queue_path, job_id, worker_id, lease_seconds, interval):
+        self.queue_path = queue_path
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.interval = interval
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"heartbeat-{job_id}", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        # sqlite3 connections must stay on the thread that created them
+        conn = connect(self.queue_path)
+        try:
+            while not self._stop.wait(self.interval):
+                try:
+                    if not renew_lease(conn, self.job_id, self.worker_id, self.lease_seconds):
+                        print(f"⚠️  Lost lease on job {self.job_id}; another worker owns it now")
+                        self.lost.set()
+                        return
+                except sqlite3.OperationalError as e:
+                    print(f"⚠️  Heartbeat failed for job {self.job_id}: {e}")
+        finally:
+            conn.close()
+
+
+def work(args):
+    """Claims and renders jobs until interrupted (or the queue is empty with --exit-when-empty)."""
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    conn = connect(args.queue)
+    pipelines = {}
+    print(f"👷 Worker {worker_id} polling {args.queue}")
+
+    while True:
+        job = claim(conn, worker_id, args.lease)
+        if job is None:
+            if args.exit_when_empty:
+                print("📭 Queue empty, exiting")
+                return
+            time.sleep(args.poll_interval)
+            continue
+
+        options = json.loads(job['options'])
+        output_dir = os.path.join(args.output_root, f"job_{job['id']:06d}")
+        print(f"🎬 Job {job['id']} (attempt {job['attempts'] + 1}): {job['paper_location']} → {output_dir}")
+        with Heartbeat(args.queue, job['id'], worker_id, args.lease, args.heartbeat) as heartbeat:
+            try:
+                key = tuple(sorted(options.items()))
+                if key not in pipelines:
+                    pipelines[key] = ptv.Pipeline(**options, scratch_dir=args.scratch_dir,
+                                                  scratch_max_gb=args.scratch_max_gb,
+                                                  scratch_max_age_hours=args.scratch_max_age_hours)
+                # The new lease owner writes to the same output_dir: stop before the next stage
+                artifacts = pipelines[key].render(job['paper_location'], output_dir=output_dir,
+                                                  cancel=heartbeat.lost)
+                outcome = ('done', {'output_dir': output_dir, 'video_path': artifacts['video_path'], 'error': None})
+            except Exception as e:
+                if not heartbeat.lost.is_set():
+                    traceback.print_exc()
+                # Leave failed jobs for another worker unless attempts are used up, backing off
+                # so the same worker does not re-claim the job straight away
+                status = 'failed' if job['attempts'] + 1 >= job['max_attempts'] else 'queued'
+                retry_at = time.time() + args.retry_backoff * 2 ** job['attempts'] if status == 'queued' else None
+                outcome = (status, {'retry_at': retry_at, 'output_dir': output_dir, 'error': str(e)})
+        if heartbeat.lost.is_set() or not finish(conn, job['id'], worker_id, outcome[0], **outcome[1]):
+            print(f"⚠️  Job {job['id']} was re-claimed elsewhere; discarding this result")
+        else:
+            print(f"{'✅' if outcome[0] == 'done' else '❌'} Job {job['id']}: {outcome[0]}")
+
+
+def print_status(conn):
+    """Prints job counts per status and the currently leased jobs."""
+    now = time.time()
+    for row in conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status ORDER BY status"):
+        print(f"   {row['status']:<8} {row['n']}")
+    for row in conn.execute("SELECT id, worker, lease_expires, attempts FROM jobs WHERE status = 'running'"):
+        remaining = row['lease_expires'] - now
+        state = f"lease {remaining:.0f}s left" if remaining > 0 else "lease EXPIRED"
+        print(f"   job {row['id']} on {row['worker']} (attempt {row['attempts']}, {state})")
+    for row in conn.execute("SELECT id, lease_expires, attempts FROM jobs WHERE status = 'queued' AND lease_expires > ?",
+                            (now,)):
+        print(f"   job {row['id']} retries in {row['lease_expires'] - now:.0f}s (after attempt {row['attempts']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed paper-to-video workers over a shared SQLite queue.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    enqueue_parser = sub.add_parser("enqueue", help="Add a paper to the queue")
+    enqueue_parser.add_argument("--queue", required=True, help="Path to the shared queue database")
+    enqueue_parser.add_argument("--paper-location", required=True, action="append",
+                                help="PDF URL or path (repeatable)")
+    enqueue_parser.add_argument("--summarizer", default="ollama", choices=["gemini", "ollama", "manual"])
+    enqueue_parser.add_argument("--voice-engine", default="gtts", choices=["gtts", "coqui", "elevenlabs"])
+    enqueue_parser.add_argument("--voice-sample", default=None)
+    enqueue_parser.add_argument("--avatar-image", default=None)
+    enqueue_parser.add_argument("--language", default="en", help="Output language(s), comma-separated (e.g. en,ko)")
+    enqueue_parser.add_argument("--renditions", default=ptv.DEFAULT_RENDITION,
+                                help=f"Output renditions, comma-separated ({', '.join(ptv.RENDITIONS)})")
+    enqueue_parser.add_argument("--draft", action="store_true", help="Render quick low-resolution previews")
+    enqueue_parser.add_argument("--estimate-audio", action="store_true", help="Time sections from text length, no TTS")
+    enqueue_parser.add_argument("--contact-sheet", action="store_true", help="Also write a contact sheet of all slides")
+    enqueue_parser.add_argument("--output-format", default="mp4", choices=ptv.OUTPUT_FORMATS)
+    enqueue_parser.add_argument("--summary-format", default="markdown", choices=ptv.SUMMARY_FORMATS,
+                                help="json: structured summary with per-section validation and repair")
+    enqueue_parser.add_argument("--max-attempts", type=int, default=3)
+
+    work_parser = sub.add_parser("work", help="Claim and render jobs")
+    work_parser.add_argument("--queue", required=True, help="Path to the shared queue database")
+    work_parser.add_argument("--output-root", default="renders", help="Directory for per-job output dirs")
+    work_parser.add_argument("--lease", type=float, default=120, help="Lease length in seconds")
+    work_parser.add_argument("--heartbeat", type=float, default=30, help="Lease renewal interval in seconds")
+    work_parser.add_argument("--poll-interval", type=float, default=5, help="Seconds between polls when idle")
+    work_parser.add_argument("--retry-backoff", type=float, default=60,
+                             help="Seconds before a failed job is retried, doubling with each attempt")
+    work_parser.add_argument("--coqui-precision", default="fp32", choices=ptv.COQUI_PRECISIONS,
+                             help="Coqui CPU inference precision on this node")
+    work_parser.add_argument("--coqui-threads", type=int, default=None, help="Torch intra-op threads for Coqui")
+    work_parser.add_argument("--coqui-batch", action="store_true",
+                             help="Synthesize Coqui sections in one pass with shared speaker conditioning")
+    work_parser.add_argument("--tts-budget-scale", type=float, default=1.0, metavar="FACTOR",
+                             help="Scale TTS latency budgets before hedging with gTTS (0 = no hedging)")
+    work_parser.add_argument("--scratch-dir", default=ptv.SCRATCH_DIR, metavar="DIR",
+                             help="Keep job intermediates in node-local workspaces here (e.g. /dev/shm)")
+    work_parser.add_argument("--scratch-max-gb", type=float, default=None, help="Scratch size limit on this node")
+    work_parser.add_argument("--scratch-max-age-hours", type=float, default=None, help="Scratch workspace lifetime")
+    work_parser.add_argument("--exit-when-empty", action="store_true", help="Stop once no job is runnable")
+
+    status_parser = sub.add_parser("status", help="Show queue status")
+    status_parser.add_argument("--queue", required=True, help="Path to the shared queue database")
+    args = parser.parse_args()
+
+    if args.command == "enqueue":
+        languages = ptv.parse_languages(args.language)
+        if not languages or any(code not in ptv.LANGUAGE_FONTS for code in languages):
+            parser.error(f"--language: choose from {', '.join(ptv.LANGUAGE_FONTS)}")
+        try:
+            renditions = ptv.parse_renditions(args.renditions)
+        except ValueError as e:
+            parser.error(f"--renditions: {e}")
+        conn = connect(args.queue)
+        options = {
+            'summarizer': args.summarizer,
+            'voice_engine': args.voice_engine,
+            'voice_sample': args.voice_sample,
+            'avatar_image': args.avatar_image,
+            'language': ",".join(languages),
+            'renditions': ",".join(renditions),
+            'draft': args.draft,
+            'estimate_audio': args.estimate_audio,
+            'contact_sheet': args.contact_sheet,
+            'output_format': args.output_format,
+            'summary_format': args.summary_format,
+        }
+        for paper_location in args.paper_location:
+            job_id = enqueue(conn, paper_location, options, max_attempts=args.max_attempts)
+            print(f"📥 Queued job {job_id}: {paper_location}")
+    elif args.command == "work":
+        if args.heartbeat >= args.lease:
+            parser.error("--heartbeat must be shorter than --lease")
+        os.makedirs(args.output_root, exist_ok=True)
+        ptv.set_coqui_options(args.coqui_precision, args.coqui_threads, args.coqui_batch)
+        ptv.set_tts_budget_scale(args.tts_budget_scale)
+        try:
+            work(args)
+        except KeyboardInterrupt:
+            print("\n👋 Worker stopping; its lease will expire and the job will be re-queued")
+            sys.exit(130)
+    elif args.command == "status":
+        print_status(connect(args.queue))
+
+
+if __name__ == "__main__":
+    main()